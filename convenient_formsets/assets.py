@@ -0,0 +1,79 @@
+import base64
+import functools
+import hashlib
+from typing import Any, Optional
+
+from django import forms  # type: ignore[import-untyped]
+from django.conf import settings  # type: ignore[import-untyped]
+from django.contrib.staticfiles import finders  # type: ignore[import-untyped]
+from django.forms.utils import flatatt  # type: ignore[import-untyped]
+from django.templatetags.static import static  # type: ignore[import-untyped]
+from django.utils.html import format_html  # type: ignore[import-untyped]
+from django.utils.safestring import SafeString  # type: ignore[import-untyped]
+
+
+def calculate_integrity(path: str) -> Optional[str]:
+    """
+    Returns the subresource integrity hash of the static file at `path`, or
+    `None` if the file cannot be found.
+    """
+    absolute_path = finders.find(path)
+    if absolute_path is None:
+        return None
+    with open(absolute_path, "rb") as file:
+        digest = hashlib.sha384(file.read()).digest()
+    return f"sha384-{base64.b64encode(digest).decode()}"
+
+
+@functools.lru_cache(maxsize=None)
+def get_integrity(path: str) -> Optional[str]:
+    """
+    Returns the subresource integrity hash of the static file at `path`,
+    calculated once per process.
+    """
+    return calculate_integrity(path)
+
+
+class Script:
+    """
+    Renders a deferred `<script>` tag for the static file at `path`, including
+    its subresource integrity hash if the file can be found. The hash is
+    calculated on each render if `DEBUG` is set, as the file may change.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Script) and self.path == other.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r})"
+
+    def __str__(self) -> str:
+        return str(self.__html__())
+
+    def __html__(self) -> SafeString:
+        attrs = {"src": static(self.path), "defer": True}
+        if settings.DEBUG:
+            integrity = calculate_integrity(self.path)
+        else:
+            integrity = get_integrity(self.path)
+        if integrity is not None:
+            attrs.update({"integrity": integrity, "crossorigin": "anonymous"})
+        return format_html("<script{}></script>", flatatt(attrs))
+
+
+@functools.lru_cache(maxsize=None)
+def get_script_media(debug: bool) -> forms.Media:
+    """
+    Returns a `Media` object for the JavaScript file, minified unless `debug`
+    is set.
+    """
+    js_extension = "min.js" if not debug else "js"
+    return forms.Media(
+        js=[Script(f"convenient_formsets/convenient_formsets.{js_extension}")]
+    )
@@ -0,0 +1,118 @@
+import hashlib
+from typing import Any, List, Optional
+
+from django import forms  # type: ignore[import-untyped]
+from django.core.cache import caches  # type: ignore[import-untyped]
+from django.core.cache.backends.locmem import (  # type: ignore[import-untyped]
+    LocMemCache,
+)
+
+# Process memory cache, used when no cache alias is configured
+local_cache = LocMemCache("convenient_formsets", {"TIMEOUT": None})
+
+
+def get_cache(alias: Optional[str]) -> Any:
+    """
+    Returns the Django cache backend configured as `alias`, or the process
+    memory cache if `alias` is `None`.
+    """
+    if alias is None:
+        return local_cache
+    return caches[alias]
+
+
+def get_choices_signature(choices: Any) -> str:
+    """
+    Returns the representation of `choices`, including nested groups.
+    """
+    return repr(
+        [
+            (
+                (str(key), get_choices_signature(value))
+                if isinstance(value, (list, tuple))
+                else (str(key), str(value))
+            )
+            for key, value in choices
+        ]
+    )
+
+
+def get_widget_signature(widget: forms.Widget) -> List[str]:
+    """
+    Returns the attributes of `widget` affecting how it renders, including its
+    attributes and choices as possibly changed after initializing the form.
+    """
+    signature = [
+        f"{type(widget).__module__}.{type(widget).__qualname__}",
+        str(widget.template_name),
+        repr(sorted((str(key), str(value)) for key, value in widget.attrs.items())),
+        repr(
+            (
+                widget.is_localized,
+                widget.is_required,
+                getattr(widget, "input_type", None),
+                getattr(widget, "format", None),
+            )
+        ),
+    ]
+    if isinstance(widget, forms.MultiWidget):
+        for subwidget in widget.widgets:
+            signature.extend(get_widget_signature(subwidget))
+    return signature
+
+
+def get_field_signature(field: forms.Field) -> Optional[List[str]]:
+    """
+    Returns the attributes of `field` affecting how it renders, or `None` if
+    its rendering may vary, as it depends on the database or a callable. A
+    `ModelChoiceField` with a hidden widget, like the primary key field of a
+    model formset, does not render its choices.
+    """
+    is_model_choice_field = isinstance(field, forms.ModelChoiceField)
+    if (is_model_choice_field and not field.widget.is_hidden) or callable(
+        field.initial
+    ):
+        return None
+
+    widget = field.widget
+    signature = [
+        f"{type(field).__module__}.{type(field).__qualname__}",
+        *get_widget_signature(widget),
+        repr(
+            (field.required, field.disabled, field.localize, field.show_hidden_initial)
+        ),
+        str(field.label),
+        str(field.label_suffix),
+        str(field.help_text),
+        repr(field.initial),
+    ]
+    if isinstance(field, forms.ChoiceField) and not is_model_choice_field:
+        signature.append(get_choices_signature(field.choices))
+    if hasattr(widget, "choices") and not is_model_choice_field:
+        signature.append(get_choices_signature(widget.choices))
+    return signature
+
+
+def get_form_signature(form: forms.Form) -> Optional[str]:
+    """
+    Returns a hash of the fields, initial data and rendering options of
+    `form`, identifying its rendered markup, or `None` if its rendering may
+    vary.
+    """
+    signature = [
+        f"{type(form).__module__}.{type(form).__qualname__}",
+        str(form.prefix),
+        str(form.template_name),
+        str(form.label_suffix),
+        str(getattr(form, "error_css_class", None)),
+        str(getattr(form, "required_css_class", None)),
+        repr((form.use_required_attribute, form.empty_permitted)),
+        repr(sorted((str(key), repr(value)) for key, value in form.initial.items())),
+    ]
+    for name, field in form.fields.items():
+        field_signature = get_field_signature(field)
+        if field_signature is None:
+            return None
+        signature.append(name)
+        signature.extend(field_signature)
+    return hashlib.sha256("\0".join(signature).encode()).hexdigest()
@@ -0,0 +1,216 @@
+import functools
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django import forms  # type: ignore[import-untyped]
+from django.core.exceptions import (  # type: ignore[import-untyped]
+    EmptyResultSet,
+    ValidationError,
+)
+from django.forms.models import ModelChoiceIterator  # type: ignore[import-untyped]
+
+
+class SharedChoices:
+    """
+    Holds the evaluated queryset of a `ModelChoiceField`, shared by the same
+    field of all forms in a formset. If `complete` is unset, the objects are
+    a subset of the field's choices and lookups may fall back to a query.
+    """
+
+    def __init__(self, queryset: Any, complete: bool = True) -> None:
+        self.queryset = queryset
+        self.complete = complete
+        self._objects: Optional[List[Any]] = None
+        self._objects_by_key: Dict[str, Dict[Any, Any]] = {}
+
+    @property
+    def objects(self) -> List[Any]:
+        if self._objects is None:
+            self._objects = list(self.queryset)
+        return self._objects
+
+    def get_objects_by_key(self, key: str) -> Dict[Any, Any]:
+        """
+        Returns a mapping of the `key` attribute of each object to the object
+        itself.
+        """
+        if key not in self._objects_by_key:
+            self._objects_by_key[key] = {getattr(obj, key): obj for obj in self.objects}
+        return self._objects_by_key[key]
+
+
+class SharedModelChoiceIterator(ModelChoiceIterator):
+    """
+    Yields choices from the shared objects instead of querying the database.
+    """
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.shared_choices.objects:
+            yield self.choice(obj)
+
+    def __len__(self) -> int:
+        empty_label_count = 1 if self.field.empty_label is not None else 0
+        return len(self.field.shared_choices.objects) + empty_label_count
+
+    def __bool__(self) -> bool:
+        return self.field.empty_label is not None or bool(
+            self.field.shared_choices.objects
+        )
+
+
+class SharedChoicesFieldMixin:
+    """
+    Serves the choices and value lookups of a `ModelChoiceField` or
+    `ModelMultipleChoiceField` from its `shared_choices`.
+    """
+
+    iterator = SharedModelChoiceIterator
+    shared_choices: SharedChoices
+
+    def get_key_field(self) -> Any:
+        """
+        Returns the model field of which the values identify the choices,
+        given by `to_field_name` or the primary key.
+        """
+        # pylint: disable-next=protected-access
+        opts = self.queryset.model._meta  # type: ignore[attr-defined]
+        if self.to_field_name:  # type: ignore[attr-defined]
+            return opts.get_field(self.to_field_name)  # type: ignore[attr-defined]
+        return opts.pk
+
+    def normalize_value(self, value: Any) -> Any:
+        """
+        Returns `value` converted by the model field identifying the choices,
+        so that submitted values compare equal to the values of the objects.
+        Raises `ValidationError` if it cannot be converted.
+        """
+        key_field = self.get_key_field()
+        try:
+            return key_field.to_python(value)
+        except (TypeError, ValueError, ValidationError) as e:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],  # type: ignore[attr-defined]
+                code="invalid_choice",
+                params={"value": value},
+            ) from e
+
+    def to_python(self, value: Any) -> Any:
+        if isinstance(self, forms.ModelMultipleChoiceField):
+            return super().to_python(value)  # type: ignore[misc]
+        if value in self.empty_values:  # type: ignore[attr-defined]
+            return None
+
+        key_field = self.get_key_field()
+        if isinstance(value, self.queryset.model):  # type: ignore[attr-defined]
+            value = getattr(value, key_field.attname)
+        objects_by_key = self.shared_choices.get_objects_by_key(key_field.attname)
+        obj = objects_by_key.get(self.normalize_value(value))
+        if obj is not None:
+            return obj
+        if not self.shared_choices.complete:
+            return super().to_python(value)  # type: ignore[misc]
+        raise ValidationError(
+            self.error_messages["invalid_choice"],  # type: ignore[attr-defined]
+            code="invalid_choice",
+            params={"value": value},
+        )
+
+    def _check_values(self, value: Any) -> Any:
+        key = self.to_field_name or "pk"  # type: ignore[attr-defined]
+        key_field = self.get_key_field()
+        try:
+            value = frozenset(value)
+        except TypeError as e:
+            raise ValidationError(
+                self.error_messages["invalid_list"],  # type: ignore[attr-defined]
+                code="invalid_list",
+            ) from e
+
+        objects_by_key = self.shared_choices.get_objects_by_key(key_field.attname)
+        selected_keys = set()
+        for val in value:
+            selected_key = self.normalize_value(val)
+            if selected_key not in objects_by_key:
+                if not self.shared_choices.complete:
+                    return super()._check_values(value)  # type: ignore[misc]
+                raise ValidationError(
+                    self.error_messages["invalid_choice"],  # type: ignore[attr-defined]
+                    code="invalid_choice",
+                    params={"value": val},
+                )
+            selected_keys.add(selected_key)
+
+        # Return the selected objects as an evaluated queryset, in the same
+        # order as the choices
+        qs = self.queryset.filter(  # type: ignore[attr-defined]
+            **{f"{key}__in": selected_keys}
+        )
+        qs._result_cache = [  # pylint: disable=protected-access
+            obj for obj_key, obj in objects_by_key.items() if obj_key in selected_keys
+        ]
+        qs._prefetch_done = True  # pylint: disable=protected-access
+        return qs
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_choices_field_class(field_class: type) -> type:
+    """
+    Returns a subclass of the given `ModelChoiceField` class that uses the
+    shared choices.
+    """
+    return type(field_class.__name__, (SharedChoicesFieldMixin, field_class), {})
+
+
+def can_share_choices(field: Any) -> bool:
+    """
+    Returns whether the choices of `field` can be shared: it should be a
+    `ModelChoiceField` populated by a queryset, with the default behavior for
+    iterating choices and looking up values.
+    """
+    if not isinstance(field, forms.ModelChoiceField):
+        return False
+    if isinstance(field, SharedChoicesFieldMixin):
+        return False
+    if field.queryset is None or hasattr(field, "_choices"):
+        return False
+
+    field_class = type(field)
+    default_field_class = (
+        forms.ModelMultipleChoiceField
+        if isinstance(field, forms.ModelMultipleChoiceField)
+        else forms.ModelChoiceField
+    )
+    return (
+        field.iterator is ModelChoiceIterator
+        and field_class.to_python is default_field_class.to_python
+        and getattr(field_class, "_check_values", None)
+        is getattr(default_field_class, "_check_values", None)
+    )
+
+
+def get_shared_choices_key(name: str, field: Any) -> Optional[Tuple[str, ...]]:
+    """
+    Returns a key identifying the choices of `field` named `name`, consisting
+    of the field name, database alias and SQL query. Returns `None` for
+    querysets that never match any objects.
+    """
+    try:
+        sql, params = field.queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return (name, field.queryset.db, sql, repr(params))
+
+
+def share_choices(field: Any, shared_choices: SharedChoices) -> Any:
+    """
+    Returns a copy of `field` as an instance of the subclass given by
+    `get_shared_choices_field_class()`, using `shared_choices` for rendering
+    its choices and looking up submitted values.
+    """
+    shared_field_class: Any = get_shared_choices_field_class(field.__class__)
+    shared_field = shared_field_class.__new__(shared_field_class)
+    shared_field.__dict__.update(field.__dict__)
+    shared_field.shared_choices = shared_choices
+    shared_field.widget.choices = shared_field.choices
+    return shared_field
@@ -0,0 +1,28 @@
+from typing import Any
+
+from django import forms  # type: ignore[import-untyped]
+from django.forms.formsets import (  # type: ignore[import-untyped]
+    DELETION_FIELD_NAME,
+)
+from django.forms.utils import ErrorDict  # type: ignore[import-untyped]
+
+
+class DeletedForm(forms.Form):
+    """
+    Stands in for an existing form of a model formset marked for deletion,
+    holding only its primary key and DELETE fields. It's valid without
+    cleaning, with the object to delete, having only its primary key set, as
+    its instance.
+    """
+
+    def __init__(
+        self, instance: Any, pk_name: str, deletion_widget: Any, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.instance = instance
+        self.fields[pk_name] = forms.CharField(widget=forms.HiddenInput, required=False)
+        self.fields[DELETION_FIELD_NAME] = forms.BooleanField(
+            widget=deletion_widget, required=False
+        )
+        self.cleaned_data = {pk_name: instance, DELETION_FIELD_NAME: True}
+        self._errors = ErrorDict(renderer=self.renderer)
@@ -0,0 +1,73 @@
+import json
+from typing import Any, List, Tuple
+
+from django import forms  # type: ignore[import-untyped]
+from django.utils.crypto import salted_hmac  # type: ignore[import-untyped]
+
+DIGEST_FIELD_NAME = "DIGEST"
+
+
+class DigestField(forms.CharField):
+    """
+    Holds the digest of a form as rendered, which is never considered a
+    change to the form.
+    """
+
+    widget = forms.HiddenInput
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs.setdefault("required", False)
+        super().__init__(**kwargs)
+
+    def has_changed(self, initial: Any, data: Any) -> bool:
+        return False
+
+
+def normalize_digest_value(value: Any) -> Tuple[str, ...]:
+    """
+    Normalizes a widget value to the tuple of strings submitted by a browser,
+    ignoring empty values.
+    """
+    if isinstance(value, bool):
+        return ("on",) if value else ()
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return tuple(str(item) for item in value if item is not None and item != "")
+
+
+def get_initial_digest_value(form: forms.Form, name: str) -> Tuple[str, ...]:
+    """
+    Returns the normalized value of the field named `name`, as rendered for
+    the initial data of `form`.
+    """
+    field = form.fields[name]
+    value = field.prepare_value(form[name].initial)
+    if isinstance(field.widget, forms.CheckboxInput):
+        return normalize_digest_value(field.widget.check_test(value))
+    return normalize_digest_value(field.widget.format_value(value))
+
+
+def get_data_digest_value(form: forms.Form, name: str) -> Tuple[str, ...]:
+    """
+    Returns the normalized value of the field named `name`, as submitted in
+    the data of `form`.
+    """
+    field = form.fields[name]
+    value = field.widget.value_from_datadict(
+        form.data, form.files, form.add_prefix(name)
+    )
+    return normalize_digest_value(value)
+
+
+def calculate_digest(form: forms.Form, key_salt: str, initial: bool) -> str:
+    """
+    Returns a digest of the values of all enabled fields in `form`, either as
+    rendered for its initial data or as submitted in its data.
+    """
+    get_digest_value = get_initial_digest_value if initial else get_data_digest_value
+    values: List[Any] = [type(form).__qualname__]
+    for name, field in form.fields.items():
+        if name == DIGEST_FIELD_NAME or field.disabled:
+            continue
+        values.append([name, get_digest_value(form, name)])
+    return str(salted_hmac(key_salt, json.dumps(values)).hexdigest())
@@ -1,32 +1,1159 @@
+# pylint: disable=too-many-lines
+import contextlib
+import contextvars
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from asgiref.sync import sync_to_async
 from django import forms  # type: ignore[import-untyped]
 from django.conf import settings  # type: ignore[import-untyped]
+from django.core.exceptions import ValidationError  # type: ignore[import-untyped]
+from django.db import (  # type: ignore[import-untyped]
+    connections,
+    models,
+    router,
+    transaction,
+)
+from django.db.models.signals import (  # type: ignore[import-untyped]
+    post_save,
+    pre_save,
+)
+from django.forms.formsets import (  # type: ignore[import-untyped]
+    DELETION_FIELD_NAME,
+    ORDERING_FIELD_NAME,
+)
+from django.forms.models import (  # type: ignore[import-untyped]
+    InlineForeignKeyField,
+)
+from django.forms.utils import ErrorDict  # type: ignore[import-untyped]
+from django.utils import timezone, translation  # type: ignore[import-untyped]
+from django.utils.crypto import (  # type: ignore[import-untyped]
+    constant_time_compare,
+)
+from django.utils.functional import cached_property  # type: ignore[import-untyped]
+from django.utils.html import (  # type: ignore[import-untyped]
+    format_html,
+    json_script,
+)
+from django.utils.safestring import (  # type: ignore[import-untyped]
+    SafeString,
+    mark_safe,
+)
+from django.utils.translation import (  # type: ignore[import-untyped]
+    gettext_lazy,
+)
+
+from .assets import get_script_media
+from .caching import get_cache, get_form_signature
+from .choices import (
+    SharedChoices,
+    can_share_choices,
+    get_shared_choices_key,
+    share_choices,
+)
+from .deletion import DeletedForm
+from .digests import DIGEST_FIELD_NAME, DigestField, calculate_digest
+from .instrumentation import FormsetStats, Measurement, collected_stats, measure
+from .json_data import JSON_DATA_FIELD_NAME, decode_json_data
+from .signals import phase_measured
+from .uniqueness import validate_unique_in_bulk
 
+if TYPE_CHECKING:
+    # Django is untyped, so let the mixins below be checked as `Any` subclasses
+    from django.forms import (  # type: ignore[import-untyped]
+        BaseFormSet as _FormSetMixinBase,
+    )
+else:
+    _FormSetMixinBase = object
 
-class ConvenientFormsetsBase:
+
+class ConvenientFormsetsBase(_FormSetMixinBase):
+    # pylint: disable=too-many-public-methods
     deletion_widget = forms.HiddenInput
     ordering_widget = forms.HiddenInput
+    share_choice_querysets = False
+    cache_empty_form = False
+    empty_form_cache_alias = None
+    parallel_clean = False
+    parallel_clean_max_workers = 4
+    collect_stats = False
+    json_submission = False
+    js_options: Dict[str, Any] = {}
+    default_error_messages = {
+        "invalid_json_data": gettext_lazy("The submitted forms could not be read."),
+    }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.json_data_error = False
+        if self.json_submission and self.is_bound:
+            self.decode_json_data()
+
+    def decode_json_data(self) -> None:
+        """
+        Replaces the forms submitted as JSON by the JavaScript, if
+        `json_submission` is enabled, by their prefixed fields. Malformed JSON
+        leaves the forms empty and adds an error to `non_form_errors()`.
+        """
+        data: Any = self.data
+        json_data_name = self.add_prefix(JSON_DATA_FIELD_NAME)
+        if json_data_name not in data:
+            return
+        try:
+            data = decode_json_data(data, self.prefix, self.absolute_max)
+        except ValueError:
+            self.json_data_error = True
+            data = data.copy()
+            del data[json_data_name]
+        self.data: Any = data
 
     @property
     def media(self) -> forms.Media:
         """
         Returns a `Media` object that includes the form's media together with
-        the JavaScript required for in-browser interaction.
+        the JavaScript required for in-browser interaction. The media of the
+        JavaScript is memoized, while the form's media is collected per
+        instance, as forms may define their media dynamically.
+        """
+        return get_script_media(settings.DEBUG) + super().media
+
+    def get_js_options(self, **options: Any) -> Dict[str, Any]:
+        """
+        Returns the options for initializing a `ConvenientFormset` for this
+        formset in the JavaScript. Its prefix and whether forms can be deleted
+        or ordered are taken from the formset, while the selectors default to
+        IDs and classes named after its prefix. The `js_options` attribute and
+        the given `options` take precedence.
+        """
+        prefix = self.prefix
+        js_options = {
+            "formsetPrefix": prefix,
+            "formsContainerSelector": f"#{prefix}-forms-container",
+            "formSelector": f".{prefix}-form",
+            "canAddForms": True,
+            "addFormButtonSelector": f"#{prefix}-add-form-button",
+            "emptyFormTemplateSelector": f"#{prefix}-empty-form-template",
+            "canDeleteForms": bool(self.can_delete),
+            "deleteFormButtonSelector": f".{prefix}-delete-form-button",
+            "canOrderForms": bool(self.can_order),
+            "submitAsJson": bool(self.json_submission),
+            "moveFormDownButtonSelector": f".{prefix}-move-form-down-button",
+            "moveFormUpButtonSelector": f".{prefix}-move-form-up-button",
+        }
+        js_options.update(self.js_options)
+        js_options.update(options)
+        return js_options
+
+    def render_js_options(self, **options: Any) -> SafeString:
+        """
+        Returns the options of `get_js_options()` rendered as a JSON script
+        element, from which `ConvenientFormset.initAll()` initializes the
+        formset without requiring an inline script.
+        """
+        return json_script(
+            self.get_js_options(**options), f"{self.prefix}-convenient-formset-options"
+        )
+
+    @cached_property
+    def shared_choices(self) -> Dict[Any, SharedChoices]:
+        """
+        Returns the choices shared by the forms of this formset, keyed by
+        field name and queryset.
+        """
+        return {}
+
+    @property
+    def is_instrumented(self) -> bool:
+        """
+        Returns whether the phases of this formset are measured, either as
+        `collect_stats` is enabled or as formset stats are being collected.
+        """
+        return bool(self.collect_stats or collected_stats.get() is not None)
+
+    @cached_property
+    def stats(self) -> FormsetStats:
+        """
+        Returns the measurements of the phases of this formset, which is
+        appended to the formset stats being collected, if any.
+        """
+        stats = FormsetStats(
+            f"{type(self).__module__}.{type(self).__qualname__}", self.prefix
+        )
+        stats_list = collected_stats.get()
+        if stats_list is not None:
+            stats_list.append(stats)
+        return stats
+
+    @contextlib.contextmanager
+    def measure_phase(
+        self, phase: str, form_prefix: Optional[str] = None
+    ) -> Iterator[None]:
+        """
+        Measures the time and number of queries spent on `phase` within the
+        context if this formset is instrumented, for the form with
+        `form_prefix` if given.
+        """
+        if not self.is_instrumented:
+            yield
+            return
+
+        with measure() as measurement:
+            yield
+        self.add_measurement(phase, measurement, form_prefix)
+
+    def add_measurement(
+        self, phase: str, measurement: Measurement, form_prefix: Optional[str] = None
+    ) -> None:
+        """
+        Adds `measurement` of `phase` to the stats of this formset and sends
+        the `phase_measured` signal.
+        """
+        self.stats.add(phase, measurement, form_prefix)
+        phase_measured.send(
+            sender=type(self),
+            formset=self,
+            phase=phase,
+            measurement=measurement,
+            form_prefix=form_prefix,
+        )
+
+    def _construct_form(self, i: int, **kwargs: Any) -> forms.Form:
+        with self.measure_phase("construct", self.add_prefix(i)):
+            return super()._construct_form(i, **kwargs)
+
+    def full_clean(self) -> None:
+        if self.is_bound:
+            self.clean_forms()
+        with self.measure_phase("clean_formset"):
+            super().full_clean()
+        if self.json_data_error:
+            self._non_form_errors.append(
+                ValidationError(
+                    self.error_messages["invalid_json_data"],
+                    code="invalid_json_data",
+                )
+            )
+
+    def clean_forms(self) -> None:
+        """
+        Cleans the forms ahead of `full_clean()` collecting their errors, in
+        parallel if `parallel_clean` is enabled. If this formset is
+        instrumented, forms are cleaned one by one to measure each form.
+        """
+        if self.parallel_clean:
+            self.clean_forms_in_parallel()
+        if self.is_instrumented:
+            for form in self.forms:
+                if form._errors is None:  # pylint: disable=protected-access
+                    self.clean_form(form)
+
+    def clean_form(self, form: forms.Form) -> None:
+        """
+        Cleans `form`, measuring its cleaning if this formset is instrumented.
+        """
+        with self.measure_phase("clean", form.prefix):
+            form.full_clean()
+
+    def clean_forms_in_parallel(self) -> None:
+        """
+        Cleans the forms using a pool of at most `parallel_clean_max_workers`
+        threads, before `full_clean()` collects their errors in order as usual.
+        Each thread runs in a copy of the current context, with the active
+        language and timezone, which asgiref keeps thread-local, activated
+        again, and closes its database connections when done.
+        """
+        # pylint: disable-next=protected-access
+        pending_forms = [form for form in self.forms if form._errors is None]
+        max_workers = min(len(pending_forms), self.parallel_clean_max_workers)
+        if max_workers <= 1:
+            return
+
+        language = translation.get_language()
+        current_timezone = timezone.get_current_timezone()
+
+        def clean_forms(forms_to_clean: List[forms.Form]) -> None:
+            try:
+                with translation.override(language), timezone.override(
+                    current_timezone
+                ):
+                    for form in forms_to_clean:
+                        self.clean_form(form)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    clean_forms,
+                    pending_forms[i::max_workers],
+                )
+                for i in range(max_workers)
+            ]
+            for future in futures:
+                future.result()
+
+    def add_fields(self, form: forms.Form, index: Any) -> None:
+        super().add_fields(form, index)
+        if self.share_choice_querysets:
+            for name, field in form.fields.items():
+                form.fields[name] = self.share_field_choices(name, field)
+
+    def share_field_choices(self, name: str, field: forms.Field) -> forms.Field:
+        """
+        Returns a copy of a `ModelChoiceField` using choices shared with the
+        same field of the other forms, so its queryset is evaluated once per
+        formset for both rendering choices and cleaning values. Other fields
+        are returned as is.
+        """
+        if not can_share_choices(field):
+            return field
+
+        key = get_shared_choices_key(name, field)
+        if key is None:
+            return field
+        if key not in self.shared_choices:
+            self.shared_choices[key] = SharedChoices(field.queryset)
+        return share_choices(field, self.shared_choices[key])
+
+    def iter_forms(self) -> Iterator[forms.Form]:
+        """
+        Yields the forms of this formset, constructing them one at a time
+        instead of all at once. Forms are not kept around, unless the `forms`
+        attribute was already evaluated.
+        """
+        for i in range(self.total_form_count()):
+            yield self.get_form(i)
+
+    def get_form(self, i: int) -> forms.Form:
+        """
+        Returns the form with index `i`, constructing it unless the `forms`
+        attribute was already evaluated.
+        """
+        if "forms" in self.__dict__:
+            return self.forms[i]
+        return self._construct_form(i, **self.get_form_kwargs(i))
+
+    def render_forms(
+        self, form_template_name: Optional[str] = None
+    ) -> Iterator[SafeString]:
+        """
+        Yields the rendered forms of this formset one at a time, like
+        `render_form()`.
+        """
+        for form in self.iter_forms():
+            yield self.render_form(form, form_template_name)
+
+    def render_iter(
+        self, form_template_name: Optional[str] = None
+    ) -> Iterator[SafeString]:
+        """
+        Yields the rendered forms of this formset one at a time, followed by
+        the empty form inside a `<template>` element and the management form.
+        Forms are rendered using `form_template_name` if given, receiving the
+        `form` and `formset` as context, or using their default template.
+        """
+        yield from self.render_forms(form_template_name)
+
+        yield format_html(
+            '<template id="{}">{}</template>',
+            f"{self.prefix}-empty-form-template",
+            self.render_empty_form(form_template_name),
+        )
+        yield self.management_form.render()
+
+    def render_empty_form(self, form_template_name: Optional[str] = None) -> SafeString:
+        """
+        Returns the rendered empty form, like `render_form()`. If
+        `cache_empty_form` is enabled, the markup is cached per formset class,
+        prefix, language and form signature, either in process memory or in
+        the Django cache configured as `empty_form_cache_alias`.
+        """
+        empty_form = self.empty_form
+        if not self.cache_empty_form:
+            return self.render_form(empty_form, form_template_name)
+
+        form_signature = get_form_signature(empty_form)
+        if form_signature is None:
+            return self.render_form(empty_form, form_template_name)
+
+        key_parts = [
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            f"{type(self.renderer).__module__}.{type(self.renderer).__qualname__}",
+            str(self.auto_id),
+            str(form_template_name),
+            str(translation.get_language()),
+            form_signature,
+        ]
+        key_hash = hashlib.sha256("\0".join(key_parts).encode()).hexdigest()
+        cache_key = f"convenient_formsets.empty_form.{key_hash}"
+
+        cache = get_cache(self.empty_form_cache_alias)
+        rendered_empty_form = cache.get(cache_key)
+        if rendered_empty_form is None:
+            rendered_empty_form = self.render_form(empty_form, form_template_name)
+            cache.set(cache_key, str(rendered_empty_form))
+        return mark_safe(rendered_empty_form)
+
+    def render_form(
+        self, form: forms.Form, form_template_name: Optional[str] = None
+    ) -> SafeString:
+        """
+        Returns `form` rendered using `form_template_name` if given, or using
+        its default template otherwise.
+        """
+        with self.measure_phase("render", form.prefix):
+            if form_template_name is None:
+                return form.render()
+            context = {"form": form, "formset": self}
+            return mark_safe(self.renderer.render(form_template_name, context))
+
+    def render(self, *args: Any, **kwargs: Any) -> SafeString:
+        with self.measure_phase("render"):
+            return super().render(*args, **kwargs)
+
+    __str__ = render
+    __html__ = render
+
+
+class ConvenientModelFormsetsBase(ConvenientFormsetsBase):
+    # pylint: disable=too-many-public-methods
+    bulk_save = False
+    bulk_save_batch_size = None
+    bulk_save_send_signals = False
+    bulk_save_ignore_model_save = False
+    trust_unchanged_forms = False
+    skip_deleted_forms = False
+    fetch_submitted_objects = False
+    fetch_submitted_objects_only: Optional[Sequence[str]] = None
+    cache_forms = False
+    form_cache_alias = None
+    form_cache_version_field: Optional[str] = None
+    window_size = None
+    batch_unique_checks = False
+    batch_unique_checks_size = 500
+
+    def __init__(self, *args: Any, window_offset: int = 0, **kwargs: Any) -> None:
+        self.window_offset = window_offset
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self) -> Any:
+        """
+        Limits the queryset to a window of `window_size` objects starting at
+        `window_offset` if the formset is windowed. Bound windowed formsets
+        are limited to the objects of the submitted forms instead.
+        """
+        if hasattr(self, "_queryset") or not self.window_size:
+            return super().get_queryset()
+
+        # The querysets are cached like `BaseModelFormSet.get_queryset()` does
+        # pylint: disable=attribute-defined-outside-init
+        queryset = super().get_queryset()
+        if self.is_bound:
+            self._queryset = queryset.filter(pk__in=self.get_submitted_pks())
+        else:
+            self._unwindowed_queryset = queryset
+            window_start = self.window_offset
+            window_end = window_start + self.window_size
+            self._queryset = queryset[window_start:window_end]
+        return self._queryset
+
+    def get_submitted_pks(self) -> List[Any]:
+        """
+        Returns the valid primary key values submitted for the initial forms.
+        """
+        pk_field = self.model._meta.pk  # pylint: disable=protected-access
+        pks = []
+        for i in range(self.initial_form_count()):
+            value = self.data.get(f"{self.add_prefix(i)}-{pk_field.name}")
+            try:
+                value = pk_field.to_python(value)
+            except ValidationError:
+                continue
+            if value is not None:
+                pks.append(value)
+        return pks
+
+    @cached_property
+    def submitted_objects(self) -> Dict[Any, Any]:
+        """
+        Returns the objects of the formset's queryset of which the primary key
+        value is submitted for an initial form, keyed by primary key value.
+        They're fetched using `in_bulk()`, deferring all fields but those in
+        `fetch_submitted_objects_only` if set. Objects of forms skipped as
+        deleted are not fetched.
+        """
+        queryset, pks = self.get_submitted_objects_lookup()
+        if queryset.query.is_sliced:
+            # Objects cannot be fetched in bulk from a sliced queryset
+            pk_set = set(pks)
+            return {obj.pk: obj for obj in queryset if obj.pk in pk_set}
+        return queryset.in_bulk(pks)  # type: ignore[no-any-return]
+
+    def get_submitted_objects_lookup(self) -> Tuple[Any, List[Any]]:
+        """
+        Returns the queryset to fetch the submitted objects from, along with
+        their primary key values, leaving out those of forms skipped as
+        deleted.
+        """
+        deleted_pks = set(self.deleted_form_pks.values())
+        pks = [pk for pk in self.get_submitted_pks() if pk not in deleted_pks]
+        queryset = self.get_queryset()
+        only = self.fetch_submitted_objects_only
+        if only is not None and not queryset.query.is_sliced:
+            queryset = queryset.only(*only)
+        return queryset, pks
+
+    def _existing_object(self, pk: Any) -> Any:
+        # Look up the objects of bound forms among the submitted objects only
+        if self.fetch_submitted_objects:
+            return self.submitted_objects.get(pk)
+        return super()._existing_object(pk)
+
+    @cached_property
+    def deleted_form_pks(self) -> Dict[int, Any]:
+        """
+        Returns the primary key values of the objects of the initial forms
+        marked for deletion in the submitted data, keyed by form index, if
+        `skip_deleted_forms` is enabled. Values of objects outside of the
+        formset's queryset are left out, so their forms are validated as usual.
+        """
+        if not (self.skip_deleted_forms and self.can_delete and self.is_bound):
+            return {}
+
+        pk_field = self.model._meta.pk  # pylint: disable=protected-access
+        deletion_field = forms.BooleanField(required=False)
+        deleted_form_pks = {}
+        for i in range(self.initial_form_count()):
+            prefix = self.add_prefix(i)
+            deleted = self.data.get(f"{prefix}-{DELETION_FIELD_NAME}")
+            if not deletion_field.to_python(deleted):
+                continue
+            try:
+                value = pk_field.to_python(self.data.get(f"{prefix}-{pk_field.name}"))
+            except ValidationError:
+                continue
+            if value is not None:
+                deleted_form_pks[i] = value
+        if not deleted_form_pks:
+            return {}
+
+        queryset = self.get_queryset()
+        # pylint: disable-next=protected-access
+        if queryset._result_cache is not None or queryset.query.is_sliced:
+            existing_pks = {obj.pk for obj in queryset}
+        else:
+            existing_pks = set(
+                queryset.filter(pk__in=deleted_form_pks.values()).values_list(
+                    "pk", flat=True
+                )
+            )
+        return {i: pk for i, pk in deleted_form_pks.items() if pk in existing_pks}
+
+    def construct_deleted_form(self, i: int, pk: Any) -> forms.Form:
+        """
+        Returns a `DeletedForm` standing in for the initial form with index `i`
+        marked for deletion, of which the object has primary key value `pk`.
+        """
+        instance = self.model(pk=pk)
+        instance._state.adding = False  # pylint: disable=protected-access
+        instance._state.db = self.get_queryset().db  # pylint: disable=protected-access
+        return DeletedForm(
+            instance,
+            self.model._meta.pk.name,  # pylint: disable=protected-access
+            self.get_deletion_widget(),
+            auto_id=self.auto_id,
+            prefix=self.add_prefix(i),
+            data=self.data,
+            files=self.files,
+            error_class=self.error_class,
+            use_required_attribute=False,
+            renderer=self.renderer,
+        )
+
+    def load_deleted_instances(self) -> None:
+        """
+        Replaces the instances of the `DeletedForm`s, having only their primary
+        key set, by the objects fetched in a single query, so that their
+        `delete()` method and signal handlers see all their fields when saving
+        one by one. Objects deleted in bulk are not fetched.
+        """
+        deleted_forms = [form for form in self.forms if isinstance(form, DeletedForm)]
+        if not deleted_forms:
+            return
+
+        pk_name = self.model._meta.pk.name  # pylint: disable=protected-access
+        # pylint: disable-next=protected-access
+        manager = self.model._default_manager.using(self.get_queryset().db)
+        objects = manager.in_bulk([form.instance.pk for form in deleted_forms])
+        for form in deleted_forms:
+            obj = objects.get(form.instance.pk)
+            if obj is not None:
+                form.instance = obj
+                form.cleaned_data[pk_name] = obj
+
+    def get_next_window_offset(self) -> Optional[int]:
         """
-        js_extension = "min.js" if not settings.DEBUG else "js"
-        convenient_formsets_media = forms.Media(
-            js=(f"convenient_formsets/convenient_formsets.{js_extension}",)
+        Returns the offset of the window following the initial forms of this
+        unbound windowed formset, or `None` if there are no further objects.
+        """
+        if not self.window_size or self.is_bound:
+            return None
+
+        next_window_offset = self.window_offset + self.initial_form_count()
+        if next_window_offset >= self._unwindowed_queryset.count():
+            return None
+        return next_window_offset
+
+    def add_prefix(self, index: Any) -> str:
+        # Number the forms of a window after the forms of preceding windows
+        if self.window_size and not self.is_bound and isinstance(index, int):
+            index += self.window_offset
+        return super().add_prefix(index)  # type: ignore[no-any-return]
+
+    def get_js_options(self, **options: Any) -> Dict[str, Any]:
+        """
+        Returns the options for initializing a `ConvenientFormset`, enabling
+        the loading of further windows if the formset is windowed. The URL of
+        the window view should be given as `loadFormsUrl` option.
+        """
+        if self.window_size:
+            options = {
+                "canLoadForms": True,
+                "loadFormsButtonSelector": f"#{self.prefix}-load-forms-button",
+                **self.js_options,
+                **options,
+            }
+        return super().get_js_options(**options)
+
+    def render_window(
+        self, form_template_name: Optional[str] = None
+    ) -> Iterator[SafeString]:
+        """
+        Yields the rendered initial forms of this windowed formset, to be
+        loaded into the formset by the JavaScript after the preceding windows.
+        """
+        yield from self.render_initial_forms(form_template_name)
+
+    def render_forms(
+        self, form_template_name: Optional[str] = None
+    ) -> Iterator[SafeString]:
+        yield from self.render_initial_forms(form_template_name)
+        for i in range(self.initial_form_count(), self.total_form_count()):
+            yield self.render_form(self.get_form(i), form_template_name)
+
+    def render_initial_forms(
+        self, form_template_name: Optional[str] = None
+    ) -> Iterator[SafeString]:
+        """
+        Yields the rendered initial forms one at a time, like `render_form()`.
+        If `cache_forms` is enabled and this formset is unbound, the markup of
+        each form is cached, either in process memory or in the Django cache
+        configured as `form_cache_alias`. The cache keys are derived from the
+        objects, so that forms are only constructed when they are not cached.
+        """
+        if not self.cache_forms or self.is_bound:
+            for i in range(self.initial_form_count()):
+                yield self.render_form(self.get_form(i), form_template_name)
+            return
+
+        queryset = self.get_queryset()
+        cache_keys = [
+            self.get_form_cache_key(i, queryset[i], form_template_name)
+            for i in range(self.initial_form_count())
+        ]
+        cache = get_cache(self.form_cache_alias)
+        cached_forms = cache.get_many([key for key in cache_keys if key is not None])
+        for i, cache_key in enumerate(cache_keys):
+            rendered_form = cached_forms.get(cache_key)
+            if rendered_form is None:
+                rendered_form = self.render_form(self.get_form(i), form_template_name)
+                if cache_key is not None:
+                    cache.set(cache_key, str(rendered_form))
+            yield mark_safe(rendered_form)
+
+    @cached_property
+    def form_cache_signature(self) -> Optional[str]:
+        """
+        Returns the signature of the fields and rendering options of the
+        forms, as given by the empty form, or `None` if their rendering may
+        vary.
+        """
+        return get_form_signature(self.empty_form)
+
+    def get_form_cache_key(
+        self, i: int, instance: Any, form_template_name: Optional[str]
+    ) -> Optional[str]:
+        """
+        Returns the key of the cached markup of the initial form with index
+        `i` for `instance`, or `None` if it's not to be cached. The key is
+        derived from the formset class, the signature of its forms, the prefix
+        of the form, and the primary key value and version of its instance.
+        Forms of which the rendering may vary, like those with a
+        `ModelChoiceField`, are not cached.
+        """
+        version = self.get_form_cache_version(instance)
+        if version is None or self.form_cache_signature is None:
+            return None
+
+        key_parts = [
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            f"{type(self.renderer).__module__}.{type(self.renderer).__qualname__}",
+            str(self.auto_id),
+            str(form_template_name),
+            str(translation.get_language()),
+            self.form_cache_signature,
+            self.add_prefix(i),
+            str(instance.pk),
+            str(version),
+        ]
+        key_hash = hashlib.sha256("\0".join(key_parts).encode()).hexdigest()
+        return f"convenient_formsets.form.{key_hash}"
+
+    def get_form_cache_version(self, instance: Any) -> Any:
+        """
+        Returns the version of `instance` identifying the markup of its form,
+        which is the value of its `form_cache_version_field` field, or `None`
+        if its form is not to be cached.
+        """
+        if self.form_cache_version_field is None:
+            return None
+        return getattr(instance, self.form_cache_version_field)
+
+    def share_field_choices(self, name: str, field: forms.Field) -> forms.Field:
+        """
+        Looks up values of the primary key field among the objects of the
+        formset's queryset, or among the submitted objects if
+        `fetch_submitted_objects` is enabled, rather than evaluating its
+        queryset spanning the entire table. Unknown values are looked up in the
+        database as usual.
+        """
+        if name != self._pk_field.name:
+            return super().share_field_choices(name, field)
+        if not can_share_choices(field):
+            return field
+        if name not in self.shared_choices:
+            if self.fetch_submitted_objects and self.is_bound:
+                objects = list(self.submitted_objects.values())
+            else:
+                objects = self.get_queryset()
+            self.shared_choices[name] = SharedChoices(objects, complete=False)
+        return share_choices(field, self.shared_choices[name])
+
+    def _construct_form(self, i: int, **kwargs: Any) -> forms.Form:
+        if i in self.deleted_form_pks:
+            with self.measure_phase("construct", self.add_prefix(i)):
+                return self.construct_deleted_form(i, self.deleted_form_pks[i])
+
+        form = super()._construct_form(i, **kwargs)
+        if self.batch_unique_checks and form.is_bound:
+            form.validate_unique = functools.partial(self.defer_unique_checks, form)
+        if (
+            self.trust_unchanged_forms
+            and form.is_bound
+            and i < self.initial_form_count()
+            and not form.is_multipart()
+            and self.is_form_unchanged(form)
+        ):
+            self.trust_form(form)
+        return form
+
+    def clean_forms(self) -> None:
+        """
+        Validates the uniqueness of the instances of all forms in bulk once
+        the forms are cleaned, if `batch_unique_checks` is enabled.
+        """
+        if not self.batch_unique_checks:
+            super().clean_forms()
+            return
+
+        # Set up the deferred checks before forms may be cleaned in parallel
+        deferred_unique_checks = self.deferred_unique_checks
+        super().clean_forms()
+        for form in self.forms:
+            if form._errors is None:  # pylint: disable=protected-access
+                form.full_clean()
+
+        forms_with_exclusions = [
+            (form, exclude)
+            for form, exclude in deferred_unique_checks
+            if not (self.can_delete and self._should_delete_form(form))
+        ]
+        deferred_unique_checks.clear()
+        with self.measure_phase("validate_unique"):
+            validate_unique_in_bulk(
+                forms_with_exclusions, self.batch_unique_checks_size
+            )
+
+    @cached_property
+    def deferred_unique_checks(self) -> List[Tuple[forms.Form, Set[str]]]:
+        """
+        Returns the forms of which the uniqueness checks are deferred, along
+        with the field names excluded from these checks.
+        """
+        return []
+
+    def defer_unique_checks(self, form: forms.Form) -> None:
+        """
+        Replaces `validate_unique()` of `form`, deferring its uniqueness checks
+        to be performed in bulk with those of the other forms.
+        """
+        exclude = form._get_validation_exclusions()  # pylint: disable=protected-access
+        self.deferred_unique_checks.append((form, exclude))
+
+    def add_fields(self, form: forms.Form, index: Any) -> None:
+        super().add_fields(form, index)
+        if (
+            self.can_order
+            and self.window_size
+            and not self.is_bound
+            and index is not None
+            and index < self.initial_form_count()
+        ):
+            form.fields[ORDERING_FIELD_NAME].initial += self.window_offset
+        if (
+            self.trust_unchanged_forms
+            and index is not None
+            and index < self.initial_form_count()
+        ):
+            # Only unbound forms render the digest of their initial data. It's
+            # passed as a plain value, so the form's markup can still be cached
+            digest = None if form.is_bound else self.get_form_digest(form, initial=True)
+            form.fields[DIGEST_FIELD_NAME] = DigestField(initial=digest)
+
+    def get_form_digest(self, form: forms.Form, initial: bool) -> str:
+        """
+        Returns a digest of the values of `form`, either as rendered for its
+        initial data or as submitted in its data.
+        """
+        key_salt = f"convenient_formsets.{type(self).__qualname__}"
+        return calculate_digest(form, key_salt, initial=initial)
+
+    def is_form_unchanged(self, form: forms.Form) -> bool:
+        """
+        Returns whether the submitted data of an existing `form` is identical
+        to its initial data, by comparing the digest of the submitted values
+        to the digest rendered along with the form.
+        """
+        if form.instance.pk is None:
+            return False
+
+        rendered_digest = form.data.get(form.add_prefix(DIGEST_FIELD_NAME))
+        if not isinstance(rendered_digest, str):
+            return False
+        return bool(
+            constant_time_compare(
+                rendered_digest, self.get_form_digest(form, initial=False)
+            )
         )
-        forms_media = super().media  # type: ignore[misc]
-        return convenient_formsets_media + forms_media
+
+    def trust_form(self, form: forms.Form) -> None:
+        """
+        Marks the unchanged `form` as valid without cleaning it, deriving its
+        `cleaned_data` from its initial data instead, as computed when
+        constructing the form. Foreign keys hold the primary key of the
+        related object, so that no further queries are needed.
+        """
+        cleaned_data = {}
+        for name, field in form.fields.items():
+            if isinstance(field, InlineForeignKeyField):
+                value = None if field.pk_field else field.parent_instance
+            elif name == self._pk_field.name:
+                value = form.instance
+            elif name == DELETION_FIELD_NAME:
+                value = False
+            elif name == DIGEST_FIELD_NAME:
+                value = form.data.get(form.add_prefix(name))
+            else:
+                value = form[name].initial
+            cleaned_data[name] = value
+
+        form.cleaned_data = cleaned_data
+        # pylint: disable-next=protected-access
+        form._errors = ErrorDict(renderer=form.renderer)
+        form.__dict__["changed_data"] = []
+
+    def save(self, commit: bool = True) -> List[Any]:
+        """
+        Saves model instances for every form. If `bulk_save` is enabled and
+        `commit` is set, instances are deleted, updated and created in bulk
+        inside a single transaction, instead of one query per form.
+        """
+        with self.measure_phase("save"):
+            if not (commit and self.can_bulk_save()):
+                self.load_deleted_instances()
+                return super().save(commit=commit)  # type: ignore[no-any-return]
+
+            using = router.db_for_write(self.model)
+            with transaction.atomic(using=using):
+                saved_instances = self.bulk_save_existing_objects(using)
+                if not self.edit_only:
+                    saved_instances += self.bulk_save_new_objects(using)
+            return saved_instances
+
+    save.alters_data = True  # type: ignore[attr-defined]
+
+    def can_bulk_save(self) -> bool:
+        """
+        Returns whether instances are saved in bulk, which requires
+        `bulk_save` to be enabled. As bulk queries bypass the `save()` method
+        of the model, models overriding it are saved one by one, unless
+        `bulk_save_ignore_model_save` is enabled.
+        """
+        if not self.bulk_save:
+            return False
+        overrides_save = self.model.save is not models.Model.save
+        return not overrides_save or self.bulk_save_ignore_model_save
+
+    async def aload_queryset(self) -> None:
+        """
+        Evaluates the formset's queryset using async iteration, so that
+        constructing the forms afterwards does not query it. If
+        `fetch_submitted_objects` is enabled, only the submitted objects are
+        fetched, using `ain_bulk()`.
+        """
+        if self.fetch_submitted_objects and self.is_bound:
+            await self.aload_submitted_objects()
+            return
+
+        queryset = self.get_queryset()
+        if queryset._result_cache is not None:  # pylint: disable=protected-access
+            return
+        if queryset._prefetch_related_lookups:  # pylint: disable=protected-access
+            # Async iteration does not support prefetching related objects
+            # pylint: disable-next=protected-access
+            await sync_to_async(queryset._fetch_all)()
+        else:
+            # pylint: disable-next=protected-access
+            queryset._result_cache = [obj async for obj in queryset]
+
+    async def aload_submitted_objects(self) -> None:
+        """
+        Fetches the submitted objects like `submitted_objects` does, using
+        async queries.
+        """
+        if "submitted_objects" in self.__dict__:
+            return
+
+        # Looking up forms skipped as deleted may query the database
+        queryset, pks = await sync_to_async(self.get_submitted_objects_lookup)()
+        if queryset.query.is_sliced:
+            pk_set = set(pks)
+            submitted_objects = {
+                obj.pk: obj async for obj in queryset if obj.pk in pk_set
+            }
+        else:
+            submitted_objects = await queryset.ain_bulk(pks)
+        self.__dict__["submitted_objects"] = submitted_objects
+
+    async def ais_valid(self) -> bool:
+        """
+        Returns whether all forms are valid like `is_valid()`, after loading
+        the queryset asynchronously. Forms are cleaned in a thread, as form
+        validation is synchronous.
+        """
+        if self.is_bound:
+            await self.aload_queryset()
+        return bool(await sync_to_async(self.is_valid)())
+
+    async def asave(self, commit: bool = True) -> List[Any]:
+        """
+        Saves model instances for every form like `save()`, in a thread as
+        saving is synchronous. If `commit` is set, all queries are performed
+        inside a single transaction.
+        """
+        return await sync_to_async(self.save_atomic)(commit=commit)
+
+    asave.alters_data = True  # type: ignore[attr-defined]
+
+    def save_atomic(self, commit: bool = True) -> List[Any]:
+        """
+        Saves model instances for every form using `save()`, inside a single
+        transaction if `commit` is set.
+        """
+        if not commit:
+            return self.save(commit=False)
+
+        using = router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            return self.save(commit=True)
+
+    save_atomic.alters_data = True  # type: ignore[attr-defined]
+
+    def collect_existing_objects(self) -> List[forms.Form]:
+        """
+        Populates `deleted_objects` and `changed_objects` from the initial
+        forms, returning the changed forms.
+        """
+        self.changed_objects = []  # pylint: disable=attribute-defined-outside-init
+        self.deleted_objects = []  # pylint: disable=attribute-defined-outside-init
+
+        changed_forms = []
+        forms_to_delete = set(self.deleted_forms)
+        for form in self.initial_forms:
+            obj = form.instance
+            # Skip unexpected empty instances, see `save_existing_objects()`
+            if obj.pk is None:
+                continue
+            if form in forms_to_delete:
+                self.deleted_objects.append(obj)
+            elif form.has_changed():
+                self.changed_objects.append((obj, form.changed_data))
+                changed_forms.append(form)
+        return changed_forms
+
+    def get_new_forms(self) -> List[forms.Form]:
+        """
+        Returns the changed extra forms that are not marked for deletion.
+        """
+        return [
+            form
+            for form in self.extra_forms
+            if form.has_changed()
+            and not (self.can_delete and self._should_delete_form(form))
+        ]
+
+    def get_bulk_update_fields(self, changed_forms: List[forms.Form]) -> List[str]:
+        """
+        Returns the names of the concrete fields that changed in any of the
+        given forms, to be updated in bulk, along with the fields updated on
+        every save, like a `DateTimeField` with `auto_now` set.
+        """
+        changed_fields: Set[str] = set()
+        for form in changed_forms:
+            changed_fields.update(form.changed_data)
+        return [
+            field.name
+            # pylint: disable-next=protected-access
+            for field in self.model._meta.concrete_fields
+            if (field.name in changed_fields or getattr(field, "auto_now", False))
+            and not field.primary_key
+        ]
+
+    def pre_save_bulk_update(
+        self, instances: List[Any], update_fields: List[str]
+    ) -> None:
+        """
+        Calls `pre_save()` of the `update_fields` for each of the `instances`
+        and assigns the returned values, like saving an instance does, since
+        `bulk_update()` reads the values as they are. This sets the current
+        time for fields with `auto_now` set and commits files, for example.
+        """
+        opts = self.model._meta  # pylint: disable=protected-access
+        fields = [opts.get_field(name) for name in update_fields]
+        for instance in instances:
+            for field in fields:
+                setattr(instance, field.attname, field.pre_save(instance, False))
+
+    def bulk_save_existing_objects(self, using: str) -> List[Any]:
+        """
+        Deletes the instances of forms marked for deletion in a single query
+        and updates the instances of changed forms using `bulk_update`,
+        limited to the fields that changed in any of these forms.
+        """
+        changed_forms = self.collect_existing_objects()
+
+        # pylint: disable-next=protected-access
+        manager = self.model._default_manager.db_manager(using)
+        if self.deleted_objects:
+            pks = [obj.pk for obj in self.deleted_objects]
+            manager.filter(pk__in=pks).delete()
+
+        saved_instances = [
+            self.save_existing(form, form.instance, commit=False)
+            for form in changed_forms
+        ]
+        update_fields = self.get_bulk_update_fields(changed_forms)
+        if saved_instances and update_fields:
+            self._send_bulk_save_signal(pre_save, saved_instances, using, update_fields)
+            self.pre_save_bulk_update(saved_instances, update_fields)
+            manager.bulk_update(
+                saved_instances, update_fields, batch_size=self.bulk_save_batch_size
+            )
+            self._send_bulk_save_signal(
+                post_save, saved_instances, using, update_fields, created=False
+            )
+
+        for form in changed_forms:
+            form.save_m2m()
+        return saved_instances
+
+    def bulk_save_new_objects(self, using: str) -> List[Any]:
+        """
+        Creates the instances of all changed extra forms using `bulk_create`.
+        As the primary keys of the created instances are required to save
+        their many-to-many data, the instances are saved one by one instead if
+        the database does not return them from bulk inserts.
+        """
+        new_forms = self.get_new_forms()
+        if not connections[using].features.can_return_rows_from_bulk_insert:
+            # pylint: disable-next=attribute-defined-outside-init
+            self.new_objects = [self.save_new(form, commit=True) for form in new_forms]
+            return self.new_objects
+
+        # pylint: disable-next=attribute-defined-outside-init
+        self.new_objects = [self.save_new(form, commit=False) for form in new_forms]
+
+        if self.new_objects:
+            # pylint: disable-next=protected-access
+            manager = self.model._default_manager.db_manager(using)
+            self._send_bulk_save_signal(pre_save, self.new_objects, using)
+            manager.bulk_create(self.new_objects, batch_size=self.bulk_save_batch_size)
+            self._send_bulk_save_signal(
+                post_save, self.new_objects, using, created=True
+            )
+
+        for form in new_forms:
+            form.save_m2m()
+        return self.new_objects
+
+    def _send_bulk_save_signal(
+        self,
+        signal: Any,
+        instances: List[Any],
+        using: str,
+        update_fields: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Sends `signal` for each of the given `instances`, which the bulk
+        queries would skip otherwise, if `bulk_save_send_signals` is enabled.
+        """
+        if not self.bulk_save_send_signals:
+            return
+
+        if update_fields is not None:
+            update_fields = frozenset(update_fields)
+        for instance in instances:
+            signal.send(
+                sender=instance.__class__,
+                instance=instance,
+                raw=False,
+                using=using,
+                update_fields=update_fields,
+                **kwargs,
+            )
 
 
 class ConvenientBaseFormSet(ConvenientFormsetsBase, forms.BaseFormSet):
     pass
 
 
-class ConvenientBaseModelFormSet(ConvenientFormsetsBase, forms.BaseModelFormSet):
+class ConvenientBaseModelFormSet(ConvenientModelFormsetsBase, forms.BaseModelFormSet):
     pass
 
 
-class ConvenientBaseInlineFormSet(ConvenientFormsetsBase, forms.BaseInlineFormSet):
+class ConvenientBaseInlineFormSet(ConvenientModelFormsetsBase, forms.BaseInlineFormSet):
     pass
@@ -0,0 +1,167 @@
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db import connections  # type: ignore[import-untyped]
+
+# Stats of the formsets instrumented in the current context, if collected by
+# `collect_formset_stats()`
+collected_stats: "ContextVar[Optional[List[FormsetStats]]]" = ContextVar(
+    "convenient_formsets_collected_stats", default=None
+)
+
+# Total of the measurements nested within the measurement in the current
+# context, to be excluded from it
+nested_measurement: "ContextVar[Optional[Measurement]]" = ContextVar(
+    "convenient_formsets_nested_measurement", default=None
+)
+nested_measurement_lock = threading.Lock()
+
+
+class Measurement:
+    """
+    Holds the time in seconds and the number of database queries spent on
+    `count` runs of a phase.
+    """
+
+    def __init__(self, seconds: float = 0.0, queries: int = 0, count: int = 0) -> None:
+        self.seconds = seconds
+        self.queries = queries
+        self.count = count
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(seconds={self.seconds!r}, "
+            f"queries={self.queries!r}, count={self.count!r})"
+        )
+
+    def add(self, other: "Measurement") -> None:
+        self.seconds += other.seconds
+        self.queries += other.queries
+        self.count += other.count
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"seconds": self.seconds, "queries": self.queries, "count": self.count}
+
+
+class FormsetStats:
+    """
+    Holds the measurements of the phases of a formset, both in total and per
+    form, keyed by phase and by form prefix.
+    """
+
+    def __init__(self, name: str, prefix: str) -> None:
+        self.name = name
+        self.prefix = prefix
+        self.phases: Dict[str, Measurement] = {}
+        self.forms: Dict[str, Dict[str, Measurement]] = {}
+        self.lock = threading.Lock()
+
+    def add(
+        self, phase: str, measurement: Measurement, form_prefix: Optional[str] = None
+    ) -> None:
+        """
+        Adds `measurement` to the total of `phase` and, if given, to the
+        measurements of the form with `form_prefix`.
+        """
+        with self.lock:
+            self.phases.setdefault(phase, Measurement()).add(measurement)
+            if form_prefix is not None:
+                form_phases = self.forms.setdefault(form_prefix, {})
+                form_phases.setdefault(phase, Measurement()).add(measurement)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the measurements as a JSON serializable dictionary.
+        """
+        with self.lock:
+            return {
+                "name": self.name,
+                "prefix": self.prefix,
+                "phases": {
+                    phase: measurement.as_dict()
+                    for phase, measurement in self.phases.items()
+                },
+                "forms": {
+                    form_prefix: {
+                        phase: measurement.as_dict()
+                        for phase, measurement in form_phases.items()
+                    }
+                    for form_prefix, form_phases in self.forms.items()
+                },
+            }
+
+    def iter_metrics(self) -> Iterator[Tuple[str, float]]:
+        """
+        Yields the totals of each phase as `(name, value)` pairs, named like
+        `<phase>.seconds`, `<phase>.queries` and `<phase>.count`, to be passed
+        to a metrics exporter.
+        """
+        with self.lock:
+            totals = [
+                (phase, measurement.as_dict())
+                for phase, measurement in self.phases.items()
+            ]
+        for phase, values in totals:
+            for key, value in values.items():
+                yield f"{phase}.{key}", value
+
+
+class QueryCounter:
+    """
+    Counts the queries executed on the database connections of the current
+    thread.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(
+        self, execute: Any, sql: str, params: Any, many: bool, context: Any
+    ) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextlib.contextmanager
+def measure() -> Iterator[Measurement]:
+    """
+    Measures the time and number of queries spent within the context into the
+    yielded `Measurement`, once the context exits. Measurements nested within
+    the context are excluded, so that measured phases never overlap.
+    """
+    measurement = Measurement(count=1)
+    counter = QueryCounter()
+    parent_nested = nested_measurement.get()
+    nested = Measurement()
+    token = nested_measurement.set(nested)
+    with contextlib.ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            seconds = time.perf_counter() - start
+            nested_measurement.reset(token)
+            with nested_measurement_lock:
+                measurement.seconds = seconds - nested.seconds
+                measurement.queries = counter.count - nested.queries
+                if parent_nested is not None:
+                    parent_nested.add(Measurement(seconds, counter.count))
+
+
+@contextlib.contextmanager
+def collect_formset_stats() -> Iterator[List[FormsetStats]]:
+    """
+    Instruments all formsets within the context, yielding the list to which
+    their stats are appended.
+    """
+    stats: List[FormsetStats] = []
+    token = collected_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        collected_stats.reset(token)
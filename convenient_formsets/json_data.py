@@ -0,0 +1,95 @@
+import json
+from typing import Any, List, Optional
+
+from django.conf import settings  # type: ignore[import-untyped]
+from django.core.exceptions import TooManyFieldsSent  # type: ignore[import-untyped]
+from django.utils.datastructures import (  # type: ignore[import-untyped]
+    MultiValueDict,
+)
+
+JSON_DATA_FIELD_NAME = "JSON_DATA"
+
+
+def decode_form_values(value: Any) -> Optional[List[str]]:
+    """
+    Returns the list of values submitted for a field, given a string, a list
+    of strings, or `None` if the field was not submitted.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    raise ValueError("Invalid field value.")
+
+
+def copy_data(data: Any) -> MultiValueDict:
+    """
+    Returns a copy of `data` as a `MultiValueDict`, given a `MultiValueDict`
+    or a dictionary of values or lists of values.
+    """
+    copied_data = MultiValueDict()
+    if isinstance(data, MultiValueDict):
+        for name, values in data.lists():
+            copied_data.setlist(name, values)
+    else:
+        for name, value in data.items():
+            copied_data.setlist(name, value if isinstance(value, list) else [value])
+    return copied_data
+
+
+def check_number_of_fields(number_of_fields: int) -> None:
+    """
+    Raises `TooManyFieldsSent` if `number_of_fields` exceeds
+    `DATA_UPLOAD_MAX_NUMBER_FIELDS`, as Django does for submitted fields.
+    """
+    max_fields = settings.DATA_UPLOAD_MAX_NUMBER_FIELDS
+    if max_fields is not None and number_of_fields > max_fields:
+        raise TooManyFieldsSent(
+            "The number of GET/POST parameters exceeded "
+            "settings.DATA_UPLOAD_MAX_NUMBER_FIELDS."
+        )
+
+
+def decode_json_data(data: Any, prefix: str, max_forms: int) -> MultiValueDict:
+    """
+    Returns a copy of `data` in which the forms submitted as JSON in the
+    `<prefix>-JSON_DATA` field are replaced by their prefixed fields, as if
+    they were submitted one by one. The JSON holds the field names without
+    prefix and the values of each form in the same order, with forms listed
+    by index:
+
+        {"fields": ["name", "tags"], "forms": [["A", ["1", "2"]], null]}
+
+    At most `max_forms` forms are decoded. Raises `ValueError` if the JSON is
+    malformed, and `TooManyFieldsSent` if the decoded fields exceed
+    `DATA_UPLOAD_MAX_NUMBER_FIELDS`, as Django does for submitted fields.
+    """
+    json_data_name = f"{prefix}-{JSON_DATA_FIELD_NAME}"
+    decoded_data = copy_data(data)
+    json_string = decoded_data.pop(json_data_name)[-1]
+    if not isinstance(json_string, str):
+        raise ValueError("Invalid JSON data.")
+    json_data = json.loads(json_string)
+    if not isinstance(json_data, dict):
+        raise ValueError("Invalid JSON data.")
+    field_names = json_data.get("fields")
+    form_values = json_data.get("forms")
+    if not isinstance(field_names, list) or not isinstance(form_values, list):
+        raise ValueError("Invalid JSON data.")
+    if not all(isinstance(field_name, str) for field_name in field_names):
+        raise ValueError("Invalid field name.")
+    form_values = form_values[:max_forms]
+    check_number_of_fields(len(field_names) * len(form_values))
+
+    for i, values in enumerate(form_values):
+        if values is None:
+            continue
+        if not isinstance(values, list) or len(values) > len(field_names):
+            raise ValueError("Invalid form values.")
+        for field_name, value in zip(field_names, values):
+            field_values = decode_form_values(value)
+            if field_values is not None:
+                decoded_data.setlist(f"{prefix}-{i}-{field_name}", field_values)
+    return decoded_data
@@ -0,0 +1,44 @@
+from typing import Any, List, Optional
+
+from debug_toolbar.panels import Panel  # pylint: disable=import-error
+from django.utils.translation import (  # type: ignore[import-untyped]
+    gettext_lazy,
+    ngettext,
+)
+
+from .instrumentation import FormsetStats, collected_stats
+
+
+class FormsetsPanel(Panel):
+    """
+    Panel for django-debug-toolbar, showing the measurements of the phases of
+    all formsets used while processing the request, in total and per form.
+    """
+
+    title = gettext_lazy("Formsets")
+    template = "convenient_formsets/formsets_panel.html"
+
+    stats_list: Optional[List[FormsetStats]] = None
+
+    @property
+    def nav_subtitle(self) -> str:
+        count = len(self.get_stats().get("formsets", []))
+        return str(
+            ngettext("%(count)d formset", "%(count)d formsets", count)
+            % {"count": count}
+        )
+
+    def enable_instrumentation(self) -> None:
+        # The variable is set rather than reset afterwards, as instrumentation
+        # may be disabled in another context
+        self.stats_list = []
+        collected_stats.set(self.stats_list)
+
+    def disable_instrumentation(self) -> None:
+        collected_stats.set(None)
+
+    def generate_stats(self, request: Any, response: Any) -> None:
+        # pylint: disable=unused-argument
+        self.record_stats(
+            {"formsets": [stats.as_dict() for stats in self.stats_list or []]}
+        )
@@ -0,0 +1,6 @@
+from django.dispatch import Signal  # type: ignore[import-untyped]
+
+# Sent by instrumented formsets after measuring a phase, with the `formset`,
+# `phase`, `measurement` and `form_prefix` arguments. The form prefix is `None`
+# for phases measured for the formset as a whole.
+phase_measured = Signal()
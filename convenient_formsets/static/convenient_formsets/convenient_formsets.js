@@ -22,6 +22,26 @@ const ConvenientFormset = function(options) {
             'defaultValue': undefined,
             'requiredIf': 'always',
         },
+        'deferReindexing': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
+        'initializeLazily': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
+        'virtualizeForms': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
+        'virtualizeFormsMargin': {
+            'defaultValue': '100%',
+            'requiredIf': 'never',
+        },
+        'submitAsJson': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
 
         // Options for adding forms
         'canAddForms': {
@@ -50,6 +70,10 @@ const ConvenientFormset = function(options) {
             'defaultValue': undefined,
             'requiredIf': 'canDeleteForms',
         },
+        'omitDeletedFormFields': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
 
         // Options for ordering forms
         'canOrderForms': {
@@ -64,6 +88,32 @@ const ConvenientFormset = function(options) {
             'defaultValue': undefined,
             'requiredIf': 'canOrderForms',
         },
+        'canDragForms': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
+        'dragFormHandleSelector': {
+            'defaultValue': undefined,
+            'requiredIf': 'never',
+        },
+
+        // Options for loading further forms
+        'canLoadForms': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
+        'loadFormsUrl': {
+            'defaultValue': undefined,
+            'requiredIf': 'canLoadForms',
+        },
+        'loadFormsButtonSelector': {
+            'defaultValue': undefined,
+            'requiredIf': 'canLoadForms',
+        },
+        'loadFormsOnScroll': {
+            'defaultValue': false,
+            'requiredIf': 'never',
+        },
     };
 
     /* Formset specific options */
@@ -73,6 +123,45 @@ const ConvenientFormset = function(options) {
     const formsetElements = {};
     const managementFormElements = {};
 
+    /* Model of the forms in the formset, kept in sync with the DOM */
+    const formsState = {
+        // Forms in DOM order
+        'forms': [],
+        // Index and ORDER/DELETE input elements of each form
+        'records': new Map(),
+        // Number of forms not hidden for deletion
+        'visibleFormCount': 0,
+        // Observer of changes to the forms made outside of this formset
+        'observer': null,
+        // Forms of which the index is yet to be updated in the DOM and whether
+        // the management form is yet to be updated, if reindexing is deferred
+        'staleForms': new Set(),
+        'staleManagementForm': false,
+    };
+
+    /* State for initializing lazily */
+    const lazyInitializationState = {
+        'initialized': false,
+        'observer': null,
+    };
+
+    /* State for virtualizing forms */
+    const virtualFormsState = {
+        'observer': null,
+    };
+
+    /* State for dragging forms */
+    const dragFormsState = {
+        'form': null,
+    };
+
+    /* State for loading further forms */
+    const loadFormsState = {
+        'nextOffset': null,
+        'loading': false,
+        'observer': null,
+    };
+
 
     /* Helper functions */
     function updateAddFormButtonVisibility() {
@@ -81,227 +170,1290 @@ const ConvenientFormset = function(options) {
          * visible forms is less than maximum number of forms allowed,
          * otherwise hidden.
          */
-        const visibleForms = formsetElements.formsContainer.querySelectorAll(
-            `${formsetOptions.formSelector}:not([hidden])`
-        );
         const maxNumForms = parseInt(
             managementFormElements.maxNumFormsInput.value, 10
         );
-        formsetElements.addFormButton.hidden = !(visibleForms.length < maxNumForms);
+        formsetElements.addFormButton.hidden = !(
+            formsState.visibleFormCount < maxNumForms
+        );
+    }
+
+    function createFormRecord(form) {
+        /*
+         * Returns the record of `form` for `formsState`, holding its current
+         * index, its ORDER and DELETE input elements, if any, and the detached
+         * form once virtualized. Makes the form draggable if forms can be
+         * dragged and observes it if forms are virtualized.
+         */
+        if (formsetOptions.canOrderForms && formsetOptions.canDragForms) {
+            makeFormDraggable(form);
+        }
+        if (virtualFormsState.observer !== null) {
+            virtualFormsState.observer.observe(form);
+        }
+        return {
+            'index': getFormIndex(form),
+            'orderElement': form.querySelector('input[name$="ORDER"]'),
+            'deleteElement': form.querySelector('input[name$="DELETE"]'),
+            'detachedForm': null,
+        };
+    }
+
+    function setFormIndex(form, index) {
+        /*
+         * Updates the index of `form` to the given `index`, touching its DOM
+         * elements only if the index actually changes. If reindexing is
+         * deferred, the DOM elements are updated by `flushPendingChanges()`.
+         */
+        const record = formsState.records.get(form);
+        if (record.index !== index) {
+            if (formsetOptions.deferReindexing) {
+                formsState.staleForms.add(form);
+            }
+            else {
+                updateFormIndex(form, index);
+            }
+            record.index = index;
+        }
+    }
+
+    function removeFormRecord(form) {
+        /*
+         * Removes `form` from `formsState` and shifts the indexes of the forms
+         * following its index, leaving the indexes of other forms untouched.
+         */
+        const removedIndex = formsState.records.get(form).index;
+        formsState.records.delete(form);
+        formsState.staleForms.delete(form);
+        if (virtualFormsState.observer !== null) {
+            virtualFormsState.observer.unobserve(form);
+        }
+        formsState.forms.splice(formsState.forms.indexOf(form), 1);
+
+        for (let i = 0; i < formsState.forms.length; i++) {
+            const otherForm = formsState.forms[i];
+            const index = formsState.records.get(otherForm).index;
+            if (index > removedIndex) {
+                setFormIndex(otherForm, index - 1);
+            }
+        }
+    }
+
+    function makeFormDraggable(form) {
+        /*
+         * Makes `form` draggable, or its `dragFormHandle` if specified.
+         */
+        if (typeof formsetOptions.dragFormHandleSelector === 'undefined') {
+            form.draggable = true;
+        }
+        else {
+            const handles = form.querySelectorAll(
+                formsetOptions.dragFormHandleSelector
+            );
+            for (let i = 0; i < handles.length; i++) {
+                handles[i].draggable = true;
+            }
+        }
+    }
+
+    function getFormsSelector() {
+        /*
+         * Returns the CSS selector for the forms in `formsContainer`,
+         * including the placeholders of virtualized forms.
+         */
+        if (formsetOptions.virtualizeForms) {
+            return (
+                `${formsetOptions.formSelector}, ` +
+                `[data-convenient-formset-placeholder="${formsetOptions.formsetPrefix}"]`
+            );
+        }
+        return formsetOptions.formSelector;
+    }
+
+    function findVisibleFormPosition(position, step) {
+        /*
+         * Returns the position in `formsState.forms` of the first visible form
+         * found from `position` onwards, searching forwards or backwards
+         * depending on `step`. Returns -1 if there is no such form.
+         */
+        const forms = formsState.forms;
+        for (let i = position; i >= 0 && i < forms.length; i += step) {
+            if (!forms[i].hidden) {
+                return i;
+            }
+        }
+        return -1;
+    }
+
+    function syncFormsState() {
+        /*
+         * Rebuilds `formsState` from the forms in the DOM, keeping the records
+         * of known forms. Forms are numbered in order of their current index,
+         * so that indexes are consecutive as expected by the server side. New
+         * forms have an index value of '__prefix__' and are numbered last.
+         */
+        const forms = Array.from(
+            formsetElements.formsContainer.querySelectorAll(getFormsSelector())
+        );
+        const records = new Map();
+        let visibleFormCount = 0;
+        for (let i = 0; i < forms.length; i++) {
+            const form = forms[i];
+            records.set(form, formsState.records.get(form) || createFormRecord(form));
+            if (!form.hidden) {
+                visibleFormCount++;
+            }
+        }
+        formsState.forms = forms;
+        formsState.records = records;
+        formsState.visibleFormCount = visibleFormCount;
+
+        const positions = Array.from(forms.keys()).sort(
+            function(leftPosition, rightPosition) {
+                const leftFormIndex = records.get(forms[leftPosition]).index;
+                const rightFormIndex = records.get(forms[rightPosition]).index;
+                if (isNaN(leftFormIndex)) {
+                    return isNaN(rightFormIndex) ? 0 : 1;
+                }
+                else if (isNaN(rightFormIndex)) {
+                    return -1;
+                }
+                return leftFormIndex - rightFormIndex;
+            }
+        );
+        for (let i = 0; i < positions.length; i++) {
+            setFormIndex(forms[positions[i]], i);
+        }
+    }
+
+    function formsMutated(mutations) {
+        /*
+         * Callback of `formsState.observer`. Resyncs `formsState`, the
+         * management form and the `addFormButton` if forms have been added,
+         * removed, shown or hidden outside of this formset.
+         */
+        const formSelector = getFormsSelector();
+        const isOrContainsForm = function(node) {
+            return node instanceof Element && (
+                node.matches(formSelector) || node.querySelector(formSelector) !== null
+            );
+        };
+        const formsChanged = mutations.some(function(mutation) {
+            if (mutation.type === 'attributes') {
+                return mutation.target.matches(formSelector);
+            }
+            return (
+                Array.from(mutation.addedNodes).some(isOrContainsForm) ||
+                Array.from(mutation.removedNodes).some(isOrContainsForm)
+            );
+        });
+        if (!formsChanged) {
+            return;
+        }
+
+        syncFormsState();
+        updateManagementForm();
+        if (formsetOptions.canAddForms && formsetOptions.hideAddFormButtonOnMaxForms) {
+            updateAddFormButtonVisibility();
+        }
+    }
+
+    function syncPendingChanges() {
+        /*
+         * Processes changes to the forms made outside of this formset that
+         * have not been observed yet. Invoked before changing the forms.
+         */
+        if (formsState.observer !== null) {
+            formsMutated(formsState.observer.takeRecords());
+        }
+    }
+
+    function ignoreOwnChanges() {
+        /*
+         * Discards the observed changes to the forms, as made by this formset
+         * itself. Invoked after changing the forms.
+         */
+        if (formsState.observer !== null) {
+            formsState.observer.takeRecords();
+        }
+    }
+
+    function getFormIndex(form) {
+        /*
+         * Returns the index of `form`, parsed from the `name` attribute of its
+         * first `input`, `select` or `textarea` element. Returns `NaN` for new
+         * forms, which have an index value of '__prefix__'.
+         */
+        const prefix = formsetOptions.formsetPrefix;
+        const idRegex = new RegExp(`${prefix}-(\\d+|__prefix__)-`);
+
+        const inputElements = form.querySelectorAll('input, select, textarea');
+        for (let i = 0; i < inputElements.length; i++) {
+            const match = inputElements[i].name.match(idRegex);
+            if (match !== null) {
+                return parseInt(match[1], 10);
+            }
+        }
+        return NaN;
     }
 
-    function updateFormIndexes() {
+    function updateFormIndex(form, index) {
         /*
-         * Iterates over all forms in the formset and updates the ID of the
-         * `for` attribute of labels and the `id`/`name` attributes of inputs.
+         * Updates the ID of the `for` attribute of labels and the `id`/`name`
+         * attributes of inputs in `form` to the given `index`.
          */
         const prefix = formsetOptions.formsetPrefix;
         const idRegex = new RegExp(`${prefix}-(\\d+|__prefix__)`);
+        const idReplacement = `${prefix}-${index}`;
+
+        // Update the `for` attribute for all `label` elements
+        const labelElements = form.querySelectorAll('label');
+        for (let j = 0; j < labelElements.length; j++) {
+            const labelElement = labelElements[j];
+            if (labelElement.htmlFor) {
+                let attrValue = labelElement.htmlFor;
+                attrValue = attrValue.replace(idRegex, idReplacement);
+                labelElement.htmlFor = attrValue;
+            }
+        }
 
-        let forms = formsetElements.formsContainer.querySelectorAll(
-            formsetOptions.formSelector
+        // Update the `id`/`name` attributes for all `input`, `select` and
+        // `textarea` elements
+        const inputElements = form.querySelectorAll(
+            'input, select, textarea'
         );
-        forms = Array.from(forms);
+        for (let j = 0; j < inputElements.length; j++) {
+            const inputElement = inputElements[j];
+            if (inputElement.id) {
+                let attrValue = inputElement.id;
+                attrValue = attrValue.replace(idRegex, idReplacement);
+                inputElement.id = attrValue;
+            }
+            if (inputElement.name) {
+                let attrValue = inputElement.name;
+                attrValue = attrValue.replace(idRegex, idReplacement);
+                inputElement.name = attrValue;
+            }
+        }
+    }
 
-        // If forms can be ordered, order the retrieved forms by the `name`
-        // attribute of ORDER input elements. This ensures indexes are updated
-        // according to the server side's expectations.
-        if (formsetOptions.canOrderForms) {
-            const compareForms = function(leftForm, rightForm) {
-                const selector = 'input[name$="ORDER"]';
-                const leftFormOrderElement = leftForm.querySelector(selector);
-                const rightFormOrderElement = rightForm.querySelector(selector);
-
-                // Parse integral index from both form's ORDER input element
-                // name. New forms have an index value of '__prefix__', which
-                // cannot be parsed. They will moved to the back of the array.
-                const leftFormId = parseInt(
-                    leftFormOrderElement.name.match(idRegex)[1], 10
-                );
-                const rightFormId = parseInt(
-                    rightFormOrderElement.name.match(idRegex)[1], 10
-                );
-                if (isNaN(rightFormId) || leftFormId < rightFormId) {
-                    return -1;
+    function updateManagementForm() {
+        /*
+         * Updates the `TOTAL_FORMS` input in the management form to the number
+         * of forms in the formset, regardless of whether it has been marked
+         * for deletion. Invoked after forms have been added or deleted. If
+         * reindexing is deferred, the input is updated by
+         * `flushPendingChanges()`.
+         */
+        if (formsetOptions.deferReindexing) {
+            formsState.staleManagementForm = true;
+            return;
+        }
+        managementFormElements.totalFormsInput.value = formsState.forms.length;
+    }
+
+    function flushPendingChanges() {
+        /*
+         * Updates the DOM elements of forms of which the index has changed and
+         * the `TOTAL_FORMS` input in the management form, if reindexing is
+         * deferred.
+         */
+        syncPendingChanges();
+
+        formsState.staleForms.forEach(function(form) {
+            updateFormIndex(form, formsState.records.get(form).index);
+        });
+        formsState.staleForms.clear();
+
+        if (formsState.staleManagementForm) {
+            managementFormElements.totalFormsInput.value = formsState.forms.length;
+            formsState.staleManagementForm = false;
+        }
+
+        ignoreOwnChanges();
+    }
+
+    function appendFormEntries(formData, form) {
+        /*
+         * Appends the values of the named input elements of `form` to
+         * `formData`, as they would be included when submitting the form.
+         */
+        const ignoredTypes = ['button', 'image', 'reset', 'submit'];
+        const inputElements = form.querySelectorAll('input, select, textarea');
+        for (let i = 0; i < inputElements.length; i++) {
+            const element = inputElements[i];
+            if (!element.name || element.disabled) {
+                continue;
+            }
+
+            if (ignoredTypes.indexOf(element.type) !== -1) {
+                continue;
+            }
+            else if (element.type === 'checkbox' || element.type === 'radio') {
+                if (element.checked) {
+                    formData.append(element.name, element.value);
+                }
+            }
+            else if (element.type === 'file') {
+                for (let j = 0; j < element.files.length; j++) {
+                    formData.append(element.name, element.files[j]);
                 }
-                else if (isNaN(leftFormId) || leftFormId > rightFormId) {
-                    return 1;
+            }
+            else if (element.tagName === 'SELECT') {
+                for (let j = 0; j < element.options.length; j++) {
+                    if (element.options[j].selected) {
+                        formData.append(element.name, element.options[j].value);
+                    }
                 }
-            };
-
-            forms = forms.sort(compareForms);
+            }
+            else {
+                formData.append(element.name, element.value);
+            }
         }
+    }
 
 
-        for (let i = 0; i < forms.length; i++) {
-            const form = forms[i];
-            const idReplacement = `${prefix}-${i}`;
-
-            // Update the `for` attribute for all `label` elements
-            const labelElements = form.querySelectorAll('label');
-            for (let j = 0; j < labelElements.length; j++) {
-                const labelElement = labelElements[j];
-                if (labelElement.htmlFor) {
-                    let attrValue = labelElement.htmlFor;
-                    attrValue = attrValue.replace(idRegex, idReplacement);
-                    labelElement.htmlFor = attrValue;
+    function setFormValues(form, values) {
+        /*
+         * Sets the values of the input elements of `form`, a clone of
+         * `emptyForm`, from `values`, an object mapping field names (without
+         * prefix) to values. Checkboxes, radio buttons and options are checked
+         * or selected when their value is among the given value(s). Checkboxes
+         * are also checked when the given value is `true`. Returns the names
+         * of the fields for which input elements were found.
+         */
+        const namePrefix = `${formsetOptions.formsetPrefix}-__prefix__-`;
+        const foundFieldNames = new Set();
+        const inputElements = form.querySelectorAll('input, select, textarea');
+        for (let i = 0; i < inputElements.length; i++) {
+            const element = inputElements[i];
+            if (!element.name || element.name.indexOf(namePrefix) !== 0) {
+                continue;
+            }
+            const fieldName = element.name.slice(namePrefix.length);
+            if (!Object.prototype.hasOwnProperty.call(values, fieldName)) {
+                continue;
+            }
+            foundFieldNames.add(fieldName);
+
+            const value = values[fieldName];
+            const valueList = (Array.isArray(value) ? value : [value]).map(String);
+            if (element.type === 'checkbox') {
+                element.checked = (
+                    value === true || valueList.indexOf(element.value) !== -1
+                );
+            }
+            else if (element.type === 'radio') {
+                element.checked = valueList.indexOf(element.value) !== -1;
+            }
+            else if (element.tagName === 'SELECT' && element.multiple) {
+                for (let j = 0; j < element.options.length; j++) {
+                    const option = element.options[j];
+                    option.selected = valueList.indexOf(option.value) !== -1;
                 }
             }
+            else {
+                element.value = valueList.length ? valueList[0] : '';
+            }
+        }
+        return foundFieldNames;
+    }
 
-            // Update the `id`/`name` attributes for all `input`, `select` and
-            // `textarea` elements
-            const inputElements = form.querySelectorAll(
-                'input, select, textarea'
+    function addForms(count, values) {
+        /*
+         * Clones `emptyForm` `count` times, limited by the maximum number of
+         * forms allowed, and appends the new forms to `formsContainer` at
+         * once. If given, the new forms are pre-filled from `values`, an array
+         * with an object of field values for each form.
+         *
+         * The management form and the visibility of the `addFormButton` are
+         * updated once, after which a single event is dispatched listing the
+         * new forms. Returns the new forms.
+         */
+        syncPendingChanges();
+
+        const maxNumForms = parseInt(
+            managementFormElements.maxNumFormsInput.value, 10
+        );
+        const newFormCount = Math.min(
+            count, maxNumForms - formsState.visibleFormCount
+        );
+        if (!(newFormCount > 0)) {
+            return [];
+        }
+
+        // Determine the initial value of the ORDER input elements if forms can
+        // be ordered
+        let newFormOrderValue = 1;
+        if (formsetOptions.canOrderForms) {
+            const lastFormPosition = findVisibleFormPosition(
+                formsState.forms.length - 1, -1
             );
-            for (let j = 0; j < inputElements.length; j++) {
-                const inputElement = inputElements[j];
-                if (inputElement.id) {
-                    let attrValue = inputElement.id;
-                    attrValue = attrValue.replace(idRegex, idReplacement);
-                    inputElement.id = attrValue;
+            if (lastFormPosition !== -1) {
+                const lastForm = formsState.forms[lastFormPosition];
+                const lastFormOrderValue = parseInt(
+                    formsState.records.get(lastForm).orderElement.value, 10
+                );
+                newFormOrderValue = lastFormOrderValue + 1;
+            }
+        }
+
+        // Clone empty form for each new form, indexed after all other forms
+        const newForms = [];
+        const fragment = document.createDocumentFragment();
+        for (let i = 0; i < newFormCount; i++) {
+            const newForm = formsetElements.emptyForm.cloneNode(true);
+            const newFormRecord = createFormRecord(newForm);
+            if (formsetOptions.canOrderForms) {
+                newFormRecord.orderElement.value = newFormOrderValue + i;
+            }
+            if (values && values[i]) {
+                setFormValues(newForm, values[i]);
+            }
+
+            formsState.records.set(newForm, newFormRecord);
+            setFormIndex(newForm, formsState.forms.length);
+            formsState.forms.push(newForm);
+            formsState.visibleFormCount++;
+
+            fragment.appendChild(newForm);
+            newForms.push(newForm);
+        }
+
+        // Append forms to forms container
+        formsetElements.formsContainer.appendChild(fragment);
+
+        // Update visibility of the `addFormButton` if forms can be added
+        if (formsetOptions.canAddForms && formsetOptions.hideAddFormButtonOnMaxForms) {
+            updateAddFormButtonVisibility();
+        }
+
+        // Update the management form
+        updateManagementForm();
+        ignoreOwnChanges();
+
+        // Dispatch event
+        formsetElements.formsContainer.dispatchEvent(
+            new CustomEvent('convenient_formset:added', {
+                bubbles: true,
+                detail: {
+                    formsetPrefix: formsetOptions.formsetPrefix,
+                    forms: newForms,
+                },
+            })
+        );
+
+        return newForms;
+    }
+
+    function getFormValues(form) {
+        /*
+         * Returns the values of the input elements of `form` as an object
+         * mapping field names (without prefix) to values, as accepted by
+         * `setFormValues()`. The values of checkboxes, radio buttons and
+         * select elements are given as a list of checked or selected values.
+         */
+        const prefix = formsetOptions.formsetPrefix;
+        const nameRegex = new RegExp(`^${prefix}-(?:\\d+|__prefix__)-(.+)$`);
+
+        const values = {};
+        const inputElements = form.querySelectorAll('input, select, textarea');
+        for (let i = 0; i < inputElements.length; i++) {
+            const element = inputElements[i];
+            const match = element.name.match(nameRegex);
+            if (match === null) {
+                continue;
+            }
+
+            const fieldName = match[1];
+            if (element.type === 'checkbox' || element.type === 'radio') {
+                values[fieldName] = values[fieldName] || [];
+                if (element.checked) {
+                    values[fieldName].push(element.value);
+                }
+            }
+            else if (element.tagName === 'SELECT') {
+                values[fieldName] = Array.from(element.options).filter(
+                    function(option) { return option.selected; }
+                ).map(
+                    function(option) { return option.value; }
+                );
+            }
+            else {
+                values[fieldName] = element.value;
+            }
+        }
+        return values;
+    }
+
+    function canVirtualizeForm(form) {
+        /*
+         * Returns whether `form` can be virtualized: it should be visible,
+         * should not have focus and should not have files selected.
+         */
+        if (form.hidden || form.contains(document.activeElement)) {
+            return false;
+        }
+
+        const fileElements = form.querySelectorAll('input[type="file"]');
+        for (let i = 0; i < fileElements.length; i++) {
+            if (fileElements[i].files.length) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    function virtualizeForm(form, height) {
+        /*
+         * Replaces the mounted `form` in `formsContainer` by a placeholder of
+         * the given `height`, keeping the detached form in its record, along
+         * with its ORDER and DELETE input elements. The placeholder takes the
+         * place of the form in `formsState`.
+         */
+        const record = formsState.records.get(form);
+        record.detachedForm = form;
+
+        const placeholder = document.createElement(form.tagName);
+        placeholder.setAttribute(
+            'data-convenient-formset-placeholder', formsetOptions.formsetPrefix
+        );
+        placeholder.style.height = `${height}px`;
+        formsetElements.formsContainer.replaceChild(placeholder, form);
+
+        formsState.records.delete(form);
+        formsState.records.set(placeholder, record);
+        formsState.forms[formsState.forms.indexOf(form)] = placeholder;
+        formsState.staleForms.delete(form);
+
+        virtualFormsState.observer.unobserve(form);
+        virtualFormsState.observer.observe(placeholder);
+    }
+
+    function materializeForm(placeholder) {
+        /*
+         * Replaces `placeholder` in `formsContainer` by the form detached when
+         * virtualizing it, so that its server-rendered markup, such as errors
+         * and widgets, and the values of its input elements are kept as is.
+         * Updates its index from the record of the placeholder. Returns the
+         * mounted form.
+         */
+        const record = formsState.records.get(placeholder);
+        const form = record.detachedForm;
+        updateFormIndex(form, record.index);
+        record.detachedForm = null;
+
+        formsetElements.formsContainer.replaceChild(form, placeholder);
+
+        formsState.records.delete(placeholder);
+        formsState.records.set(form, record);
+        formsState.forms[formsState.forms.indexOf(placeholder)] = form;
+        formsState.staleForms.delete(placeholder);
+
+        virtualFormsState.observer.unobserve(placeholder);
+        virtualFormsState.observer.observe(form);
+        return form;
+    }
+
+    function serializeVirtualizedForms() {
+        /*
+         * Fills the placeholders of virtualized forms with hidden input
+         * elements holding the values of their detached forms, so that these
+         * are included when submitting the enclosing form. Returns the names
+         * of the input elements the placeholders held before.
+         */
+        const prefix = formsetOptions.formsetPrefix;
+        const previousNames = new Set();
+
+        for (let i = 0; i < formsState.forms.length; i++) {
+            const placeholder = formsState.forms[i];
+            const record = formsState.records.get(placeholder);
+            if (record.detachedForm === null) {
+                continue;
+            }
+
+            const inputElements = placeholder.querySelectorAll('input');
+            for (let j = 0; j < inputElements.length; j++) {
+                previousNames.add(inputElements[j].name);
+            }
+            placeholder.textContent = '';
+
+            const values = getFormValues(record.detachedForm);
+            for (const fieldName in values) {
+                const value = values[fieldName];
+                const valueList = Array.isArray(value) ? value : [value];
+                for (let j = 0; j < valueList.length; j++) {
+                    const inputElement = document.createElement('input');
+                    inputElement.type = 'hidden';
+                    inputElement.name = `${prefix}-${record.index}-${fieldName}`;
+                    inputElement.value = valueList[j];
+                    placeholder.appendChild(inputElement);
+                }
+            }
+        }
+
+        ignoreOwnChanges();
+        return previousNames;
+    }
+
+    function getVisibleForms() {
+        /*
+         * Returns the visible forms in `formsState.forms`, in DOM order.
+         */
+        return formsState.forms.filter(function(form) { return !form.hidden; });
+    }
+
+    function moveFormTo(form, position) {
+        /*
+         * Moves the visible `form` to the given `position` among the visible
+         * forms, clamped to the first and last position. The values of the
+         * ORDER input elements of the visible forms from the form's current
+         * position up to its new position are shifted along, keeping their
+         * original values.
+         */
+        syncPendingChanges();
+
+        const visibleForms = getVisibleForms();
+        const oldPosition = visibleForms.indexOf(form);
+        const newPosition = Math.max(
+            0, Math.min(position, visibleForms.length - 1)
+        );
+        if (oldPosition === -1 || oldPosition === newPosition) {
+            return;
+        }
+
+        // Collect the values of the ORDER input elements in the affected range
+        const startPosition = Math.min(oldPosition, newPosition);
+        const stopPosition = Math.max(oldPosition, newPosition) + 1;
+        const affectedForms = visibleForms.slice(startPosition, stopPosition);
+        const orderValues = affectedForms.map(function(affectedForm) {
+            return formsState.records.get(affectedForm).orderElement.value;
+        });
+
+        // Move form before or after the form at its new position
+        const targetForm = visibleForms[newPosition];
+        const forms = formsState.forms;
+        forms.splice(forms.indexOf(form), 1);
+        if (newPosition < oldPosition) {
+            formsetElements.formsContainer.insertBefore(form, targetForm);
+            forms.splice(forms.indexOf(targetForm), 0, form);
+            affectedForms.unshift(affectedForms.pop());
+        }
+        else {
+            formsetElements.formsContainer.insertBefore(form, targetForm.nextSibling);
+            forms.splice(forms.indexOf(targetForm) + 1, 0, form);
+            affectedForms.push(affectedForms.shift());
+        }
+        ignoreOwnChanges();
+
+        // Assign the values of the ORDER input elements in their new order
+        for (let i = 0; i < affectedForms.length; i++) {
+            formsState.records.get(affectedForms[i]).orderElement.value = orderValues[i];
+        }
+
+        // Dispatch event
+        form.dispatchEvent(
+            new CustomEvent('convenient_formset:moved', {
+                bubbles: true,
+                detail: {
+                    formsetPrefix: formsetOptions.formsetPrefix,
+                    oldPosition: oldPosition,
+                    newPosition: newPosition,
+                },
+            })
+        );
+    }
+
+
+    /* Event handlers */
+    function addFormButtonClicked() {
+        /*
+         * Event handler for clicks on the `addFormButton`. If the total
+         * number of visible forms is less than the maximum number of forms
+         * allowed, `emptyForm` is cloned and added to `formsContainer`.
+         *
+         * In case the `hideAddFormButtonOnMaxForms` option is set to `true`,
+         * it updates the visibility of the `addFormButton`.
+         */
+        addForms(1);
+    }
+
+    function formsContainerClicked(event) {
+        /*
+         * Event handler for clicks within `formsContainer`. Delegates clicks
+         * on the `deleteFormButton`, `moveFormDownButton` and
+         * `moveFormUpButton` of a form to the respective event handler, along
+         * with the form containing the clicked button.
+         */
+        const form = event.target.closest(formsetOptions.formSelector);
+        if (form === null || !formsetElements.formsContainer.contains(form)) {
+            return;
+        }
+
+        const buttonHandlers = [];
+        if (formsetOptions.canDeleteForms) {
+            buttonHandlers.push(
+                [formsetOptions.deleteFormButtonSelector, deleteFormButtonClicked]
+            );
+        }
+        if (formsetOptions.canOrderForms) {
+            buttonHandlers.push(
+                [formsetOptions.moveFormDownButtonSelector, moveFormDownButtonClicked],
+                [formsetOptions.moveFormUpButtonSelector, moveFormUpButtonClicked]
+            );
+        }
+
+        for (let i = 0; i < buttonHandlers.length; i++) {
+            const [selector, handler] = buttonHandlers[i];
+            const button = event.target.closest(selector);
+            if (button !== null && form.contains(button)) {
+                handler(form);
+                return;
+            }
+        }
+    }
+
+    function deleteFormButtonClicked(form) {
+        /*
+         * Event handler for clicks on the `deleteFormButton` of `form`. If a
+         * DELETE input element is present in the form, it's set to 'on' and
+         * the form is hidden, omitting its fields if `omitDeletedFormFields`
+         * is set. Otherwise the form is removed from the DOM altogether.
+         *
+         * In case the `hideAddFormButtonOnMaxForms` option is set to `true`,
+         * it updates the visibility of the `addFormButton`.
+         */
+        syncPendingChanges();
+
+        const deleteElement = formsState.records.get(form).deleteElement;
+        if (deleteElement !== null) {
+            deleteElement.value = 'on';
+            form.hidden = true;
+            if (formsetOptions.omitDeletedFormFields) {
+                omitFormFields(form);
+            }
+        }
+        else {
+            formsetElements.formsContainer.removeChild(form);
+            removeFormRecord(form);
+        }
+        formsState.visibleFormCount--;
+
+        // Update visibility of the `addFormButton` if forms can be added
+        if (formsetOptions.canAddForms && formsetOptions.hideAddFormButtonOnMaxForms) {
+            updateAddFormButtonVisibility();
+        }
+
+        // Update the management form
+        updateManagementForm();
+        ignoreOwnChanges();
+
+        // Dispatch event
+        document.dispatchEvent(
+            new CustomEvent('convenient_formset:removed', {
+                detail: {
+                    formsetPrefix: formsetOptions.formsetPrefix,
+                },
+            })
+        );
+    }
+
+    function omitFormFields(form) {
+        /*
+         * Disables the input elements of `form` marked for deletion, so they
+         * are not submitted. Hidden input elements, such as those of the
+         * primary key, and the DELETE and ORDER input elements are kept.
+         */
+        const record = formsState.records.get(form);
+        const inputElements = form.querySelectorAll('input, select, textarea');
+        for (let i = 0; i < inputElements.length; i++) {
+            const inputElement = inputElements[i];
+            if (
+                inputElement.type !== 'hidden'
+                && inputElement !== record.deleteElement
+                && inputElement !== record.orderElement
+            ) {
+                inputElement.disabled = true;
+            }
+        }
+    }
+
+    function moveFormDownButtonClicked(form) {
+        /*
+         * Event handler for clicks on the `moveFormDownButton` of `form`.
+         * Swaps the form with the next visible form in the DOM, along with
+         * their ordering values.
+         */
+        syncPendingChanges();
+
+        const forms = formsState.forms;
+        const formPosition = forms.indexOf(form);
+        const nextFormPosition = findVisibleFormPosition(formPosition + 1, 1);
+
+        if (nextFormPosition !== -1) {
+            // Move form after next form
+            const nextForm = forms[nextFormPosition];
+            formsetElements.formsContainer.insertBefore(nextForm, form);
+            forms.splice(nextFormPosition, 1);
+            forms.splice(formPosition, 0, nextForm);
+            ignoreOwnChanges();
+
+            // Swap the values of the ORDER input elements of both forms
+            const formOrderElement = formsState.records.get(form).orderElement;
+            const nextFormOrderElement = formsState.records.get(nextForm).orderElement;
+            const formOrderValue = formOrderElement.value;
+            const nextFormOrderValue = nextFormOrderElement.value;
+            formOrderElement.value = nextFormOrderValue;
+            nextFormOrderElement.value = formOrderValue;
+
+            // Dispatch event
+            form.dispatchEvent(
+                new CustomEvent('convenient_formset:movedDown', {
+                    bubbles: true,
+                    detail: {
+                        formsetPrefix: formsetOptions.formsetPrefix,
+                    },
+                })
+            );
+        }
+    }
+
+    function moveFormUpButtonClicked(form) {
+        /*
+         * Event handler for clicks on the `moveFormUpButton` of `form`. Swaps
+         * the form with the previous visible form in the DOM, along with their
+         * ordering values.
+         */
+        syncPendingChanges();
+
+        const forms = formsState.forms;
+        const formPosition = forms.indexOf(form);
+        const previousFormPosition = findVisibleFormPosition(formPosition - 1, -1);
+
+        if (previousFormPosition !== -1) {
+            // Move form before previous form
+            const previousForm = forms[previousFormPosition];
+            formsetElements.formsContainer.insertBefore(form, previousForm);
+            forms.splice(formPosition, 1);
+            forms.splice(previousFormPosition, 0, form);
+            ignoreOwnChanges();
+
+            // Swap the values of the ORDER input elements of both forms
+            const formOrderElement = formsState.records.get(form).orderElement;
+            const previousFormOrderElement = (
+                formsState.records.get(previousForm).orderElement
+            );
+            const formOrderValue = formOrderElement.value;
+            const previousFormOrderValue = previousFormOrderElement.value;
+            formOrderElement.value = previousFormOrderValue;
+            previousFormOrderElement.value = formOrderValue;
+
+            // Dispatch event
+            form.dispatchEvent(
+                new CustomEvent('convenient_formset:movedUp', {
+                    bubbles: true,
+                    detail: {
+                        formsetPrefix: formsetOptions.formsetPrefix,
+                    },
+                })
+            );
+        }
+    }
+
+    function formsContainerDragStarted(event) {
+        /*
+         * Event handler for starting to drag a form, or its `dragFormHandle`,
+         * within `formsContainer`.
+         */
+        const form = event.target.closest(formsetOptions.formSelector);
+        if (form === null || !formsState.records.has(form) || form.hidden) {
+            return;
+        }
+
+        dragFormsState.form = form;
+        event.dataTransfer.effectAllowed = 'move';
+        event.dataTransfer.setData('text/plain', '');
+    }
+
+    function formsContainerDraggedOver(event) {
+        /*
+         * Event handler for dragging over `formsContainer`, allowing to drop
+         * the dragged form onto another visible form.
+         */
+        if (dragFormsState.form === null) {
+            return;
+        }
+
+        const form = event.target.closest(formsetOptions.formSelector);
+        if (form !== null && formsState.records.has(form) && !form.hidden) {
+            event.preventDefault();
+            event.dataTransfer.dropEffect = 'move';
+        }
+    }
+
+    function formsContainerDropped(event) {
+        /*
+         * Event handler for dropping the dragged form onto another visible
+         * form, moving the dragged form to the position of the other form.
+         */
+        const draggedForm = dragFormsState.form;
+        dragFormsState.form = null;
+        if (draggedForm === null) {
+            return;
+        }
+
+        const form = event.target.closest(formsetOptions.formSelector);
+        if (form !== null && formsState.records.has(form) && !form.hidden) {
+            event.preventDefault();
+            moveFormTo(draggedForm, getVisibleForms().indexOf(form));
+        }
+    }
+
+    function formsContainerDragEnded() {
+        /*
+         * Event handler for the end of dragging a form, whether it has been
+         * dropped or not.
+         */
+        dragFormsState.form = null;
+    }
+
+    function formsVisibilityChanged(entries) {
+        /*
+         * Callback of `virtualFormsState.observer`. Virtualizes forms that
+         * have moved away from the viewport and mounts the forms of which the
+         * placeholder has moved near the viewport.
+         */
+        syncPendingChanges();
+
+        const mountedForms = [];
+        for (let i = 0; i < entries.length; i++) {
+            const entry = entries[i];
+            const record = formsState.records.get(entry.target);
+            if (typeof record === 'undefined') {
+                virtualFormsState.observer.unobserve(entry.target);
+            }
+            else if (record.detachedForm === null) {
+                if (!entry.isIntersecting && canVirtualizeForm(entry.target)) {
+                    virtualizeForm(entry.target, entry.boundingClientRect.height);
+                }
+            }
+            else if (entry.isIntersecting) {
+                mountedForms.push(materializeForm(entry.target));
+            }
+        }
+        ignoreOwnChanges();
+
+        // Dispatch events
+        for (let i = 0; i < mountedForms.length; i++) {
+            mountedForms[i].dispatchEvent(
+                new CustomEvent('convenient_formset:mounted', {
+                    bubbles: true,
+                    detail: {
+                        formsetPrefix: formsetOptions.formsetPrefix,
+                    },
+                })
+            );
+        }
+    }
+
+    function enclosingFormSubmitted() {
+        /*
+         * Event handler for submits of the form enclosing `formsContainer`,
+         * updating the forms of which the index has changed and the management
+         * form before the form data is constructed, if reindexing is deferred.
+         */
+        flushPendingChanges();
+    }
+
+    function enclosingFormDataConstructed(event) {
+        /*
+         * Event handler for the construction of form data of the form
+         * enclosing `formsContainer`, for example when submitted by calling
+         * `submit()`. Since the form data has been constructed from the DOM at
+         * this point, the entries of forms of which the index has changed and
+         * of the management form are replaced after updating the DOM, if
+         * reindexing is deferred.
+         */
+        syncPendingChanges();
+        if (!formsState.staleForms.size && !formsState.staleManagementForm) {
+            return;
+        }
+
+        // Collect the names of input elements of stale forms, in DOM order
+        const staleForms = formsState.forms.filter(
+            function(form) { return formsState.staleForms.has(form); }
+        );
+        const previousNames = new Set();
+        for (let i = 0; i < staleForms.length; i++) {
+            const inputElements = staleForms[i].querySelectorAll(
+                'input, select, textarea'
+            );
+            for (let j = 0; j < inputElements.length; j++) {
+                previousNames.add(inputElements[j].name);
+            }
+        }
+
+        flushPendingChanges();
+
+        // Replace the entries of stale forms and the management form
+        const formData = event.formData;
+        previousNames.forEach(function(name) { formData.delete(name); });
+        for (let i = 0; i < staleForms.length; i++) {
+            appendFormEntries(formData, staleForms[i]);
+        }
+        const totalFormsInput = managementFormElements.totalFormsInput;
+        formData.set(totalFormsInput.name, totalFormsInput.value);
+    }
+
+    function virtualizedFormsSubmitted() {
+        /*
+         * Event handler for submits of the form enclosing `formsContainer`,
+         * filling the placeholders of virtualized forms with their values
+         * before the form data is constructed.
+         */
+        serializeVirtualizedForms();
+    }
+
+    function virtualizedFormDataConstructed(event) {
+        /*
+         * Event handler for the construction of form data of the form
+         * enclosing `formsContainer`. Since the form data has been constructed
+         * from the DOM at this point, the entries of virtualized forms are
+         * replaced after filling their placeholders with their values.
+         */
+        syncPendingChanges();
+        const previousNames = serializeVirtualizedForms();
+
+        const placeholders = formsState.forms.filter(
+            function(form) { return formsState.records.get(form).detachedForm !== null; }
+        );
+        for (let i = 0; i < placeholders.length; i++) {
+            const inputElements = placeholders[i].querySelectorAll('input');
+            for (let j = 0; j < inputElements.length; j++) {
+                previousNames.add(inputElements[j].name);
+            }
+        }
+
+        const formData = event.formData;
+        previousNames.forEach(function(name) { formData.delete(name); });
+        for (let i = 0; i < placeholders.length; i++) {
+            appendFormEntries(formData, placeholders[i]);
+        }
+    }
+
+    function jsonFormDataConstructed(event) {
+        /*
+         * Event handler for the construction of form data of the form
+         * enclosing `formsContainer`, if `submitAsJson` is set. Replaces the
+         * entries of all forms by a single JSON entry, holding the field names
+         * without prefix and the values of each form in the same order, with
+         * forms listed by index. Files are submitted as usual.
+         */
+        const formData = event.formData;
+        const formPrefix = `${formsetOptions.formsetPrefix}-`;
+        const fieldPositions = new Map();
+        const forms = [];
+        const names = new Set();
+
+        for (const [name, value] of formData.entries()) {
+            if (!name.startsWith(formPrefix) || typeof value !== 'string') {
+                continue;
+            }
+            const match = /^(\d+)-(.+)$/.exec(name.slice(formPrefix.length));
+            if (match === null) {
+                continue;
+            }
+            const index = parseInt(match[1], 10);
+            const fieldName = match[2];
+            if (!fieldPositions.has(fieldName)) {
+                fieldPositions.set(fieldName, fieldPositions.size);
+            }
+            const position = fieldPositions.get(fieldName);
+
+            while (forms.length <= index) {
+                forms.push(null);
+            }
+            if (forms[index] === null) {
+                forms[index] = [];
+            }
+            const values = forms[index];
+            while (values.length <= position) {
+                values.push(null);
+            }
+            if (values[position] === null) {
+                values[position] = value;
+            }
+            else {
+                values[position] = [].concat(values[position], value);
+            }
+            names.add(name);
+        }
+
+        names.forEach(function(name) { formData.delete(name); });
+        formData.set(
+            `${formsetOptions.formsetPrefix}-JSON_DATA`,
+            JSON.stringify({
+                'fields': Array.from(fieldPositions.keys()),
+                'forms': forms,
+            })
+        );
+    }
+
+    function loadFormsButtonClicked() {
+        /*
+         * Event handler for clicks on the `loadFormsButton`, also invoked when
+         * the button is scrolled into view if `loadFormsOnScroll` is set.
+         * Fetches the next window of initial forms from `loadFormsUrl` and
+         * inserts them into the formset.
+         *
+         * Hides the `loadFormsButton` when the server responds without the
+         * offset of a next window.
+         */
+        if (loadFormsState.loading || loadFormsState.nextOffset === null) {
+            return;
+        }
+        loadFormsState.loading = true;
+
+        const url = new URL(formsetOptions.loadFormsUrl, window.location.href);
+        url.searchParams.set('offset', loadFormsState.nextOffset);
+
+        fetch(url, {'headers': {'X-Requested-With': 'XMLHttpRequest'}})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(
+                        `Unable to load forms, status code: ${response.status}`
+                    );
                 }
-                if (inputElement.name) {
-                    let attrValue = inputElement.name;
-                    attrValue = attrValue.replace(idRegex, idReplacement);
-                    inputElement.name = attrValue;
+
+                const nextOffset = response.headers.get(
+                    'Convenient-Formset-Next-Offset'
+                );
+                return response.text().then(function(html) {
+                    insertLoadedForms(html);
+                    updateNextOffset(nextOffset);
+                });
+            })
+            .catch(function(error) {
+                console.error(`[ConvenientFormset] ${error.message}`);
+            })
+            .finally(function() {
+                loadFormsState.loading = false;
+
+                // Observe the button again, which triggers loading the next
+                // window if it is still in view
+                if (loadFormsState.observer !== null) {
+                    const loadFormsButton = formsetElements.loadFormsButton;
+                    loadFormsState.observer.unobserve(loadFormsButton);
+                    loadFormsState.observer.observe(loadFormsButton);
                 }
-            }
-        }
+            });
     }
 
-    function updateManagementForm() {
+    function updateNextOffset(nextOffset) {
         /*
-         * Updates the `TOTAL_FORMS` input in the management form to the number
-         * of forms in the formset, regardless of whether it has been marked
-         * for deletion. Invoked after forms have been added or deleted.
+         * Stores the offset of the next window of initial forms to load, or
+         * hides the `loadFormsButton` if there is no next window.
          */
-        const allForms = formsetElements.formsContainer.querySelectorAll(
-            formsetOptions.formSelector
-        );
-        managementFormElements.totalFormsInput.value = allForms.length;
+        if (nextOffset) {
+            loadFormsState.nextOffset = parseInt(nextOffset, 10);
+        }
+        else {
+            loadFormsState.nextOffset = null;
+            formsetElements.loadFormsButton.hidden = true;
+            if (loadFormsState.observer !== null) {
+                loadFormsState.observer.disconnect();
+                loadFormsState.observer = null;
+            }
+        }
     }
 
-
-    /* Event handlers */
-    function addFormButtonClicked() {
+    function insertLoadedForms(html) {
         /*
-         * Event handler for clicks on the `addFormButton`. If the total
-         * number of visible forms is less than the maximum number of forms
-         * allowed, `emptyForm` is cloned and added to `formsContainer`.
-         *
-         * In case the `hideAddFormButtonOnMaxForms` option is set to `true`,
-         * it updates the visibility of the `addFormButton`.
+         * Inserts the initial forms rendered in `html` after the initial forms
+         * already in the formset and before any new forms. The indexes of new
+         * forms are shifted accordingly, so that initial forms keep preceding
+         * new forms as expected by the server side.
          */
-        const visibleForms = formsetElements.formsContainer.querySelectorAll(
-            `${formsetOptions.formSelector}:not([hidden])`
+        const template = document.createElement('template');
+        template.innerHTML = html;
+        const loadedForms = Array.from(
+            template.content.querySelectorAll(formsetOptions.formSelector)
         );
-        const maxNumForms = parseInt(
-            managementFormElements.maxNumFormsInput.value, 10
-        );
-        if (visibleForms.length >= maxNumForms) {
+        if (!loadedForms.length) {
             return;
         }
 
-        // Clone empty form
-        const newForm = formsetElements.emptyForm.cloneNode(true);
-
-        // Add an event listener for clicks on the `deleteFormButton` if forms
-        // can be deleted
-        if (formsetOptions.canDeleteForms) {
-            const deleteFormButton = newForm.querySelector(
-                formsetOptions.deleteFormButtonSelector
-            );
-            deleteFormButton.addEventListener(
-                'click', deleteFormButtonClicked.bind(this, newForm)
-            );
-        }
-
-        // Add event listeners for clicks on the `moveFormDownButton` and
-        // `moveFormUpButton` if forms can be ordered, and set the initial
-        // value of the ORDER input element
-        if (formsetOptions.canOrderForms) {
-            const moveFormDownButton = newForm.querySelector(
-                    formsetOptions.moveFormDownButtonSelector);
-            moveFormDownButton.addEventListener(
-                'click', moveFormDownButtonClicked.bind(this, newForm)
-            );
+        syncPendingChanges();
 
-            const moveFormUpButton = newForm.querySelector(
-                    formsetOptions.moveFormUpButtonSelector);
-            moveFormUpButton.addEventListener(
-                'click', moveFormUpButtonClicked.bind(this, newForm)
-            );
+        const initialFormCount = parseInt(
+            managementFormElements.initialFormsInput.value, 10
+        );
+        const forms = formsState.forms;
 
-            const selector = 'input[name$="ORDER"]';
-            let newFormOrderValue;
-            if (visibleForms.length) {
-                const lastForm = visibleForms[visibleForms.length - 1];
-                const lastFormOrderValue = parseInt(
-                    lastForm.querySelector(selector).value, 10
-                );
-                newFormOrderValue = lastFormOrderValue + 1;
+        // Shift the indexes of new forms and find the last initial form
+        let lastInitialFormPosition = -1;
+        for (let i = 0; i < forms.length; i++) {
+            const form = forms[i];
+            const formIndex = formsState.records.get(form).index;
+            if (formIndex >= initialFormCount) {
+                setFormIndex(form, formIndex + loadedForms.length);
             }
             else {
-                newFormOrderValue = 1;
+                lastInitialFormPosition = i;
             }
-            const newFormOrderElement = newForm.querySelector(selector);
-            newFormOrderElement.value = newFormOrderValue;
         }
 
-        // Append form to forms container
-        formsetElements.formsContainer.appendChild(newForm);
-
-        // Update visibility of the `addFormButton` if forms can be added
-        if (formsetOptions.canAddForms && formsetOptions.hideAddFormButtonOnMaxForms) {
-            updateAddFormButtonVisibility();
+        // Insert the loaded forms after the last initial form, or before all
+        // other forms if there are no initial forms
+        let referenceNode;
+        if (lastInitialFormPosition !== -1) {
+            referenceNode = forms[lastInitialFormPosition].nextSibling;
         }
-
-        // Update the form indexes and the management form
-        updateFormIndexes();
-        updateManagementForm();
-
-        // Dispatch event
-        formsetElements.formsContainer.dispatchEvent(
-            new CustomEvent('convenient_formset:added', {
-                bubbles: true,
-                detail: {
-                    formsetPrefix: formsetOptions.formsetPrefix,
-                },
-            })
-        );
-    }
-
-    function deleteFormButtonClicked(form) {
-        /*
-         * Event handler for clicks on the `deleteFormButton`. Expects `form`
-         * as a bound argument. If a DELETE input element is present in the
-         * form, it's set to 'on' and the form is hidden. Otherwise the form is
-         * removed from the DOM altogether.
-         *
-         * In case the `hideAddFormButtonOnMaxForms` option is set to `true`,
-         * it updates the visibility of the `addFormButton`.
-         */
-        const deleteElement = form.querySelector('input[name$="DELETE"]');
-        if (deleteElement !== null) {
-            deleteElement.value = 'on';
-            form.hidden = true;
+        else if (forms.length) {
+            referenceNode = forms[0];
         }
         else {
-            formsetElements.formsContainer.removeChild(form);
+            referenceNode = null;
+        }
+        for (let i = 0; i < loadedForms.length; i++) {
+            const form = loadedForms[i];
+            formsState.records.set(form, createFormRecord(form));
+            setFormIndex(form, initialFormCount + i);
+            formsetElements.formsContainer.insertBefore(form, referenceNode);
+            if (!form.hidden) {
+                formsState.visibleFormCount++;
+            }
         }
+        forms.splice(lastInitialFormPosition + 1, 0, ...loadedForms);
+
+        // Number the ORDER input elements of visible forms after their
+        // position, so that forms added before keep following the loaded forms
+        if (formsetOptions.canOrderForms) {
+            let orderValue = 1;
+            for (let i = 0; i < forms.length; i++) {
+                if (!forms[i].hidden) {
+                    formsState.records.get(forms[i]).orderElement.value = orderValue;
+                    orderValue++;
+                }
+            }
+        }
+
+        // Update the number of initial forms and the management form
+        managementFormElements.initialFormsInput.value = (
+            initialFormCount + loadedForms.length
+        );
+        updateManagementForm();
+        ignoreOwnChanges();
 
         // Update visibility of the `addFormButton` if forms can be added
         if (formsetOptions.canAddForms && formsetOptions.hideAddFormButtonOnMaxForms) {
             updateAddFormButtonVisibility();
         }
 
-        // Update the form indexes and the management form
-        updateFormIndexes();
-        updateManagementForm();
-
         // Dispatch event
-        document.dispatchEvent(
-            new CustomEvent('convenient_formset:removed', {
+        formsetElements.formsContainer.dispatchEvent(
+            new CustomEvent('convenient_formset:loaded', {
+                bubbles: true,
                 detail: {
                     formsetPrefix: formsetOptions.formsetPrefix,
                 },
@@ -309,81 +1461,6 @@ const ConvenientFormset = function(options) {
         );
     }
 
-    function moveFormDownButtonClicked(form) {
-        /*
-         * Event handler for clicks on the `moveFormDownButton`. Expects `form`
-         * as a bound argument. Swaps both forms in the DOM and their ordering
-         * values.
-         */
-        let visibleForms = formsetElements.formsContainer.querySelectorAll(
-            `${formsetOptions.formSelector}:not([hidden])`
-        );
-        visibleForms = Array.from(visibleForms);
-        const formIndex = visibleForms.indexOf(form);
-
-        if (formIndex < visibleForms.length - 1) {
-            // Move form after next form
-            const nextForm = visibleForms[formIndex + 1];
-            formsetElements.formsContainer.insertBefore(nextForm, form);
-
-            // Select ORDER input elements for both forms and swap their values
-            const selector = 'input[name$="ORDER"]';
-            const formOrderElement = form.querySelector(selector);
-            const nextFormOrderElement = nextForm.querySelector(selector);
-            const formOrderValue = formOrderElement.value;
-            const nextFormOrderValue = nextFormOrderElement.value;
-            formOrderElement.value = nextFormOrderValue;
-            nextFormOrderElement.value = formOrderValue;
-
-            // Dispatch event
-            form.dispatchEvent(
-                new CustomEvent('convenient_formset:movedDown', {
-                    bubbles: true,
-                    detail: {
-                        formsetPrefix: formsetOptions.formsetPrefix,
-                    },
-                })
-            );
-        }
-    }
-
-    function moveFormUpButtonClicked(form) {
-        /*
-         * Event handler for clicks on the `moveFormUpButton`. Expects `form`
-         * as a bound argument. Swaps both forms in the DOM and their ordering
-         * values.
-         */
-        let visibleForms = formsetElements.formsContainer.querySelectorAll(
-            `${formsetOptions.formSelector}:not([hidden])`
-        );
-        visibleForms = Array.from(visibleForms);
-        const formIndex = visibleForms.indexOf(form);
-
-        if (formIndex > 0) {
-            // Move form before previous form
-            const previousForm = visibleForms[formIndex - 1];
-            formsetElements.formsContainer.insertBefore(form, previousForm);
-
-            // Select ORDER input elements for both forms and swap their values
-            const selector = 'input[name$="ORDER"]';
-            const formOrderElement = form.querySelector(selector);
-            const previousFormOrderElement = previousForm.querySelector(selector);
-            const formOrderValue = formOrderElement.value;
-            const previousFormOrderValue = previousFormOrderElement.value;
-            formOrderElement.value = previousFormOrderValue;
-            previousFormOrderElement.value = formOrderValue;
-
-            // Dispatch event
-            form.dispatchEvent(
-                new CustomEvent('convenient_formset:movedUp', {
-                    bubbles: true,
-                    detail: {
-                        formsetPrefix: formsetOptions.formsetPrefix,
-                    },
-                })
-            );
-        }
-    }
 
     /* Initialization functions */
     function initializeFormsetOptions(customOptions) {
@@ -406,13 +1483,16 @@ const ConvenientFormset = function(options) {
             }
 
             // Store missing required options in `missingOptions`
-            const requiredIf = availableOptions[optionKey].requiredIf;
-            const optionRequired = (
-                (requiredIf === 'always') ||
-                (requiredIf === 'canAddForms' && formsetOptions.canAddForms) ||
-                (requiredIf === 'canDeleteForms' && formsetOptions.canDeleteForms) ||
-                (requiredIf === 'canOrderForms' && formsetOptions.canOrderForms)
-            );
+            const requiredIf = [].concat(availableOptions[optionKey].requiredIf);
+            const optionRequired = requiredIf.some(function(condition) {
+                return (
+                    (condition === 'always') ||
+                    (condition === 'canAddForms' && formsetOptions.canAddForms) ||
+                    (condition === 'canDeleteForms' && formsetOptions.canDeleteForms) ||
+                    (condition === 'canOrderForms' && formsetOptions.canOrderForms) ||
+                    (condition === 'canLoadForms' && formsetOptions.canLoadForms)
+                );
+            });
             if (optionRequired && typeof optionValue === 'undefined') {
                 missingOptions.push(optionKey);
                 continue;
@@ -577,7 +1657,9 @@ const ConvenientFormset = function(options) {
                     );
                 }
             }
+        }
 
+        if (formsetOptions.canAddForms) {
             selector = formsetOptions.addFormButtonSelector;
             formsetElements.addFormButton = document.querySelector(selector);
             if (formsetElements.addFormButton === null) {
@@ -585,6 +1667,14 @@ const ConvenientFormset = function(options) {
             }
         }
 
+        if (formsetOptions.canLoadForms) {
+            selector = formsetOptions.loadFormsButtonSelector;
+            formsetElements.loadFormsButton = document.querySelector(selector);
+            if (formsetElements.loadFormsButton === null) {
+                missingElements.push(selector);
+            }
+        }
+
         // Throw error if DOM elements are missing
         if (missingElements.length) {
             const formattedMissingElements = missingElements.map(
@@ -598,7 +1688,10 @@ const ConvenientFormset = function(options) {
         }
 
         // Throw error if the empty form template is malformed
-        else if (formsetOptions.canAddForms && emptyFormChildElementCount !== 1) {
+        else if (
+            formsetOptions.canAddForms &&
+            emptyFormChildElementCount !== 1
+        ) {
             const message = (
                 'Expected 1 element inside ' +
                 `"${formsetOptions.emptyFormTemplateSelector}", ` +
@@ -654,27 +1747,61 @@ const ConvenientFormset = function(options) {
         }
     }
 
-    function hideFormsMarkedForDeletion() {
+    function initializeFormsVirtualization() {
         /*
-         * Hides existing forms that have been marked as deleted.
+         * Initializes `virtualFormsState.observer`, observing the forms in
+         * `formsContainer` for virtualization when moving away from the
+         * viewport by more than the `virtualizeFormsMargin`.
          */
-        const forms = formsetElements.formsContainer.querySelectorAll(
-            formsetOptions.formSelector
+        virtualFormsState.observer = new IntersectionObserver(
+            formsVisibilityChanged,
+            {'rootMargin': formsetOptions.virtualizeFormsMargin}
         );
+    }
+
+    function initializeFormsObserver() {
+        /*
+         * Initializes `formsState.observer`, observing changes to the forms
+         * made outside of this formset.
+         */
+        formsState.observer = new MutationObserver(formsMutated);
+        formsState.observer.observe(formsetElements.formsContainer, {
+            'attributeFilter': ['hidden'],
+            'childList': true,
+            'subtree': true,
+        });
+    }
+
+    function hideFormsMarkedForDeletion() {
+        /*
+         * Hides existing forms that have been marked as deleted, omitting
+         * their fields if `omitDeletedFormFields` is set.
+         */
+        const forms = formsState.forms;
         for (let i = 0; i < forms.length; i++) {
             const form = forms[i];
-            const deleteElement = form.querySelector('input[name$="DELETE"]');
-            if (deleteElement !== null && deleteElement.value === 'on') {
+            const deleteElement = formsState.records.get(form).deleteElement;
+            if (deleteElement !== null && deleteElement.value === 'on' && !form.hidden) {
                 form.hidden = true;
+                formsState.visibleFormCount--;
+                if (formsetOptions.omitDeletedFormFields) {
+                    omitFormFields(form);
+                }
             }
         }
     }
 
     function initializeEventListeners() {
         /*
-         * Initializes click event listeners for the `addFormButton` and for
+         * Initializes click event listeners for the `addFormButton`, the
+         * `loadFormsButton` and for the `formsContainer`, handling clicks on
          * the `deleteFormButton`, `moveFormDownButton` and `moveFormUpButton`
-         * of visible forms.
+         * of all forms. If forms can be dragged, it initializes drag and drop
+         * event listeners for the `formsContainer`. If reindexing is deferred
+         * or forms are virtualized, it also initializes submit and formdata
+         * event listeners for the form enclosing the `formsContainer`, and a
+         * formdata event listener submitting the forms as JSON after these if
+         * `submitAsJson` is set.
          */
         if (formsetOptions.canAddForms) {
             formsetElements.addFormButton.addEventListener(
@@ -682,50 +1809,75 @@ const ConvenientFormset = function(options) {
             );
         }
 
-        const forms = formsetElements.formsContainer.querySelectorAll(
-            `${formsetOptions.formSelector}:not([hidden])`
-        );
-        for (let i = 0; i < forms.length; i++) {
-            const form = forms[i];
+        if (formsetOptions.canLoadForms) {
+            formsetElements.loadFormsButton.addEventListener(
+                'click', loadFormsButtonClicked
+            );
 
-            if (formsetOptions.canDeleteForms) {
-                const deleteFormButton = form.querySelector(
-                        formsetOptions.deleteFormButtonSelector);
-                deleteFormButton.addEventListener(
-                    'click', deleteFormButtonClicked.bind(this, form)
+            if (formsetOptions.loadFormsOnScroll && 'IntersectionObserver' in window) {
+                loadFormsState.observer = new IntersectionObserver(
+                    function(entries) {
+                        const isIntersecting = entries.some(
+                            function(entry) { return entry.isIntersecting; }
+                        );
+                        if (isIntersecting) {
+                            loadFormsButtonClicked();
+                        }
+                    }
                 );
+                loadFormsState.observer.observe(formsetElements.loadFormsButton);
             }
+        }
 
-            if (formsetOptions.canOrderForms) {
-                const moveFormDownButton = form.querySelector(
-                        formsetOptions.moveFormDownButtonSelector);
-                moveFormDownButton.addEventListener(
-                    'click', moveFormDownButtonClicked.bind(this, form)
-                );
+        if (formsetOptions.canDeleteForms || formsetOptions.canOrderForms) {
+            formsetElements.formsContainer.addEventListener(
+                'click', formsContainerClicked
+            );
+        }
 
-                const moveFormUpButton = form.querySelector(
-                        formsetOptions.moveFormUpButtonSelector);
-                moveFormUpButton.addEventListener(
-                    'click', moveFormUpButtonClicked.bind(this, form)
-                );
-            }
+        if (formsetOptions.canOrderForms && formsetOptions.canDragForms) {
+            const formsContainer = formsetElements.formsContainer;
+            formsContainer.addEventListener('dragstart', formsContainerDragStarted);
+            formsContainer.addEventListener('dragover', formsContainerDraggedOver);
+            formsContainer.addEventListener('drop', formsContainerDropped);
+            formsContainer.addEventListener('dragend', formsContainerDragEnded);
         }
-    }
 
-    // Initialize convenient formset
-    (function(customOptions) {
-        try {
-            initializeFormsetOptions(customOptions);
+        const enclosingForm = formsetElements.formsContainer.closest('form');
+        if (formsetOptions.deferReindexing && enclosingForm !== null) {
+            enclosingForm.addEventListener('submit', enclosingFormSubmitted);
+            enclosingForm.addEventListener('formdata', enclosingFormDataConstructed);
         }
-        catch (error) {
-            throw Error(`[ConvenientFormset] ${error.message}`);
+
+        if (virtualFormsState.observer !== null && enclosingForm !== null) {
+            enclosingForm.addEventListener('submit', virtualizedFormsSubmitted);
+            enclosingForm.addEventListener(
+                'formdata', virtualizedFormDataConstructed
+            );
         }
 
-        try {
-            selectFormsetElements();
+        if (formsetOptions.submitAsJson && enclosingForm !== null) {
+            enclosingForm.addEventListener('formdata', jsonFormDataConstructed);
         }
-        catch (error) {
-            throw Error(`[ConvenientFormset] ${error.message}`);
+    }
+
+    function initializeFormset() {
+        /*
+         * Completes the initialization of the formset, once the formset
+         * options have been initialized and the formset elements selected.
+         * Invoked at once, or when first needed if initializing lazily.
+         */
+        if (lazyInitializationState.initialized) {
+            return;
+        }
+        lazyInitializationState.initialized = true;
+
+        if (formsetOptions.initializeLazily) {
+            document.removeEventListener('click', lazyInitializationTriggered, true);
+            document.removeEventListener('focusin', lazyInitializationTriggered, true);
+            if (lazyInitializationState.observer !== null) {
+                lazyInitializationState.observer.disconnect();
+            }
         }
 
         try {
@@ -751,6 +1903,12 @@ const ConvenientFormset = function(options) {
             throw Error(`[ConvenientFormset] ${error.message}`);
         }
 
+        if (formsetOptions.virtualizeForms && 'IntersectionObserver' in window) {
+            initializeFormsVirtualization();
+        }
+
+        syncFormsState();
+
         if (formsetOptions.canDeleteForms) {
             hideFormsMarkedForDeletion();
         }
@@ -759,6 +1917,148 @@ const ConvenientFormset = function(options) {
             updateAddFormButtonVisibility();
         }
 
+        if (formsetOptions.canLoadForms && !formsetElements.loadFormsButton.hidden) {
+            loadFormsState.nextOffset = parseInt(
+                managementFormElements.initialFormsInput.value, 10
+            );
+        }
+
         initializeEventListeners();
+        initializeFormsObserver();
+    }
+
+    function lazyInitializationTriggered(event) {
+        /*
+         * Event handler for clicks and focus within the document, initializing
+         * the formset when the `formsContainer`, `addFormButton` or
+         * `loadFormsButton` is targeted. Listens in the capturing phase, so
+         * that the event listeners of the formset receive the same event.
+         */
+        const elements = [
+            formsetElements.formsContainer,
+            formsetElements.addFormButton,
+            formsetElements.loadFormsButton,
+        ];
+        const targeted = elements.some(function(element) {
+            return typeof element !== 'undefined' && element.contains(event.target);
+        });
+        if (targeted) {
+            initializeFormset();
+        }
+    }
+
+    function initializeLazily() {
+        /*
+         * Defers initializing the formset until the `formsContainer` becomes
+         * visible, or until the formset is first clicked or focused.
+         */
+        document.addEventListener('click', lazyInitializationTriggered, true);
+        document.addEventListener('focusin', lazyInitializationTriggered, true);
+
+        if ('IntersectionObserver' in window) {
+            lazyInitializationState.observer = new IntersectionObserver(
+                function(entries) {
+                    const isIntersecting = entries.some(
+                        function(entry) { return entry.isIntersecting; }
+                    );
+                    if (isIntersecting) {
+                        initializeFormset();
+                    }
+                }
+            );
+            lazyInitializationState.observer.observe(
+                formsetElements.formsContainer
+            );
+        }
+    }
+
+
+    /* Public API */
+    this.addForms = function(count, values) {
+        /*
+         * Adds `count` forms to the formset at once, optionally pre-filled
+         * from `values`, an array with an object of field values for each
+         * form. Returns the forms that were added, as limited by the maximum
+         * number of forms allowed.
+         */
+        if (!formsetOptions.canAddForms) {
+            throw Error('[ConvenientFormset] Forms cannot be added to this formset.');
+        }
+        initializeFormset();
+        return addForms(count, values);
+    };
+
+    this.moveFormTo = function(form, position) {
+        /*
+         * Moves the visible `form` to the given `position` among the visible
+         * forms, updating the values of the ORDER input elements of the forms
+         * in between.
+         */
+        if (!formsetOptions.canOrderForms) {
+            throw Error('[ConvenientFormset] Forms cannot be ordered in this formset.');
+        }
+        initializeFormset();
+        moveFormTo(form, position);
+    };
+
+    this.initialize = function() {
+        /*
+         * Initializes the formset right away, if initializing lazily.
+         */
+        initializeFormset();
+    };
+
+    this.flush = function() {
+        /*
+         * Updates the forms of which the index has changed and the management
+         * form, if reindexing is deferred.
+         */
+        initializeFormset();
+        flushPendingChanges();
+    };
+
+    // Initialize convenient formset
+    (function(customOptions) {
+        try {
+            initializeFormsetOptions(customOptions);
+        }
+        catch (error) {
+            throw Error(`[ConvenientFormset] ${error.message}`);
+        }
+
+        try {
+            selectFormsetElements();
+        }
+        catch (error) {
+            throw Error(`[ConvenientFormset] ${error.message}`);
+        }
+
+        if (formsetOptions.initializeLazily) {
+            initializeLazily();
+        }
+        else {
+            initializeFormset();
+        }
     })(options || {});
 };
+
+ConvenientFormset.initAll = function() {
+    /*
+     * Initializes a convenient formset for each JSON script element with
+     * options rendered by a formset, returning the initialized formsets. JSON
+     * script elements of formsets that were already initialized are skipped.
+     */
+    const optionsElements = document.querySelectorAll(
+        'script[type="application/json"][id$="-convenient-formset-options"]'
+    );
+    const formsets = [];
+    for (const optionsElement of optionsElements) {
+        if (optionsElement.hasAttribute('data-convenient-formset-initialized')) {
+            continue;
+        }
+        const options = JSON.parse(optionsElement.textContent);
+        formsets.push(new ConvenientFormset(options));
+        optionsElement.setAttribute('data-convenient-formset-initialized', '');
+    }
+    return formsets;
+};
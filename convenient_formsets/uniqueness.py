@@ -0,0 +1,181 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django import forms  # type: ignore[import-untyped]
+from django.core.exceptions import (  # type: ignore[import-untyped]
+    NON_FIELD_ERRORS,
+    ValidationError,
+)
+from django.db import connections, router  # type: ignore[import-untyped]
+from django.db.models import Q  # type: ignore[import-untyped]
+
+UniqueCheck = Tuple[Any, Tuple[str, ...]]
+
+
+class UniqueCandidate:
+    """
+    Holds the values of a form's instance for the fields of a unique check,
+    along with the primary key to exclude when editing an existing instance.
+    """
+
+    def __init__(self, form: forms.Form, values: Tuple[Any, ...], pk: Any) -> None:
+        self.form = form
+        self.values = values
+        self.pk = pk
+
+
+def get_unique_candidate(
+    form: forms.Form, model_class: Any, unique_check: Tuple[str, ...]
+) -> Optional[UniqueCandidate]:
+    """
+    Returns the values of the instance of `form` to look up for
+    `unique_check`, or `None` if the check should be skipped, following
+    `Model._perform_unique_checks()`.
+    """
+    instance = form.instance
+    using = router.db_for_read(model_class, instance=instance)
+    features = connections[using].features
+
+    values = []
+    for field_name in unique_check:
+        field = instance._meta.get_field(field_name)  # pylint: disable=protected-access
+        value = getattr(instance, field.attname)
+        if value is None or (
+            value == "" and features.interprets_empty_strings_as_nulls
+        ):
+            return None
+        # pylint: disable-next=protected-access
+        if field.primary_key and not instance._state.adding:
+            return None
+        values.append(value)
+
+    pk = None
+    if not instance._state.adding:  # pylint: disable=protected-access
+        pk = instance._get_pk_val(model_class._meta)  # pylint: disable=protected-access
+    return UniqueCandidate(form, tuple(values), pk)
+
+
+def get_taken_values(
+    model_class: Any, unique_check: Tuple[str, ...], candidates: List[UniqueCandidate]
+) -> Dict[Tuple[Any, ...], Set[Any]]:
+    """
+    Returns the primary keys of the objects matching the values of any of the
+    candidates using a single query, keyed by their values.
+    """
+    # pylint: disable-next=protected-access
+    attnames = [model_class._meta.get_field(name).attname for name in unique_check]
+    lookup = Q()
+    for candidate in candidates:
+        lookup |= Q(**dict(zip(unique_check, candidate.values)))
+    # pylint: disable-next=protected-access
+    rows = model_class._default_manager.filter(lookup).values_list(*attnames, "pk")
+
+    taken_values: Dict[Tuple[Any, ...], Set[Any]] = {}
+    for *values, pk in rows:
+        taken_values.setdefault(tuple(values), set()).add(pk)
+    return taken_values
+
+
+def is_value_taken(
+    model_class: Any, unique_check: Tuple[str, ...], candidate: UniqueCandidate
+) -> bool:
+    """
+    Returns whether the values of the candidate are taken by another object,
+    like `Model._perform_unique_checks()`.
+    """
+    queryset = model_class._default_manager.filter(  # pylint: disable=protected-access
+        **dict(zip(unique_check, candidate.values))
+    )
+    if candidate.pk is not None:
+        queryset = queryset.exclude(pk=candidate.pk)
+    return bool(queryset.exists())
+
+
+def find_conflicting_candidates(
+    model_class: Any,
+    unique_check: Tuple[str, ...],
+    candidates: List[UniqueCandidate],
+    batch_size: int,
+) -> List[UniqueCandidate]:
+    """
+    Returns the candidates of which the values are already taken by other
+    objects, looking up the values of `batch_size` candidates per query.
+    """
+    conflicting_candidates: List[UniqueCandidate] = []
+    for batch_start in range(0, len(candidates), batch_size):
+        batch_end = batch_start + batch_size
+        batch = candidates[batch_start:batch_end]
+        taken_values = get_taken_values(model_class, unique_check, batch)
+
+        # The database may match values differing from the submitted values,
+        # for example due to case-insensitive collations. In that case, look
+        # up the values of each candidate as usual.
+        submitted_values = {candidate.values for candidate in batch}
+        if set(taken_values) - submitted_values:
+            conflicting_candidates.extend(
+                candidate
+                for candidate in batch
+                if is_value_taken(model_class, unique_check, candidate)
+            )
+        else:
+            conflicting_candidates.extend(
+                candidate
+                for candidate in batch
+                if taken_values.get(candidate.values, set()) - {candidate.pk}
+            )
+    return conflicting_candidates
+
+
+def get_unique_check_errors(
+    forms_with_exclusions: List[Tuple[forms.Form, Set[str]]], batch_size: int
+) -> Dict[forms.Form, Dict[str, List[ValidationError]]]:
+    """
+    Returns the errors of the unique checks of the given model forms, keyed
+    by form. Each unique check is performed for all forms at once. Like
+    `Model.validate_unique()`, these exclude `Meta.constraints`, which are
+    validated for each form by `Model.validate_constraints()`.
+    """
+    candidates_by_check: Dict[UniqueCheck, List[UniqueCandidate]] = {}
+    for form, exclude in forms_with_exclusions:
+        # pylint: disable-next=protected-access
+        unique_checks, _ = form.instance._get_unique_checks(exclude=exclude)
+        for model_class, unique_check in unique_checks:
+            candidate = get_unique_candidate(form, model_class, unique_check)
+            if candidate is not None:
+                candidates_by_check.setdefault((model_class, unique_check), []).append(
+                    candidate
+                )
+
+    errors_by_form: Dict[forms.Form, Dict[str, List[ValidationError]]] = {}
+    for (model_class, unique_check), candidates in candidates_by_check.items():
+        key = unique_check[0] if len(unique_check) == 1 else NON_FIELD_ERRORS
+        for candidate in find_conflicting_candidates(
+            model_class, unique_check, candidates, batch_size
+        ):
+            errors = errors_by_form.setdefault(candidate.form, {})
+            errors.setdefault(key, []).append(
+                candidate.form.instance.unique_error_message(model_class, unique_check)
+            )
+    return errors_by_form
+
+
+def validate_unique_in_bulk(
+    forms_with_exclusions: List[Tuple[forms.Form, Set[str]]], batch_size: int
+) -> None:
+    """
+    Validates the uniqueness of the instances of the given model forms, like
+    `BaseModelForm.validate_unique()` given the excluded field names, adding
+    errors to the forms whose values are already taken. Checks for unique
+    dates are performed for each form as usual.
+    """
+    errors_by_form = get_unique_check_errors(forms_with_exclusions, batch_size)
+    for form, exclude in forms_with_exclusions:
+        errors = errors_by_form.get(form, {})
+        # pylint: disable-next=protected-access
+        _, date_checks = form.instance._get_unique_checks(exclude=exclude)
+        # pylint: disable-next=protected-access
+        date_errors = form.instance._perform_date_checks(date_checks)
+        for key, messages in date_errors.items():
+            errors.setdefault(key, []).extend(messages)
+        if errors:
+            # pylint: disable-next=protected-access
+            form._update_errors(ValidationError(errors))
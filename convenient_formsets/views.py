@@ -0,0 +1,62 @@
+from typing import Any, Dict, Optional
+
+from django.core.exceptions import (  # type: ignore[import-untyped]
+    ImproperlyConfigured,
+)
+from django.http import (  # type: ignore[import-untyped]
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.views.generic.base import View  # type: ignore[import-untyped]
+
+NEXT_WINDOW_OFFSET_HEADER = "Convenient-Formset-Next-Offset"
+
+
+class FormsetWindowView(View):
+    """
+    Renders a window of initial forms of a windowed model formset, starting at
+    the `offset` query parameter, as loaded by the `ConvenientFormset`
+    JavaScript. The offset of the next window is passed in a response header.
+    """
+
+    formset_class: Any = None
+    form_template_name: Optional[str] = None
+    prefix: Optional[str] = None
+
+    def get_formset_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments for instantiating the formset, such as
+        the `instance` of an inline formset.
+        """
+        return {"prefix": self.prefix}
+
+    def get_formset(self, window_offset: int) -> Any:
+        """
+        Returns the unbound formset for the window starting at
+        `window_offset`.
+        """
+        if self.formset_class is None:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} is missing the formset_class attribute."
+            )
+        return self.formset_class(  # pylint: disable=not-callable
+            window_offset=window_offset, **self.get_formset_kwargs()
+        )
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        # pylint: disable=unused-argument
+        try:
+            window_offset = int(request.GET.get("offset", 0))
+        except ValueError:
+            window_offset = -1
+        if window_offset < 0:
+            return HttpResponseBadRequest()
+
+        formset = self.get_formset(window_offset)
+        next_window_offset = formset.get_next_window_offset()
+        response = StreamingHttpResponse(formset.render_window(self.form_template_name))
+        if next_window_offset is not None:
+            response[NEXT_WINDOW_OFFSET_HEADER] = str(next_window_offset)
+        return response
@@ -0,0 +1,345 @@
+"""
+Benchmarks the construction, validation, rendering and saving of formsets with
+increasing numbers of forms, using the settings of the Django test project.
+
+Save a baseline:
+    python3 -m py_tests.benchmarks.run_benchmarks --save baseline.json
+
+Compare against a baseline, failing on regressions:
+    python3 -m py_tests.benchmarks.run_benchmarks --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "py_tests.django_test_project.settings")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django import forms  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from convenient_formsets import (  # noqa: E402
+    ConvenientBaseFormSet,
+    ConvenientBaseInlineFormSet,
+    ConvenientBaseModelFormSet,
+)
+from py_tests.django_test_project.models import Author, Book  # noqa: E402
+
+SIZES = (10, 100, 1000, 5000)
+FORM_TEMPLATE_NAME = "rendering/form.html"
+
+# Timing differences below this number of seconds are considered noise
+MIN_REGRESSION_SECONDS = 0.001
+
+
+class EmailForm(forms.Form):
+    email = forms.EmailField()
+    name = forms.CharField(max_length=100)
+    position = forms.IntegerField(min_value=0)
+
+
+def get_formset_classes(max_num):
+    """
+    Returns the formset classes to benchmark, keyed by name, accepting up to
+    `max_num` forms.
+    """
+    options = {"max_num": max_num, "absolute_max": max_num, "extra": 0}
+    return {
+        "formset": forms.formset_factory(
+            EmailForm, formset=ConvenientBaseFormSet, **options
+        ),
+        "model_formset": forms.modelformset_factory(
+            Book,
+            formset=ConvenientBaseModelFormSet,
+            fields=("title", "pages"),
+            **options,
+        ),
+        "inline_formset": forms.inlineformset_factory(
+            Author,
+            Book,
+            formset=ConvenientBaseInlineFormSet,
+            fields=("title", "pages"),
+            **options,
+        ),
+    }
+
+
+def get_formset_kwargs(name, author, size):
+    """
+    Returns the keyword arguments for instantiating the formset named `name`
+    with `size` initial forms.
+    """
+    if name == "model_formset":
+        return {"queryset": Book.objects.filter(author=author).order_by("pk")}
+    if name == "inline_formset":
+        return {"instance": author}
+    return {
+        "initial": [
+            {"email": f"person{i}@example.com", "name": f"Person {i}", "position": i}
+            for i in range(size)
+        ]
+    }
+
+
+def get_formset_data(formset, changed_field_name):
+    """
+    Returns POST data for the initial forms of `formset` as rendered, changing
+    a field of every tenth form.
+    """
+    data = {}
+    for index, form in enumerate([formset.management_form, *formset.forms]):
+        for bound_field in form:
+            value = bound_field.value()
+            data[bound_field.html_name] = "" if value is None else value
+        if index % 10 == 1:
+            data[form.add_prefix(changed_field_name)] = f"Changed {index}"
+    return data
+
+
+class QueryCounter:
+    """
+    Counts the queries executed on the default database connection. Unlike
+    `CaptureQueriesContext`, it is not limited by the size of the query log.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.wrapper = connection.execute_wrapper(self)
+        self.wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wrapper.__exit__(*exc_info)
+
+
+def measure(function, repeat):
+    """
+    Returns the fastest time in seconds out of `repeat` calls of `function`,
+    along with the number of queries performed by the last call. Each call is
+    performed in a transaction that is rolled back afterwards.
+    """
+    seconds = []
+    for _ in range(repeat):
+        with transaction.atomic(), QueryCounter() as counter:
+            start = time.perf_counter()
+            function()
+            seconds.append(time.perf_counter() - start)
+            transaction.set_rollback(True)
+    return {"seconds": min(seconds), "queries": counter.count}
+
+
+def benchmark_formset(name, formset_class, size, repeat):
+    """
+    Returns the measurements of each phase for the formset named `name` with
+    `size` forms, keyed by phase.
+    """
+    author = Author.objects.create(name=f"Author {size}")
+    if name != "formset":
+        Book.objects.bulk_create(
+            Book(author=author, title=f"Book {i}", pages=i) for i in range(size)
+        )
+    formset_kwargs = get_formset_kwargs(name, author, size)
+
+    def get_formset(*args):
+        # Clone the queryset, so its cached objects are not shared between
+        # formsets
+        kwargs = dict(formset_kwargs)
+        if "queryset" in kwargs:
+            kwargs["queryset"] = kwargs["queryset"].all()
+        return formset_class(*args, **kwargs)
+
+    changed_field_name = "name" if name == "formset" else "title"
+    data = get_formset_data(get_formset(), changed_field_name)
+
+    def construct():
+        return get_formset(data).forms
+
+    def is_valid():
+        formset = get_formset(data)
+        assert formset.is_valid(), formset.errors
+
+    def render():
+        return "".join(get_formset().render_iter(FORM_TEMPLATE_NAME))
+
+    def save():
+        formset = get_formset(data)
+        assert formset.is_valid(), formset.errors
+        with QueryCounter() as counter:
+            start = time.perf_counter()
+            formset.save()
+            elapsed = time.perf_counter() - start
+        return elapsed, counter.count
+
+    results = {
+        "construct": measure(construct, repeat),
+        "is_valid": measure(is_valid, repeat),
+        "render": measure(render, repeat),
+    }
+    if name != "formset":
+        # Only the saving itself is measured, not the preceding validation
+        measurements = []
+        for _ in range(repeat):
+            with transaction.atomic():
+                measurements.append(save())
+                transaction.set_rollback(True)
+        results["save"] = {
+            "seconds": min(elapsed for elapsed, _ in measurements),
+            "queries": measurements[-1][1],
+        }
+    else:
+        # Plain formsets do not perform any queries
+        for measurement in results.values():
+            measurement.pop("queries")
+    return results
+
+
+def run_benchmarks(sizes, repeat, names=None):
+    """
+    Returns the results of all benchmarks, keyed by `<formset>/<size>/<phase>`.
+    """
+    results = {}
+    formset_classes = get_formset_classes(max(sizes))
+    for name, formset_class in formset_classes.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            for phase, measurement in benchmark_formset(
+                name, formset_class, size, repeat
+            ).items():
+                key = f"{name}/{size}/{phase}"
+                results[key] = measurement
+                print(format_measurement(key, measurement), file=sys.stderr)
+    return results
+
+
+def format_measurement(key, measurement):
+    text = f"{key:<32} {measurement['seconds'] * 1000:>10.2f} ms"
+    if "queries" in measurement:
+        text += f" {measurement['queries']:>6} queries"
+    return text
+
+
+def compare_results(baseline, results, threshold):
+    """
+    Returns descriptions of the regressions of `results` compared to
+    `baseline`. Timings regress if they are slower by more than `threshold`,
+    as a fraction of the baseline, query counts regress on any increase.
+    """
+    regressions = []
+    for key, measurement in results.items():
+        baseline_measurement = baseline.get(key)
+        if baseline_measurement is None:
+            continue
+
+        baseline_seconds = baseline_measurement["seconds"]
+        seconds = measurement["seconds"]
+        if (
+            seconds > baseline_seconds * (1 + threshold)
+            and seconds - baseline_seconds > MIN_REGRESSION_SECONDS
+        ):
+            regressions.append(
+                f"{key}: {seconds * 1000:.2f} ms, was {baseline_seconds * 1000:.2f} ms"
+            )
+
+        baseline_queries = baseline_measurement.get("queries")
+        queries = measurement.get("queries")
+        if baseline_queries is not None and queries is not None:
+            if queries > baseline_queries:
+                regressions.append(
+                    f"{key}: {queries} queries, was {baseline_queries} queries"
+                )
+    return regressions
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(SIZES),
+        help="numbers of forms to benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--formsets",
+        nargs="+",
+        choices=["formset", "model_formset", "inline_formset"],
+        help="formsets to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of runs per measurement, keeping the fastest (default: 3)",
+    )
+    parser.add_argument("--save", metavar="PATH", help="save results as baseline")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare results against baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown as a fraction of the baseline (default: 0.2)",
+    )
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parse_args(args)
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        results = run_benchmarks(options.sizes, options.repeat, options.formsets)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if options.save:
+        with open(options.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "environment": {
+                        "python": platform.python_version(),
+                        "django": django.get_version(),
+                        "repeat": options.repeat,
+                    },
+                    "results": results,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare_results(baseline, results, options.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
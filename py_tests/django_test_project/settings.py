@@ -5,9 +5,14 @@ DATABASES = {
     }
 }
 
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+FORM_RENDERER = "django.forms.renderers.DjangoDivFormRenderer"
+
 INSTALLED_APPS = (
     "django.contrib.staticfiles",
     "convenient_formsets",
+    "py_tests.django_test_project",
 )
 
 ROOT_URLCONF = "py_tests.django_test_project.urls"
@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import TestView
+from .views import LoadFormsTestView, TestView
 
 urlpatterns = [
     path("", TestView.as_view()),
+    path("load-forms/", LoadFormsTestView.as_view()),
 ]
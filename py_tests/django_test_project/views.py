@@ -1,3 +1,6 @@
+import json
+
+from django.shortcuts import render
 from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
 from django.views.generic.base import TemplateView
@@ -16,3 +19,39 @@ class TestView(TemplateView):
                 pass
 
         return "404.html"
+
+    def post(self, request, *args, **kwargs):
+        """
+        Renders the submitted data as JSON, mapping each name to its list of
+        values, allowing WebDrivers to retrieve it for further assertions.
+        """
+        submitted_data = json.dumps(dict(request.POST.lists()), sort_keys=True)
+        return render(
+            request, "submitted_data.html", {"submitted_data": submitted_data}
+        )
+
+
+class LoadFormsTestView(TemplateView):
+    """
+    Renders a window of 2 initial forms starting at the `offset` query
+    parameter, out of 6 initial forms in total.
+    """
+
+    template_name = "interaction/loading_forms_window.html"
+    total_form_count = 6
+    window_size = 2
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        offset = int(self.request.GET["offset"])
+        context["indexes"] = range(
+            offset, min(offset + self.window_size, self.total_form_count)
+        )
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        next_offset = context["indexes"].stop
+        if next_offset < self.total_form_count:
+            response["Convenient-Formset-Next-Offset"] = str(next_offset)
+        return response
@@ -1,6 +1,7 @@
 from urllib.parse import urlencode
 
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 
 
 def test_missing_options1(live_server, selenium):
@@ -234,3 +235,36 @@ def test_hiding_add_form_button_on_max_forms2(live_server, selenium):
         By.CSS_SELECTOR, "#formset #add-form-button"
     )
     assert add_form_button.get_attribute("hidden") is None
+
+
+def test_initializing_lazily(live_server, selenium):
+    """
+    ConvenientFormset has the `initializeLazily` option set, deferring hiding
+    forms marked for deletion until the formset becomes visible.
+    """
+    # Load webpage for test
+    params = {"template_name": "initialization/initializing_lazily.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Assert that no form has the `hidden` attribute set while the formset is
+    # not visible
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    assert len(forms) == 2
+
+    assert forms[0].get_attribute("hidden") is None
+    assert forms[1].get_attribute("hidden") is None
+
+    # Initiate click on show tab button, making the formset visible
+    selenium.find_element(By.CSS_SELECTOR, "#show-tab-button").click()
+
+    # Assert that first form gets the `hidden` attribute set
+    WebDriverWait(selenium, timeout=5).until(
+        lambda driver: forms[0].get_attribute("hidden") is not None
+    )
+    assert forms[1].get_attribute("hidden") is None
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
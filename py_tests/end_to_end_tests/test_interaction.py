@@ -1,6 +1,20 @@
+import json
 from urllib.parse import urlencode
 
+import pytest
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+def get_submitted_data(selenium):
+    """
+    Returns the data submitted by the form enclosing the formset, as rendered
+    by the test view.
+    """
+    submitted_data = WebDriverWait(selenium, timeout=5).until(
+        lambda driver: driver.find_element(By.CSS_SELECTOR, "#submitted-data")
+    )
+    return json.loads(submitted_data.text)
 
 
 def test_adding_forms1(live_server, selenium):
@@ -370,6 +384,52 @@ def test_ordering_forms2(live_server, selenium):
         assert element.get_attribute("value") == f"{expected_order_values[i]}"
 
 
+def test_moving_forms_to_position(live_server, selenium):
+    """
+    Test behavior when moving forms to another position using the
+    `moveFormTo()` method.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/moving_forms_to_position.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Move 5th form to the top and 2nd form below the last form
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    selenium.execute_script("window.formset.moveFormTo(arguments[0], 0);", forms[4])
+    selenium.execute_script("window.formset.moveFormTo(arguments[0], 10);", forms[1])
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert attributes of form elements
+    expected_form_indexes = ["4", "0", "2", "3", "1"]
+    expected_order_values = ["1", "2", "3", "4", "5"]
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    assert len(forms) == 5
+    for i, form in enumerate(forms):
+        # Text input
+        element = form.find_element(By.CSS_SELECTOR, 'input[type="text"]')
+        assert (
+            element.get_attribute("name") == f"formset-{expected_form_indexes[i]}-user"
+        )
+        assert element.get_attribute("value") == f"user{expected_form_indexes[i]}"
+
+        # Order index
+        element = form.find_element(By.CSS_SELECTOR, 'input[name$="ORDER"]')
+        assert (
+            element.get_attribute("name") == f"formset-{expected_form_indexes[i]}-ORDER"
+        )
+        assert element.get_attribute("value") == f"{expected_order_values[i]}"
+
+    # Assert events
+    event_log = selenium.find_element(By.CSS_SELECTOR, "#event-log")
+    event_messages = [msg.strip() for msg in event_log.text.split("\n") if msg.strip()]
+    assert event_messages == ["moved:formset:4:0", "moved:formset:2:4"]
+
+
 def test_combined_form_actions(live_server, selenium):
     """
     Test behavior when combining adding, deleting and ordering multiple forms.
@@ -440,6 +500,129 @@ def test_combined_form_actions(live_server, selenium):
         assert element.get_attribute("value") == f"{expected_order_values[i]}"
 
 
+def test_loading_forms(live_server, selenium):
+    """
+    Test behavior when loading further initial forms into a formset with 2
+    initial forms, after adding a new form.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/loading_forms.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Initiate click on add form button, then load the remaining 4 initial
+    # forms in 2 windows
+    add_form_button = selenium.find_element(
+        By.CSS_SELECTOR, "#formset #add-form-button"
+    )
+    add_form_button.click()
+    load_forms_button = selenium.find_element(
+        By.CSS_SELECTOR, "#formset #load-forms-button"
+    )
+    for expected_form_count in [5, 7]:
+        load_forms_button.click()
+        WebDriverWait(selenium, timeout=5).until(
+            lambda driver, count=expected_form_count: len(
+                driver.find_elements(By.CSS_SELECTOR, "#formset .form")
+            )
+            == count
+        )
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert attributes of form elements
+    expected_text_values = ["user0", "user1", "user2", "user3", "user4", "user5", ""]
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    assert len(forms) == 7
+    for i, form in enumerate(forms):
+        # Text input
+        element = form.find_element(By.CSS_SELECTOR, '[type="text"]')
+        assert element.get_attribute("name") == f"formset-{i}-user"
+        assert element.get_attribute("value") == f"{expected_text_values[i]}"
+
+        # Order index
+        element = form.find_element(By.CSS_SELECTOR, "[name$=ORDER]")
+        assert element.get_attribute("name") == f"formset-{i}-ORDER"
+        assert element.get_attribute("value") == f"{i + 1}"
+
+    # Assert management form values
+    total_forms_input = selenium.find_element(
+        By.CSS_SELECTOR, 'input[name="formset-TOTAL_FORMS"]'
+    )
+    assert total_forms_input.get_attribute("value") == "7"
+    initial_forms_input = selenium.find_element(
+        By.CSS_SELECTOR, 'input[name="formset-INITIAL_FORMS"]'
+    )
+    assert initial_forms_input.get_attribute("value") == "6"
+
+    # Assert that load forms button has the `hidden` attribute set
+    assert load_forms_button.get_attribute("hidden") == "true"
+
+
+def test_adding_forms_batch(live_server, selenium):
+    """
+    Test behavior when adding multiple pre-filled forms at once using the
+    `addForms()` method, exceeding the maximum number of forms.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/adding_forms_batch.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Add 5 forms at once (two too many), of which two are pre-filled
+    added_form_count = selenium.execute_script(
+        "return window.formset.addForms(5, arguments[0]).length;",
+        [{"user": "user1", "active": True}, {"user": "user2"}],
+    )
+    assert added_form_count == 3
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert attributes of form elements
+    expected_text_values = ["user0", "user1", "user2", ""]
+    expected_checked_values = [True, True, False, False]
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    assert len(forms) == 4
+    for i, form in enumerate(forms):
+        # Text input
+        element = form.find_element(By.CSS_SELECTOR, 'input[type="text"]')
+        assert element.get_attribute("name") == f"formset-{i}-user"
+        assert element.get_property("value") == expected_text_values[i]
+
+        # Checkbox
+        element = form.find_element(By.CSS_SELECTOR, 'input[type="checkbox"]')
+        assert element.get_attribute("name") == f"formset-{i}-active"
+        assert element.is_selected() == expected_checked_values[i]
+
+        # Order index
+        element = form.find_element(By.CSS_SELECTOR, 'input[name$="ORDER"]')
+        assert element.get_attribute("name") == f"formset-{i}-ORDER"
+        assert element.get_attribute("value") == f"{i + 1}"
+
+    # Assert management form values
+    total_forms_input = selenium.find_element(
+        By.CSS_SELECTOR, 'input[name="formset-TOTAL_FORMS"]'
+    )
+    assert total_forms_input.get_attribute("value") == "4"
+
+    # Assert that add form button has the `hidden` attribute set
+    add_form_button = selenium.find_element(
+        By.CSS_SELECTOR, "#formset #add-form-button"
+    )
+    assert add_form_button.get_attribute("hidden") == "true"
+
+    # Assert that a single event is fired for all forms added
+    event_log = selenium.find_element(By.CSS_SELECTOR, "#event-log")
+    event_messages = [msg.strip() for msg in event_log.text.split("\n") if msg.strip()]
+    assert event_messages == ["added:formset:3"]
+
+
 def test_form_added_event(live_server, selenium):
     """
     Test the behavior when adding a form to a formset a JavaScript event
@@ -524,3 +707,340 @@ def test_form_moved_events(live_server, selenium):
     event_log = selenium.find_element(By.CSS_SELECTOR, "#event-log")
     event_messages = [msg.strip() for msg in event_log.text.split("\n") if msg.strip()]
     assert event_messages == ["movedDown:formset", "movedUp:formset", "movedUp:formset"]
+
+
+def test_virtualizing_forms(live_server, selenium):
+    """
+    Test behavior when scrolling forms out of view and back in, with
+    virtualization of forms enabled, and submitting the enclosing form.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/virtualizing_forms.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Change the value of the 1st form
+    element = selenium.find_element(By.CSS_SELECTOR, '[name="formset-0-user"]')
+    element.clear()
+    element.send_keys("changed0")
+    selenium.execute_script("document.activeElement.blur();")
+
+    # Scroll to the bottom, virtualizing the 1st form
+    selenium.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    WebDriverWait(selenium, timeout=5).until(
+        lambda driver: not driver.find_elements(
+            By.CSS_SELECTOR, '[name="formset-0-user"]'
+        )
+    )
+    placeholders = selenium.find_elements(
+        By.CSS_SELECTOR, "[data-convenient-formset-placeholder]"
+    )
+    assert len(placeholders) >= 1
+
+    # Change the value of the last form
+    element = selenium.find_element(By.CSS_SELECTOR, '[name="formset-5-user"]')
+    element.clear()
+    element.send_keys("changed5")
+    selenium.execute_script("document.activeElement.blur();")
+
+    # Scroll back to the top, mounting the 1st form and virtualizing the last
+    selenium.execute_script("window.scrollTo(0, 0);")
+    WebDriverWait(selenium, timeout=5).until(
+        lambda driver: driver.find_elements(By.CSS_SELECTOR, '[name="formset-0-user"]')
+        and not driver.find_elements(By.CSS_SELECTOR, '[name="formset-5-user"]')
+    )
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert that the value of the mounted form has been kept
+    element = selenium.find_element(By.CSS_SELECTOR, '[name="formset-0-user"]')
+    assert element.get_attribute("value") == "changed0"
+    forms = selenium.find_elements(
+        By.CSS_SELECTOR,
+        "#formset .form, #formset [data-convenient-formset-placeholder]",
+    )
+    assert len(forms) == 6
+
+    # Assert the submitted data, including the values of virtualized forms
+    selenium.find_element(By.CSS_SELECTOR, "#submit-button").click()
+    submitted_data = get_submitted_data(selenium)
+    expected_text_values = ["changed0", "user1", "user2", "user3", "user4", "changed5"]
+    for i, expected_text_value in enumerate(expected_text_values):
+        assert submitted_data[f"formset-{i}-user"] == [expected_text_value]
+        assert submitted_data[f"formset-{i}-DELETE"] == [""]
+    assert submitted_data["formset-TOTAL_FORMS"] == ["6"]
+    assert submitted_data["formset-INITIAL_FORMS"] == ["6"]
+
+
+@pytest.mark.parametrize("submit_method", ["button", "submit()"])
+def test_deferring_reindexing(live_server, selenium, submit_method):
+    """
+    Test behavior when adding, deleting and ordering forms with reindexing
+    deferred, and submitting the enclosing form by clicking its submit button
+    or by calling `submit()`, which skips the submit event.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/deferring_reindexing.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Initiate click on move form down button of 1st form and on delete form
+    # button of 2nd form
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    forms[0].find_element(By.CSS_SELECTOR, "#move-form-down-button").click()
+    forms[1].find_element(By.CSS_SELECTOR, "#delete-form-button").click()
+
+    # Initiate two clicks on add form button, fill in both new forms and
+    # delete the first one, shifting the index of the second one
+    add_form_button = selenium.find_element(
+        By.CSS_SELECTOR, "#formset #add-form-button"
+    )
+    add_form_button.click()
+    add_form_button.click()
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    forms[5].find_element(By.CSS_SELECTOR, 'input[type="text"]').send_keys("new5")
+    forms[6].find_element(By.CSS_SELECTOR, 'input[type="text"]').send_keys("new6")
+    forms[5].find_element(By.CSS_SELECTOR, "#delete-form-button").click()
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert that the new form and the management form are not updated yet
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    assert len(forms) == 6
+    element = forms[5].find_element(By.CSS_SELECTOR, 'input[type="text"]')
+    assert element.get_attribute("name") == "formset-__prefix__-user"
+    total_forms_input = selenium.find_element(
+        By.CSS_SELECTOR, 'input[name="formset-TOTAL_FORMS"]'
+    )
+    assert total_forms_input.get_attribute("value") == "5"
+
+    # Submit the enclosing form
+    if submit_method == "button":
+        selenium.find_element(By.CSS_SELECTOR, "#submit-button").click()
+    else:
+        selenium.execute_script("document.querySelector('#enclosing-form').submit();")
+    submitted_data = get_submitted_data(selenium)
+
+    # Assert the submitted data
+    expected_text_values = ["user0", "user1", "user2", "user3", "user4", "new6"]
+    expected_delete_values = ["", "on", "", "", ""]
+    expected_order_values = ["2", "1", "3", "4", "5"]
+    for i, expected_text_value in enumerate(expected_text_values):
+        assert submitted_data[f"formset-{i}-user"] == [expected_text_value]
+    for i, expected_delete_value in enumerate(expected_delete_values):
+        assert submitted_data[f"formset-{i}-DELETE"] == [expected_delete_value]
+        assert submitted_data[f"formset-{i}-ORDER"] == [expected_order_values[i]]
+    assert "formset-5-ORDER" in submitted_data
+    assert not any("__prefix__" in name for name in submitted_data)
+    assert "formset-6-user" not in submitted_data
+    assert submitted_data["formset-TOTAL_FORMS"] == ["6"]
+    assert submitted_data["formset-INITIAL_FORMS"] == ["5"]
+
+
+def test_deferring_reindexing_flush(live_server, selenium):
+    """
+    Test behavior when adding and deleting forms with reindexing deferred,
+    calling `flush()` before submitting the enclosing form.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/deferring_reindexing.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Initiate click on delete form button of 1st form and two clicks on add
+    # form button, filling in both new forms
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    forms[0].find_element(By.CSS_SELECTOR, "#delete-form-button").click()
+    add_form_button = selenium.find_element(
+        By.CSS_SELECTOR, "#formset #add-form-button"
+    )
+    add_form_button.click()
+    add_form_button.click()
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset #forms-container .form")
+    forms[5].find_element(By.CSS_SELECTOR, 'input[type="text"]').send_keys("new5")
+    forms[6].find_element(By.CSS_SELECTOR, 'input[type="text"]').send_keys("new6")
+
+    # Flush the pending changes
+    selenium.execute_script("window.formset.flush();")
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert that the new forms and the management form are updated
+    for i in [5, 6]:
+        element = forms[i].find_element(By.CSS_SELECTOR, 'input[type="text"]')
+        assert element.get_attribute("name") == f"formset-{i}-user"
+        element = forms[i].find_element(By.CSS_SELECTOR, 'input[name$="ORDER"]')
+        assert element.get_attribute("name") == f"formset-{i}-ORDER"
+    total_forms_input = selenium.find_element(
+        By.CSS_SELECTOR, 'input[name="formset-TOTAL_FORMS"]'
+    )
+    assert total_forms_input.get_attribute("value") == "7"
+
+    # Submit the enclosing form and assert the submitted data
+    selenium.execute_script("document.querySelector('#enclosing-form').submit();")
+    submitted_data = get_submitted_data(selenium)
+    expected_text_values = ["user0", "user1", "user2", "user3", "user4", "new5", "new6"]
+    for i, expected_text_value in enumerate(expected_text_values):
+        assert submitted_data[f"formset-{i}-user"] == [expected_text_value]
+    assert submitted_data["formset-0-DELETE"] == ["on"]
+    assert not any("__prefix__" in name for name in submitted_data)
+    assert submitted_data["formset-TOTAL_FORMS"] == ["7"]
+    assert submitted_data["formset-INITIAL_FORMS"] == ["5"]
+
+
+def test_submitting_as_json(live_server, selenium):
+    """
+    Test behavior when submitting the enclosing form with `submitAsJson` set,
+    after selecting multiple values in a form and adding another form.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/submitting_as_json.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Select both tags of the 1st form
+    selenium.find_element(
+        By.CSS_SELECTOR, '[name="formset-0-tags"] option[value="a"]'
+    ).click()
+
+    # Add a form and fill in its user
+    selenium.find_element(By.CSS_SELECTOR, "#formset #add-form-button").click()
+    selenium.find_element(By.CSS_SELECTOR, '[name="formset-2-user"]').send_keys("user2")
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert that the fields of the forms are submitted as a single JSON field
+    selenium.find_element(By.CSS_SELECTOR, "#submit-button").click()
+    submitted_data = get_submitted_data(selenium)
+    json_data = json.loads(submitted_data.pop("formset-JSON_DATA")[0])
+    assert submitted_data == {
+        "formset-INITIAL_FORMS": ["2"],
+        "formset-MAX_NUM_FORMS": ["5"],
+        "formset-MIN_NUM_FORMS": ["0"],
+        "formset-TOTAL_FORMS": ["3"],
+        "title": ["Title"],
+    }
+    assert json_data == {
+        "fields": ["user", "tags", "DELETE"],
+        "forms": [
+            ["user0", ["a", "b"], ""],
+            ["user1", "b", ""],
+            ["user2", None, ""],
+        ],
+    }
+
+
+def test_omitting_deleted_form_fields(live_server, selenium):
+    """
+    Test behavior when deleting a form with `omitDeletedFormFields` set, and
+    submitting the enclosing form.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/omitting_deleted_form_fields.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Delete the 2nd form
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#formset .form")
+    forms[1].find_element(By.CSS_SELECTOR, "#delete-form-button").click()
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert that only the primary key and DELETE fields of the deleted form
+    # are submitted, while the other forms are submitted as usual
+    selenium.find_element(By.CSS_SELECTOR, "#submit-button").click()
+    submitted_data = get_submitted_data(selenium)
+    assert {
+        name: values
+        for name, values in submitted_data.items()
+        if name.startswith("formset-1-")
+    } == {"formset-1-id": ["1"], "formset-1-DELETE": ["on"]}
+    for i in (0, 2):
+        assert {
+            name: values
+            for name, values in submitted_data.items()
+            if name.startswith(f"formset-{i}-")
+        } == {
+            f"formset-{i}-id": [str(i)],
+            f"formset-{i}-user": [f"user{i}"],
+            f"formset-{i}-role": ["member"],
+            f"formset-{i}-active": ["on"],
+            f"formset-{i}-notes": [f"notes{i}"],
+            f"formset-{i}-DELETE": [""],
+        }
+    assert submitted_data["formset-TOTAL_FORMS"] == ["3"]
+
+
+def test_initializing_all_formsets(live_server, selenium):
+    """
+    Test behavior when initializing two formsets at once from their JSON
+    script elements using `ConvenientFormset.initAll()`, and using both.
+    """
+    # Load webpage for test
+    params = {"template_name": "interaction/initializing_all_formsets.html"}
+    test_url = f"{live_server.url}?{urlencode(params)}"
+    selenium.get(test_url)
+
+    # Assert that both formsets are initialized, and only once
+    assert selenium.execute_script("return window.formsets.length;") == 2
+    assert selenium.execute_script("return ConvenientFormset.initAll().length;") == 0
+
+    # Add a form to the 1st formset and delete its 1st form
+    selenium.find_element(By.CSS_SELECTOR, "#authors-add-form-button").click()
+    selenium.find_element(By.CSS_SELECTOR, '[name="authors-2-name"]').send_keys(
+        "author2"
+    )
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#authors .authors-form")
+    forms[0].find_element(By.CSS_SELECTOR, ".authors-delete-form-button").click()
+
+    # Add a form to the 2nd formset and move its 1st form down
+    selenium.find_element(By.CSS_SELECTOR, "#books-add-form-button").click()
+    selenium.find_element(By.CSS_SELECTOR, '[name="books-2-title"]').send_keys("book2")
+    forms = selenium.find_elements(By.CSS_SELECTOR, "#books .books-form")
+    forms[0].find_element(By.CSS_SELECTOR, ".books-move-form-down-button").click()
+
+    # Assert errors
+    error_log = selenium.find_element(By.CSS_SELECTOR, "#error-log")
+    error_messages = [msg.strip() for msg in error_log.text.split("\n") if msg.strip()]
+    assert error_messages == []
+
+    # Assert the submitted data of both formsets
+    selenium.find_element(By.CSS_SELECTOR, "#submit-button").click()
+    submitted_data = get_submitted_data(selenium)
+    assert submitted_data == {
+        "authors-0-DELETE": ["on"],
+        "authors-0-name": ["author0"],
+        "authors-1-DELETE": [""],
+        "authors-1-name": ["author1"],
+        "authors-2-DELETE": [""],
+        "authors-2-name": ["author2"],
+        "authors-INITIAL_FORMS": ["2"],
+        "authors-MAX_NUM_FORMS": ["5"],
+        "authors-MIN_NUM_FORMS": ["0"],
+        "authors-TOTAL_FORMS": ["3"],
+        "books-0-ORDER": ["2"],
+        "books-0-title": ["book0"],
+        "books-1-ORDER": ["1"],
+        "books-1-title": ["book1"],
+        "books-2-ORDER": ["3"],
+        "books-2-title": ["book2"],
+        "books-INITIAL_FORMS": ["2"],
+        "books-MAX_NUM_FORMS": ["5"],
+        "books-MIN_NUM_FORMS": ["0"],
+        "books-TOTAL_FORMS": ["3"],
+    }
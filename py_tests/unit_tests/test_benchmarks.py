@@ -0,0 +1,27 @@
+from py_tests.benchmarks import run_benchmarks
+
+
+def test_compare_results():
+    baseline = {
+        "formset/10/render": {"seconds": 0.010},
+        "model_formset/10/is_valid": {"seconds": 0.010, "queries": 11},
+        "model_formset/10/save": {"seconds": 0.010, "queries": 1},
+        "model_formset/100/save": {"seconds": 0.010, "queries": 10},
+    }
+    results = {
+        # Within threshold, or slower by less than the noise margin
+        "formset/10/render": {"seconds": 0.0119},
+        "formset/100/render": {"seconds": 1.0},
+        "model_formset/10/is_valid": {"seconds": 0.002, "queries": 1},
+        # Regressions of timing and query count
+        "model_formset/10/save": {"seconds": 0.013, "queries": 1},
+        "model_formset/100/save": {"seconds": 0.010, "queries": 11},
+    }
+
+    assert run_benchmarks.compare_results(baseline, results, threshold=0.2) == [
+        "model_formset/10/save: 13.00 ms, was 10.00 ms",
+        "model_formset/100/save: 11 queries, was 10 queries",
+    ]
+    assert run_benchmarks.compare_results(baseline, results, threshold=0.5) == [
+        "model_formset/100/save: 11 queries, was 10 queries",
+    ]
@@ -1,8 +1,31 @@
+import datetime
+import json
+import threading
+import time
+
 import pytest
+from asgiref.sync import async_to_sync
 from django import forms
+from django.core.cache import caches
+from django.core.exceptions import TooManyFieldsSent
+from django.db import connection
+from django.db.models import signals
+from django.http import QueryDict
 from django.templatetags.static import static
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone, translation
 
-from convenient_formsets import formsets
+from convenient_formsets import (
+    caching,
+    choices,
+    formsets,
+    instrumentation,
+    signals as signals_module,
+    views,
+)
+from convenient_formsets.assets import get_script_media
+from convenient_formsets.deletion import DeletedForm
+from py_tests.django_test_project.models import Author, Book, Chapter, Edition, Tag
 
 
 @pytest.fixture
@@ -27,7 +50,1222 @@ def test_media(form_class, settings):
     settings.DEBUG = True
     expected_url = static("convenient_formsets/convenient_formsets.js")
     assert expected_url in str(formset.media["js"])
+    assert " defer></script>" in str(formset.media["js"])
+    assert ' integrity="sha384-' in str(formset.media["js"])
 
     settings.DEBUG = False
     expected_url = static("convenient_formsets/convenient_formsets.min.js")
     assert expected_url in str(formset.media["js"])
+    assert get_script_media(False) is get_script_media(False)
+
+
+def test_media_per_instance(form_class):
+    class WidgetForm(form_class):
+        @property
+        def media(self):
+            if self.initial.get("rich"):
+                return super().media + forms.Media(js=["rich_editor.js"])
+            return super().media
+
+    class WidgetFormSet(formsets.ConvenientBaseFormSet):
+        pass
+
+    WidgetFormSet = forms.formset_factory(WidgetForm, formset=WidgetFormSet)
+    assert "rich_editor.js" not in str(WidgetFormSet().media)
+    assert "rich_editor.js" in str(WidgetFormSet(initial=[{"rich": True}]).media)
+
+
+def test_render_iter(form_class):
+    PersonalDataFormSet = forms.formset_factory(
+        form_class, formset=formsets.ConvenientBaseFormSet, extra=3
+    )
+    formset = PersonalDataFormSet(prefix="personal-data")
+
+    rendered_forms = formset.render_iter()
+    first_form = next(rendered_forms)
+    assert 'name="personal-data-0-first_name"' in first_form
+    assert "personal-data-1-" not in first_form
+    assert "forms" not in formset.__dict__
+
+    *other_forms, empty_form, management_form = rendered_forms
+    assert len(other_forms) == 2
+    assert 'name="personal-data-2-first_name"' in other_forms[1]
+    assert empty_form.startswith('<template id="personal-data-empty-form-template">')
+    assert 'name="personal-data-__prefix__-first_name"' in empty_form
+    assert 'name="personal-data-TOTAL_FORMS" value="3"' in management_form
+    assert "forms" not in formset.__dict__
+
+    rendered_forms = list(formset.render_iter("rendering/form.html"))
+    assert len(rendered_forms) == 5
+    assert rendered_forms[0].startswith('<div class="personal-data-form">')
+    assert 'name="personal-data-0-email_address"' in rendered_forms[0]
+
+
+def test_js_options(form_class):
+    class PersonalDataBaseFormSet(formsets.ConvenientBaseFormSet):
+        js_options = {"formSelector": ".form", "canAddForms": False}
+
+    PersonalDataFormSet = forms.formset_factory(
+        form_class, formset=PersonalDataBaseFormSet, can_delete=True
+    )
+    formset = PersonalDataFormSet(prefix="personal-data")
+
+    js_options = formset.get_js_options(canAddForms=True)
+    assert js_options["formsetPrefix"] == "personal-data"
+    assert js_options["formsContainerSelector"] == "#personal-data-forms-container"
+    assert js_options["formSelector"] == ".form"
+    assert js_options["canAddForms"] is True
+    assert js_options["canDeleteForms"] is True
+    assert js_options["canOrderForms"] is False
+    assert (
+        js_options["emptyFormTemplateSelector"] == "#personal-data-empty-form-template"
+    )
+    assert 'id="personal-data-empty-form-template"' in "".join(formset.render_iter())
+
+    rendered_js_options = formset.render_js_options(canAddForms=True)
+    assert rendered_js_options.startswith(
+        '<script id="personal-data-convenient-formset-options" '
+        'type="application/json">'
+    )
+    assert '"formsetPrefix": "personal-data"' in rendered_js_options
+    assert '"canAddForms": true' in rendered_js_options
+
+
+def test_json_submission(form_class, settings):
+    class PersonalDataBaseFormSet(formsets.ConvenientBaseFormSet):
+        json_submission = True
+
+    class TaggedPersonalDataForm(form_class):
+        tags = forms.MultipleChoiceField(choices=[("a", "A"), ("b", "B")])
+
+    PersonalDataFormSet = forms.formset_factory(
+        TaggedPersonalDataForm, formset=PersonalDataBaseFormSet
+    )
+    json_data = {
+        "fields": ["first_name", "last_name", "email_address", "tags"],
+        "forms": [
+            ["Alice", "Smith", "alice@example.com", ["a", "b"]],
+            ["Bob", "Jones", "bob@example.com", "b"],
+        ],
+    }
+    data = QueryDict(mutable=True)
+    data.update({"form-TOTAL_FORMS": "2", "form-INITIAL_FORMS": "0"})
+    data["form-JSON_DATA"] = json.dumps(json_data)
+
+    formset = PersonalDataFormSet(data)
+    assert formset.get_js_options()["submitAsJson"] is True
+    assert "form-JSON_DATA" not in formset.data
+    assert formset.data.getlist("form-0-tags") == ["a", "b"]
+    assert formset.is_valid()
+    assert [form.cleaned_data["first_name"] for form in formset] == ["Alice", "Bob"]
+    assert [form.cleaned_data["tags"] for form in formset] == [["a", "b"], ["b"]]
+
+    data["form-JSON_DATA"] = json.dumps({"fields": ["first_name"], "forms": [[1]]})
+    formset = PersonalDataFormSet(data)
+    assert not formset.is_valid()
+    assert [error.code for error in formset.non_form_errors().as_data()] == [
+        "invalid_json_data"
+    ]
+
+    formset = PersonalDataFormSet(
+        {"form-TOTAL_FORMS": "1", "form-INITIAL_FORMS": "0", "form-JSON_DATA": 1}
+    )
+    assert not formset.is_valid()
+    assert [error.code for error in formset.non_form_errors().as_data()] == [
+        "invalid_json_data"
+    ]
+
+    settings.DATA_UPLOAD_MAX_NUMBER_FIELDS = 7
+    data["form-JSON_DATA"] = json.dumps(json_data)
+    with pytest.raises(TooManyFieldsSent):
+        PersonalDataFormSet(data)
+
+
+def test_parallel_clean(form_class):
+    thread_ids = set()
+
+    class SlowForm(form_class):
+        def clean(self):
+            thread_ids.add(threading.get_ident())
+            time.sleep(0.01)
+            return super().clean()
+
+    class ParallelFormSet(formsets.ConvenientBaseFormSet):
+        parallel_clean = True
+        parallel_clean_max_workers = 3
+
+        def clean(self):
+            if any(self.errors):
+                raise forms.ValidationError("Invalid forms")
+
+    PersonalDataFormSet = forms.formset_factory(
+        SlowForm, formset=ParallelFormSet, extra=0
+    )
+    data = {"form-TOTAL_FORMS": "8", "form-INITIAL_FORMS": "0"}
+    for i in range(8):
+        data.update(
+            {
+                f"form-{i}-first_name": f"First {i}",
+                f"form-{i}-last_name": f"Last {i}",
+                f"form-{i}-email_address": f"email{i}@example.com",
+            }
+        )
+    del data["form-2-last_name"]
+    data["form-5-email_address"] = "invalid"
+
+    formset = PersonalDataFormSet(data)
+    assert not formset.is_valid()
+    assert len(thread_ids) == 3
+    assert threading.get_ident() not in thread_ids
+    assert [i for i, errors in enumerate(formset.errors) if errors] == [2, 5]
+    assert formset.errors[2] == {"last_name": ["This field is required."]}
+    assert formset.non_form_errors() == ["Invalid forms"]
+    assert formset.forms[7].cleaned_data["first_name"] == "First 7"
+
+
+def test_parallel_clean_context(form_class, settings):
+    settings.USE_TZ = True
+
+    class DatedForm(form_class):
+        born_at = forms.DateTimeField()
+
+        def clean(self):
+            cleaned_data = super().clean()
+            cleaned_data["timezone"] = timezone.get_current_timezone_name()
+            cleaned_data["language"] = translation.get_language()
+            return cleaned_data
+
+    class ParallelFormSet(formsets.ConvenientBaseFormSet):
+        parallel_clean = True
+        parallel_clean_max_workers = 2
+
+    PersonalDataFormSet = forms.formset_factory(
+        DatedForm, formset=ParallelFormSet, extra=0
+    )
+    data = {"form-TOTAL_FORMS": "4", "form-INITIAL_FORMS": "0"}
+    for i in range(4):
+        data.update(
+            {
+                f"form-{i}-first_name": f"First {i}",
+                f"form-{i}-last_name": f"Last {i}",
+                f"form-{i}-email_address": f"email{i}@example.com",
+                f"form-{i}-born_at": "2000-01-01 12:00",
+            }
+        )
+
+    with timezone.override("Europe/Amsterdam"), translation.override("nl"):
+        formset = PersonalDataFormSet(data)
+        assert formset.is_valid()
+    for form in formset:
+        assert form.cleaned_data["timezone"] == "Europe/Amsterdam"
+        assert form.cleaned_data["language"] == "nl"
+        assert form.cleaned_data["born_at"].utcoffset() == datetime.timedelta(hours=1)
+
+
+@pytest.fixture
+def author():
+    author = Author.objects.create(name="Author")
+    Book.objects.bulk_create(
+        Book(author=author, title=f"Book {i}", pages=100 + i) for i in range(5)
+    )
+    return author
+
+
+def get_formset_data(formset, **changes):
+    """
+    Returns POST data for `formset` as rendered, updated with `changes`.
+    """
+    data = {}
+    for form in [formset.management_form, *formset.forms]:
+        for bound_field in form:
+            value = bound_field.value()
+            if isinstance(value, list):
+                value = [str(item) for item in value]
+            elif value is None:
+                value = ""
+            data[bound_field.html_name] = value
+    data.update(changes)
+    return data
+
+
+@pytest.mark.django_db
+def test_bulk_save(author, django_assert_num_queries):
+    class BulkInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        bulk_save = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author,
+        Book,
+        formset=BulkInlineFormSet,
+        fields=("title", "pages"),
+        can_delete=True,
+        extra=2,
+    )
+    data = get_formset_data(
+        BookFormSet(instance=author),
+        **{
+            "books-0-DELETE": "on",
+            "books-1-title": "Changed 1",
+            "books-2-pages": "1",
+            "books-5-title": "New 5",
+            "books-5-pages": "5",
+            "books-6-title": "New 6",
+            "books-6-pages": "6",
+        },
+    )
+    formset = BookFormSet(data, instance=author)
+    assert formset.is_valid()
+
+    # Savepoint, deletion (collect, delete tags, delete chapters, delete
+    # editions, delete), update, insert and release savepoint
+    deleted_book, changed_book_1, changed_book_2 = list(formset.get_queryset()[:3])
+    with django_assert_num_queries(9):
+        saved_instances = formset.save()
+
+    assert formset.deleted_objects == [deleted_book]
+    assert formset.changed_objects == [
+        (changed_book_1, ["title"]),
+        (changed_book_2, ["pages"]),
+    ]
+    assert [book.title for book in formset.new_objects] == ["New 5", "New 6"]
+    assert saved_instances == [changed_book_1, changed_book_2, *formset.new_objects]
+    assert all(book.pk is not None for book in formset.new_objects)
+    assert list(author.books.order_by("pk").values_list("title", "pages")) == [
+        ("Changed 1", 101),
+        ("Book 2", 1),
+        ("Book 3", 103),
+        ("Book 4", 104),
+        ("New 5", 5),
+        ("New 6", 6),
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("can_return_rows", [False, True])
+def test_bulk_save_many_to_many(author, can_return_rows, monkeypatch):
+    monkeypatch.setattr(
+        type(connection.features), "can_return_rows_from_bulk_insert", can_return_rows
+    )
+    tag = Tag.objects.create(name="Tag")
+
+    class BulkInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        bulk_save = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=BulkInlineFormSet, fields=("title", "tags"), extra=2
+    )
+    data = get_formset_data(
+        BookFormSet(instance=author),
+        **{
+            "books-5-title": "New 5",
+            "books-5-tags": [tag.pk],
+            "books-6-title": "New 6",
+        },
+    )
+    formset = BookFormSet(data, instance=author)
+    assert formset.is_valid()
+
+    # Without the primary keys of bulk created instances, new instances are
+    # saved one by one to save their tags
+    with CaptureQueriesContext(connection) as context:
+        formset.save()
+    inserts = [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith('INSERT INTO "django_test_project_book"')
+    ]
+    assert len(inserts) == (1 if can_return_rows else 2)
+    assert [book.title for book in formset.new_objects] == ["New 5", "New 6"]
+    assert all(book.pk is not None for book in formset.new_objects)
+    assert list(formset.new_objects[0].tags.all()) == [tag]
+
+
+@pytest.mark.django_db
+def test_bulk_save_pre_save(author):
+    class BulkModelFormSet(formsets.ConvenientBaseModelFormSet):
+        bulk_save = True
+
+    BookFormSet = forms.modelformset_factory(
+        Book, formset=BulkModelFormSet, fields=("title",), extra=0
+    )
+    queryset = Book.objects.order_by("pk")
+    updated_at = list(queryset.values_list("updated_at", flat=True))
+    data = get_formset_data(
+        BookFormSet(queryset=queryset), **{"form-1-title": "Changed 1"}
+    )
+    formset = BookFormSet(data, queryset=queryset)
+    assert formset.is_valid()
+    formset.save()
+
+    # Fields with `auto_now` set are updated along with the changed fields
+    new_updated_at = list(queryset.values_list("updated_at", flat=True))
+    assert new_updated_at[0] == updated_at[0]
+    assert new_updated_at[1] > updated_at[1]
+    assert formset.changed_objects[0][0].updated_at == new_updated_at[1]
+
+    # Models overriding `save()` are saved one by one, unless ignored
+    TagFormSet = forms.modelformset_factory(
+        Tag, formset=BulkModelFormSet, fields=("name",), extra=2
+    )
+    data = get_formset_data(TagFormSet(queryset=Tag.objects.none()))
+    data.update({"form-0-name": "saved"})
+    formset = TagFormSet(data, queryset=Tag.objects.none())
+    assert not formset.can_bulk_save()
+    assert formset.is_valid()
+    formset.save()
+    assert list(Tag.objects.values_list("name", flat=True)) == ["Saved"]
+
+    BulkModelFormSet.bulk_save_ignore_model_save = True
+    data.update({"form-0-name": "bulk"})
+    formset = TagFormSet(data, queryset=Tag.objects.none())
+    assert formset.can_bulk_save()
+    assert formset.is_valid()
+    formset.save()
+    assert list(Tag.objects.values_list("name", flat=True).order_by("pk")) == [
+        "Saved",
+        "bulk",
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("bulk_save", [False, True])
+def test_async_save(author, bulk_save, django_assert_num_queries):
+    class AsyncInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        share_choice_querysets = True
+
+    AsyncInlineFormSet.bulk_save = bulk_save
+    BookFormSet = forms.inlineformset_factory(
+        Author,
+        Book,
+        formset=AsyncInlineFormSet,
+        fields=("title", "pages"),
+        can_delete=True,
+        extra=1,
+    )
+    data = get_formset_data(
+        BookFormSet(instance=author),
+        **{
+            "books-0-DELETE": "on",
+            "books-1-title": "Changed 1",
+            "books-5-title": "New 5",
+            "books-5-pages": "5",
+        },
+    )
+    formset = BookFormSet(data, instance=author)
+
+    # The queryset is loaded asynchronously and shared with the pk fields
+    with django_assert_num_queries(1):
+        assert async_to_sync(formset.ais_valid)()
+    saved_instances = async_to_sync(formset.asave)()
+
+    assert [book.title for book in saved_instances] == ["Changed 1", "New 5"]
+    assert [book.title for book in formset.deleted_objects] == ["Book 0"]
+    assert formset.changed_objects == [(saved_instances[0], ["title"])]
+    assert list(author.books.order_by("pk").values_list("title", "pages")) == [
+        ("Changed 1", 101),
+        ("Book 2", 102),
+        ("Book 3", 103),
+        ("Book 4", 104),
+        ("New 5", 5),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_save_atomic(author):
+    class FailingInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        def save_new(self, form, commit=True):
+            raise RuntimeError("Failed to save")
+
+    BookFormSet = forms.inlineformset_factory(
+        Author,
+        Book,
+        formset=FailingInlineFormSet,
+        fields=("title",),
+        can_delete=True,
+        extra=1,
+    )
+    data = get_formset_data(
+        BookFormSet(instance=author),
+        **{
+            "books-0-DELETE": "on",
+            "books-1-title": "Changed 1",
+            "books-5-title": "New 5",
+        },
+    )
+    formset = BookFormSet(data, instance=author)
+    assert formset.is_valid()
+
+    # Deleting and updating is rolled back when saving the new book fails
+    with pytest.raises(RuntimeError):
+        async_to_sync(formset.asave)()
+    assert list(author.books.order_by("pk").values_list("title", flat=True)) == [
+        f"Book {i}" for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_save_signals(author):
+    class BulkInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        bulk_save = True
+        bulk_save_send_signals = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=BulkInlineFormSet, fields=("title",), extra=1
+    )
+    data = get_formset_data(
+        BookFormSet(instance=author),
+        **{"books-0-title": "Changed 0", "books-5-title": "New 5"},
+    )
+    formset = BookFormSet(data, instance=author)
+    assert formset.is_valid()
+
+    received = []
+
+    def receiver(signal, instance, update_fields, **kwargs):
+        received.append((signal, instance.title, update_fields, kwargs.get("created")))
+
+    signals.pre_save.connect(receiver, sender=Book)
+    signals.post_save.connect(receiver, sender=Book)
+    try:
+        formset.save()
+    finally:
+        signals.pre_save.disconnect(receiver, sender=Book)
+        signals.post_save.disconnect(receiver, sender=Book)
+
+    assert received == [
+        (signals.pre_save, "Changed 0", frozenset({"title", "updated_at"}), None),
+        (signals.post_save, "Changed 0", frozenset({"title", "updated_at"}), False),
+        (signals.pre_save, "New 5", None, None),
+        (signals.post_save, "New 5", None, True),
+    ]
+
+
+@pytest.mark.django_db
+def test_collect_stats(author):
+    class InstrumentedInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        collect_stats = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=InstrumentedInlineFormSet, fields=("title",), extra=1
+    )
+    formset = BookFormSet(
+        get_formset_data(BookFormSet(instance=author), **{"books-0-title": "Changed"}),
+        instance=author,
+    )
+
+    measured_phases = []
+
+    def receiver(sender, formset, phase, measurement, form_prefix, **kwargs):
+        measured_phases.append((sender, phase, form_prefix, measurement.count))
+
+    signals_module.phase_measured.connect(receiver)
+    try:
+        assert formset.is_valid()
+        formset.save()
+    finally:
+        signals_module.phase_measured.disconnect(receiver)
+
+    assert measured_phases[:2] == [
+        (BookFormSet, "construct", "books-0", 1),
+        (BookFormSet, "construct", "books-1", 1),
+    ]
+    assert measured_phases[-3:] == [
+        (BookFormSet, "clean", "books-5", 1),
+        (BookFormSet, "clean_formset", None, 1),
+        (BookFormSet, "save", None, 1),
+    ]
+
+    stats = formset.stats
+    assert set(stats.phases) == {"construct", "clean", "clean_formset", "save"}
+    assert stats.phases["construct"].count == 6
+    assert stats.phases["clean"].count == 6
+    assert stats.phases["save"].queries == 1
+    assert set(stats.forms["books-0"]) == {"construct", "clean"}
+    assert stats.forms["books-0"]["construct"].queries == 1
+    assert stats.forms["books-1"]["construct"].queries == 0
+    assert dict(stats.iter_metrics())["save.queries"] == 1
+    assert stats.as_dict()["forms"]["books-5"]["clean"]["count"] == 1
+
+
+def test_collect_formset_stats(form_class):
+    FormSet = forms.formset_factory(
+        form_class, formset=formsets.ConvenientBaseFormSet, extra=2
+    )
+    assert not FormSet().is_instrumented
+
+    with instrumentation.collect_formset_stats() as stats_list:
+        formset = FormSet(prefix="emails")
+        assert formset.is_instrumented
+        "".join(formset.render_iter())
+        str(formset)
+
+    assert stats_list == [formset.stats]
+    assert stats_list[0].prefix == "emails"
+    assert stats_list[0].phases["render"].count == 4
+    assert set(stats_list[0].forms) == {"emails-0", "emails-1", "emails-__prefix__"}
+    assert not formset.is_instrumented
+
+
+@pytest.mark.django_db
+def test_collect_stats_nested_phases(author):
+    class InstrumentedInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        collect_stats = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=InstrumentedInlineFormSet, fields=("title",), extra=1
+    )
+
+    # The forms of an unbound formset are constructed while rendering it,
+    # which is measured without this nested phase
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as context:
+        formset = BookFormSet(instance=author)
+        str(formset)
+    seconds = time.perf_counter() - start
+
+    stats = formset.stats
+    assert stats.phases["construct"].count == 6
+    assert sum(measurement.seconds for measurement in stats.phases.values()) <= (
+        seconds
+    )
+    assert sum(measurement.queries for measurement in stats.phases.values()) == len(
+        context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_share_choice_querysets(author, django_assert_num_queries):
+    Author.objects.create(name="Other author")
+    tags = Tag.objects.bulk_create(Tag(name=f"Tag {i}") for i in range(3))
+
+    class SharedChoicesModelFormSet(formsets.ConvenientBaseModelFormSet):
+        share_choice_querysets = True
+
+    BookFormSet = forms.modelformset_factory(
+        Book,
+        formset=SharedChoicesModelFormSet,
+        fields=("author", "title", "tags"),
+        extra=1,
+    )
+    queryset = Book.objects.prefetch_related("tags")
+
+    # Books, their tags, the author choices and the tag choices
+    formset = BookFormSet(queryset=queryset)
+    with django_assert_num_queries(4):
+        rendered_formset = str(formset)
+    assert rendered_formset.count(">Other author</option>") == 6
+    assert rendered_formset.count(">Tag 2</option>") == 6
+
+    data = get_formset_data(
+        formset,
+        **{"form-1-author": "", "form-5-title": "New", "form-5-author": "999"},
+    )
+    data["form-2-tags"] = [str(tags[0].pk), str(tags[2].pk)]
+    formset = BookFormSet(data, queryset=queryset)
+
+    # Books, their tags, the author choices and the tag choices, apart from
+    # model validation checking the existence of each selected author
+    with django_assert_num_queries(4 + 4):
+        assert not formset.is_valid()
+    assert formset.errors[1] == {"author": ["This field is required."]}
+    assert formset.errors[5] == {
+        "author": [
+            "Select a valid choice. " "That choice is not one of the available choices."
+        ]
+    }
+    assert list(formset.forms[2].cleaned_data["tags"]) == [tags[0], tags[2]]
+    assert formset.forms[0].cleaned_data["author"] == author
+    assert formset.forms[0].cleaned_data["id"] == formset.get_queryset()[0]
+
+    # Submitted values are converted by the model field before looking them up
+    data["form-1-author"] = f" {author.pk}"
+    data["form-2-tags"] = [f" {tags[1].pk}", f"{tags[2].pk} "]
+    formset = BookFormSet(data, queryset=queryset)
+    formset.is_valid()
+    assert formset.forms[1].cleaned_data["author"] == author
+    assert list(formset.forms[2].cleaned_data["tags"]) == [tags[1], tags[2]]
+
+    # The fields of the form class are left untouched
+    base_field = formset.form.base_fields["author"]
+    author_field = formset.forms[1].fields["author"]
+    assert isinstance(author_field, choices.SharedChoicesFieldMixin)
+    assert isinstance(author_field, type(base_field))
+    assert not isinstance(base_field, choices.SharedChoicesFieldMixin)
+
+
+@pytest.mark.django_db
+def test_trust_unchanged_forms(author, django_assert_num_queries):
+    clean_calls = []
+
+    class BookForm(forms.ModelForm):
+        class Meta:
+            model = Book
+            fields = ("author", "title", "pages", "tags")
+
+        def clean(self):
+            clean_calls.append(self.prefix)
+            return super().clean()
+
+    class TrustingModelFormSet(formsets.ConvenientBaseModelFormSet):
+        trust_unchanged_forms = True
+
+    BookFormSet = forms.modelformset_factory(
+        Book, form=BookForm, formset=TrustingModelFormSet, can_delete=True, extra=1
+    )
+    queryset = Book.objects.select_related("author").prefetch_related("tags")
+    formset = BookFormSet(queryset=queryset.order_by("pk"))
+    assert 'name="form-0-DIGEST"' in str(formset)
+    assert 'name="form-5-DIGEST"' not in str(formset)
+
+    data = get_formset_data(formset, **{"form-1-title": "Changed"})
+    data["form-3-DIGEST"] = "tampered"
+    formset = BookFormSet(data, queryset=queryset.order_by("pk"))
+
+    # Books and their tags, apart from cleaning the changed and tampered forms
+    # looking up their book and author, and validating the author exists
+    with django_assert_num_queries(2 + 2 * 3):
+        assert formset.is_valid()
+    assert clean_calls == ["form-1", "form-3"]
+    assert [form.has_changed() for form in formset.initial_forms] == [
+        False,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert formset.forms[0].cleaned_data["author"] == author.pk
+    assert formset.forms[0].cleaned_data["pages"] == 100
+    assert formset.forms[0].cleaned_data["id"] == formset.get_queryset()[0]
+
+    formset.save()
+    assert list(Book.objects.values_list("title", flat=True).order_by("pk")) == [
+        "Book 0",
+        "Changed",
+        "Book 2",
+        "Book 3",
+        "Book 4",
+    ]
+
+
+@pytest.mark.django_db
+def test_trust_unchanged_forms_queries(author):
+    class TrustingModelFormSet(formsets.ConvenientBaseModelFormSet):
+        trust_unchanged_forms = True
+        cache_forms = True
+
+    BookFormSet = forms.modelformset_factory(
+        Book,
+        formset=TrustingModelFormSet,
+        fields=("author", "title", "tags"),
+        extra=0,
+    )
+    data = get_formset_data(BookFormSet(queryset=Book.objects.order_by("pk")))
+
+    # Books, then the tags of each book for its initial data, without further
+    # queries for trusting the unchanged forms
+    formset = BookFormSet(data, queryset=Book.objects.order_by("pk"))
+    with CaptureQueriesContext(connection) as context:
+        formset.forms
+    assert len(context.captured_queries) == 1 + 5
+    with CaptureQueriesContext(connection) as context:
+        assert formset.is_valid()
+    assert len(context.captured_queries) == 0
+    assert formset.forms[0].cleaned_data["author"] == author.pk
+    assert formset.forms[0].cleaned_data["tags"] == []
+
+    # The digest is a plain value, so it does not prevent caching forms
+    BookFormSet = forms.modelformset_factory(
+        Book, formset=TrustingModelFormSet, fields=("title",), extra=0
+    )
+    form = BookFormSet(queryset=Book.objects.order_by("pk")).forms[0]
+    assert isinstance(form.fields["DIGEST"].initial, str)
+    assert caching.get_form_signature(form) is not None
+
+
+@pytest.mark.django_db
+def test_skip_deleted_forms(author, django_assert_num_queries):
+    other_book = Book.objects.create(
+        author=Author.objects.create(name="Other author"), title="Other book"
+    )
+
+    class SkippingInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        skip_deleted_forms = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author,
+        Book,
+        formset=SkippingInlineFormSet,
+        fields=("title", "pages"),
+        can_delete=True,
+        extra=0,
+    )
+    books = list(author.books.order_by("pk"))
+    formset = BookFormSet(instance=author, queryset=Book.objects.order_by("pk"))
+    data = get_formset_data(
+        formset,
+        **{
+            "books-1-DELETE": "on",
+            "books-1-title": "",
+            "books-2-DELETE": "on",
+            "books-3-DELETE": "on",
+            "books-3-id": str(other_book.pk),
+        },
+    )
+    formset = BookFormSet(data, instance=author, queryset=Book.objects.order_by("pk"))
+
+    # Existing deleted objects and books, then looking up the book of each of
+    # the other forms
+    with django_assert_num_queries(2 + 3):
+        assert formset.is_valid()
+    assert list(formset.deleted_form_pks) == [1, 2]
+    assert isinstance(formset.forms[1], DeletedForm)
+    assert 'name="books-1-DELETE" value="on"' in str(formset.forms[1])
+    assert isinstance(formset.forms[3], forms.ModelForm)
+
+    deleted_titles = []
+
+    def record_deleted_title(sender, instance, **kwargs):
+        deleted_titles.append(instance.title)
+
+    # The deleted objects are fetched for deleting them one by one
+    signals.pre_delete.connect(record_deleted_title, sender=Book)
+    try:
+        formset.save()
+    finally:
+        signals.pre_delete.disconnect(record_deleted_title, sender=Book)
+    assert deleted_titles == ["Book 1", "Book 2"]
+    assert len(formset.deleted_objects) == 2
+    assert list(Book.objects.order_by("pk")) == [
+        books[0],
+        books[3],
+        books[4],
+        other_book,
+    ]
+
+
+@pytest.mark.django_db
+def test_fetch_submitted_objects(author):
+    other_book = Book.objects.create(
+        author=Author.objects.create(name="Other author"), title="Other book"
+    )
+
+    class FetchingInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        fetch_submitted_objects = True
+        fetch_submitted_objects_only = ("author", "title")
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=FetchingInlineFormSet, fields=("title",), extra=0
+    )
+    books = list(author.books.order_by("pk"))
+    data = {
+        "books-TOTAL_FORMS": "3",
+        "books-INITIAL_FORMS": "3",
+        "books-0-id": str(books[3].pk),
+        "books-0-title": "Changed",
+        "books-1-id": str(books[4].pk),
+        "books-1-title": "Book 4",
+        "books-2-id": str(other_book.pk),
+        "books-2-title": "Tampered",
+    }
+    formset = BookFormSet(data, instance=author)
+
+    with CaptureQueriesContext(connection) as context:
+        assert [form.instance for form in formset.forms[:2]] == books[3:5]
+    assert len(context.captured_queries) == 1
+    assert " IN (" in context.captured_queries[0]["sql"]
+    assert '"pages"' not in context.captured_queries[0]["sql"]
+    assert formset.forms[2].instance.pk is None
+
+    assert formset.is_valid()
+    formset.save()
+    assert formset.changed_objects == [(books[3], ["title"])]
+    assert Book.objects.get(pk=other_book.pk).title == "Other book"
+
+
+@pytest.mark.django_db
+def test_fetch_submitted_objects_async(author):
+    class FetchingInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        fetch_submitted_objects = True
+        share_choice_querysets = True
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=FetchingInlineFormSet, fields=("title",), extra=0
+    )
+    book = author.books.order_by("pk")[3]
+    data = {
+        "books-TOTAL_FORMS": "1",
+        "books-INITIAL_FORMS": "1",
+        "books-0-id": str(book.pk),
+        "books-0-title": "Changed",
+    }
+    formset = BookFormSet(data, instance=author)
+
+    # Only the submitted book is fetched, shared with the pk field
+    with CaptureQueriesContext(connection) as context:
+        assert async_to_sync(formset.ais_valid)()
+    assert len(context.captured_queries) == 1
+    assert " IN (" in context.captured_queries[0]["sql"]
+    assert formset.forms[0].instance == book
+
+
+@pytest.mark.django_db
+def test_windowed_formset(author, django_assert_num_queries):
+    class WindowedInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        window_size = 2
+
+    BookFormSet = forms.inlineformset_factory(
+        Author,
+        Book,
+        formset=WindowedInlineFormSet,
+        fields=("title",),
+        can_order=True,
+        extra=1,
+    )
+    books = list(Book.objects.order_by("pk"))
+
+    formset = BookFormSet(instance=author, window_offset=2)
+    assert formset.initial_form_count() == 2
+    assert [form.prefix for form in formset.initial_forms] == ["books-2", "books-3"]
+    assert [form["ORDER"].initial for form in formset.initial_forms] == [3, 4]
+    assert [form.instance for form in formset.initial_forms] == books[2:4]
+    assert formset.get_next_window_offset() == 4
+    assert formset.get_js_options()["canLoadForms"] is True
+    UnwindowedBookFormSet = forms.inlineformset_factory(
+        Author, Book, formset=formsets.ConvenientBaseInlineFormSet, fields=("title",)
+    )
+    assert "canLoadForms" not in UnwindowedBookFormSet(instance=author).get_js_options()
+    assert (
+        BookFormSet(instance=author, window_offset=4).get_next_window_offset() is None
+    )
+
+    # Only the forms of the first window are submitted, with a new form
+    formset = BookFormSet(instance=author)
+    data = get_formset_data(formset, **{"books-0-title": "Changed"})
+    data.update({"books-TOTAL_FORMS": "3", "books-2-title": "New"})
+    formset = BookFormSet(data, instance=author)
+
+    # Books of the submitted forms, apart from cleaning the primary key field
+    # looking up the book of each submitted form
+    with django_assert_num_queries(1 + 2):
+        assert formset.is_valid()
+    formset.save()
+    assert list(author.books.values_list("title", flat=True).order_by("pk")) == [
+        "Changed",
+        "Book 1",
+        "Book 2",
+        "Book 3",
+        "Book 4",
+        "New",
+    ]
+
+
+@pytest.mark.django_db
+def test_formset_window_view(author, rf):
+    class WindowedInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        window_size = 3
+
+    class BookWindowView(views.FormsetWindowView):
+        formset_class = forms.inlineformset_factory(
+            Author, Book, formset=WindowedInlineFormSet, fields=("title",)
+        )
+        form_template_name = "rendering/form.html"
+
+        def get_formset_kwargs(self):
+            return {**super().get_formset_kwargs(), "instance": author}
+
+    response = BookWindowView.as_view()(rf.get("/", {"offset": "1"}))
+    content = b"".join(response.streaming_content).decode()
+    assert content.count('<div class="books-form">') == 3
+    assert 'value="Book 1"' in content and 'value="Book 3"' in content
+    assert 'name="books-3-title"' in content
+    assert "books-__prefix__" not in content
+    assert response[views.NEXT_WINDOW_OFFSET_HEADER] == "4"
+
+    response = BookWindowView.as_view()(rf.get("/", {"offset": "3"}))
+    assert views.NEXT_WINDOW_OFFSET_HEADER not in response
+
+    response = BookWindowView.as_view()(rf.get("/", {"offset": "-1"}))
+    assert response.status_code == 400
+
+
+def test_cache_empty_form(form_class):
+    caching.local_cache.clear()
+    render_calls = []
+
+    class RenderCountingForm(form_class):
+        def render(self, template_name=None, *args, **kwargs):
+            # Ignore rendering of labels
+            if template_name is None:
+                render_calls.append(self.prefix)
+            return super().render(template_name, *args, **kwargs)
+
+    class CachingFormSet(formsets.ConvenientBaseFormSet):
+        cache_empty_form = True
+
+    PersonalDataFormSet = forms.formset_factory(
+        RenderCountingForm, formset=CachingFormSet
+    )
+    rendered_empty_form = PersonalDataFormSet().render_empty_form()
+    assert 'name="form-__prefix__-first_name"' in rendered_empty_form
+    assert PersonalDataFormSet().render_empty_form() == rendered_empty_form
+    assert render_calls == ["form-__prefix__"]
+
+    # Rendered again for another prefix, language or form signature
+    PersonalDataFormSet(prefix="other").render_empty_form()
+    with translation.override("nl"):
+        PersonalDataFormSet().render_empty_form()
+    PersonalDataFormSet.form = type(
+        "RenderCountingForm", (RenderCountingForm,), {"age": forms.IntegerField()}
+    )
+    assert 'name="form-__prefix__-age"' in PersonalDataFormSet().render_empty_form()
+    assert (
+        render_calls
+        == ["form-__prefix__", "other-__prefix__"] + ["form-__prefix__"] * 2
+    )
+
+    # Rendered from the configured Django cache
+    CachingFormSet.empty_form_cache_alias = "default"
+    PersonalDataFormSet().render_empty_form()
+    PersonalDataFormSet().render_empty_form()
+    assert len(render_calls) == 5
+    caches["default"].clear()
+    PersonalDataFormSet().render_empty_form()
+    assert len(render_calls) == 6
+
+
+@pytest.mark.django_db
+def test_cache_forms(author):
+    caching.local_cache.clear()
+    render_calls = []
+    init_calls = []
+
+    class RenderCountingForm(forms.ModelForm):
+        class Meta:
+            model = Book
+            fields = ("title", "pages")
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            init_calls.append(self.prefix)
+
+        def render(self, template_name=None, *args, **kwargs):
+            # Ignore rendering of labels
+            if template_name is None:
+                render_calls.append(self.prefix)
+            return super().render(template_name, *args, **kwargs)
+
+    class CachingInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        cache_forms = True
+        form_cache_version_field = "pages"
+
+    BookFormSet = forms.inlineformset_factory(
+        Author, Book, form=RenderCountingForm, formset=CachingInlineFormSet, extra=1
+    )
+    rendered_forms = list(BookFormSet(instance=author).render_iter())
+    assert 'value="Book 1"' in rendered_forms[1]
+    assert render_calls == [f"books-{i}" for i in range(6)] + ["books-__prefix__"]
+
+    # Only changed, shifted and extra forms are constructed and rendered again
+    render_calls.clear()
+    init_calls.clear()
+    Book.objects.filter(title="Book 1").update(pages=200)
+    Book.objects.filter(title="Book 3").delete()
+    rendered_forms_iter = BookFormSet(instance=author).render_iter()
+    assert next(rendered_forms_iter) == rendered_forms[0]
+    assert init_calls == ["books-__prefix__"]
+    list(rendered_forms_iter)
+    assert render_calls == ["books-1", "books-3", "books-4", "books-__prefix__"]
+    assert init_calls == [
+        "books-__prefix__",
+        "books-1",
+        "books-3",
+        "books-4",
+        "books-__prefix__",
+    ]
+
+    # Bound formsets are never cached
+    render_calls.clear()
+    formset = BookFormSet(
+        get_formset_data(BookFormSet(instance=author)), instance=author
+    )
+    list(formset.render_iter())
+    assert render_calls == [f"books-{i}" for i in range(5)] + ["books-__prefix__"]
+
+
+@pytest.mark.django_db
+def test_cache_forms_invalidation(author):
+    caching.local_cache.clear()
+
+    class CachingModelFormSet(formsets.ConvenientBaseModelFormSet):
+        bulk_save = True
+        cache_forms = True
+        form_cache_version_field = "updated_at"
+
+    # Forms rendering the choices of a `ModelChoiceField` are not cached
+    BookFormSet = forms.modelformset_factory(
+        Book, formset=CachingModelFormSet, fields=("author", "title"), extra=0
+    )
+    queryset = Book.objects.order_by("pk")
+    formset = BookFormSet(queryset=queryset)
+    assert formset.form_cache_signature is None
+    list(formset.render_iter())
+    Author.objects.create(name="New author")
+    assert ">New author</option>" in next(BookFormSet(queryset=queryset).render_iter())
+
+    # Forms of instances saved in bulk are rendered again, as their version
+    # field with `auto_now` set is updated
+    BookFormSet = forms.modelformset_factory(
+        Book, formset=CachingModelFormSet, fields=("title",), extra=0
+    )
+    rendered_forms = list(BookFormSet(queryset=queryset).render_iter())
+    updated_at = queryset[1].updated_at
+    data = get_formset_data(
+        BookFormSet(queryset=queryset), **{"form-1-title": "Changed 1"}
+    )
+    formset = BookFormSet(data, queryset=queryset)
+    assert formset.is_valid()
+    formset.save()
+    assert queryset[1].updated_at > updated_at
+    new_rendered_forms = list(BookFormSet(queryset=queryset).render_iter())
+    assert new_rendered_forms[0] == rendered_forms[0]
+    assert 'value="Changed 1"' in new_rendered_forms[1]
+
+
+def test_form_signature(form_class):
+    class ChoiceForm(form_class):
+        color = forms.ChoiceField(choices=[("r", "Red"), ("g", "Green")])
+
+        def __init__(self, *args, narrow=False, **kwargs):
+            super().__init__(*args, **kwargs)
+            if narrow:
+                self.fields["first_name"].widget.attrs["size"] = "5"
+                self.fields["color"].widget.choices = [("r", "Red")]
+
+    signature = caching.get_form_signature(ChoiceForm())
+    assert caching.get_form_signature(ChoiceForm()) == signature
+    for form in (
+        ChoiceForm(narrow=True),
+        ChoiceForm(label_suffix=" -"),
+        ChoiceForm(use_required_attribute=False),
+        ChoiceForm(empty_permitted=True, use_required_attribute=False),
+    ):
+        assert caching.get_form_signature(form) != signature
+
+    class StyledForm(ChoiceForm):
+        error_css_class = "error"
+        required_css_class = "required"
+
+    assert caching.get_form_signature(StyledForm()) != signature
+
+
+@pytest.mark.django_db
+def test_cache_empty_form_model_choices(author):
+    class CachingModelFormSet(formsets.ConvenientBaseModelFormSet):
+        cache_empty_form = True
+
+    BookFormSet = forms.modelformset_factory(
+        Book, formset=CachingModelFormSet, fields=("author", "title")
+    )
+    assert ">Author</option>" in BookFormSet().render_empty_form()
+
+    Author.objects.create(name="Other author")
+    assert ">Other author</option>" in BookFormSet().render_empty_form()
+
+
+@pytest.mark.django_db
+def test_batch_unique_checks(author):
+    book, other_book = Book.objects.order_by("pk")[:2]
+    Chapter.objects.bulk_create(
+        Chapter(book=book, number=i, title=f"Chapter {i}") for i in range(1, 4)
+    )
+    Chapter.objects.create(book=other_book, number=1, title="Other chapter")
+
+    class BatchingInlineFormSet(formsets.ConvenientBaseInlineFormSet):
+        batch_unique_checks = True
+
+    ChapterFormSet = forms.inlineformset_factory(
+        Book,
+        Chapter,
+        formset=BatchingInlineFormSet,
+        fields=("number", "title"),
+        can_delete=True,
+        extra=3,
+    )
+    queryset = Chapter.objects.filter(number__lte=2)
+    formset = ChapterFormSet(instance=book, queryset=queryset)
+    data = get_formset_data(
+        formset,
+        **{
+            "chapters-1-number": "3",
+            "chapters-2-number": "4",
+            "chapters-2-title": "Other chapter",
+            "chapters-3-number": "5",
+            "chapters-3-title": "Chapter 5",
+            "chapters-4-number": "6",
+            "chapters-4-title": "Chapter 3",
+            "chapters-4-DELETE": "on",
+        },
+    )
+
+    def count_queries(batch_unique_checks):
+        BatchingInlineFormSet.batch_unique_checks = batch_unique_checks
+        formset = ChapterFormSet(data, instance=book, queryset=queryset)
+        with CaptureQueriesContext(connection) as context:
+            assert not formset.is_valid()
+        assert formset.errors == [
+            {},
+            {"__all__": ["Chapter with this Book and Number already exists."]},
+            {"title": ["Chapter with this Title already exists."]},
+            {},
+        ]
+        return len(context.captured_queries)
+
+    # Chapters and the chapter of each initial form, apart from a query for
+    # each unique check of all forms not marked for deletion, instead of a
+    # query for each unique check of each form
+    assert count_queries(True) == 3 + 2
+    assert count_queries(False) == 3 + 2 * 5
+
+
+@pytest.mark.django_db
+def test_batch_unique_checks_constraints(author):
+    book = Book.objects.order_by("pk").first()
+    Edition.objects.create(book=book, isbn="1", is_current=True)
+    Edition.objects.create(book=book, isbn="2")
+
+    class BatchingModelFormSet(formsets.ConvenientBaseModelFormSet):
+        batch_unique_checks = True
+
+    EditionFormSet = forms.modelformset_factory(
+        Edition,
+        formset=BatchingModelFormSet,
+        fields=("book", "isbn", "is_current"),
+        extra=2,
+    )
+    formset = EditionFormSet(queryset=Edition.objects.none())
+    data = get_formset_data(
+        formset,
+        **{
+            "form-0-book": str(book.pk),
+            "form-0-isbn": "2",
+            "form-1-book": str(book.pk),
+            "form-1-isbn": "3",
+            "form-1-is_current": "on",
+        },
+    )
+
+    def count_queries(batch_unique_checks):
+        BatchingModelFormSet.batch_unique_checks = batch_unique_checks
+        formset = EditionFormSet(data, queryset=Edition.objects.none())
+        with CaptureQueriesContext(connection) as context:
+            assert not formset.is_valid()
+        assert formset.errors == [
+            {"isbn": ["Edition with this Isbn already exists."]},
+            {"__all__": ["Constraint “unique_current_edition” is violated."]},
+        ]
+        return len(context.captured_queries)
+
+    # Constraints defined in `Meta.constraints`, with or without a condition,
+    # are still validated with a query for each form, apart from looking up
+    # and validating the book of each form
+    assert count_queries(True) == count_queries(False) == 2 * (2 + 2)
@@ -0,0 +1,31 @@
+/*
+ * Writes gzip and Brotli compressed variants next to the minified JavaScript
+ * file, to be served by static file servers supporting precompressed files.
+ */
+/* eslint-env node, es6 */
+'use strict';
+
+const fs = require('fs');
+const zlib = require('zlib');
+
+const staticFiles = [
+    'convenient_formsets/static/convenient_formsets/convenient_formsets.min.js',
+];
+
+for (const staticFile of staticFiles) {
+    const contents = fs.readFileSync(staticFile);
+
+    fs.writeFileSync(
+        `${staticFile}.gz`,
+        zlib.gzipSync(contents, {'level': zlib.constants.Z_BEST_COMPRESSION})
+    );
+    fs.writeFileSync(
+        `${staticFile}.br`,
+        zlib.brotliCompressSync(contents, {
+            'params': {
+                [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+                [zlib.constants.BROTLI_PARAM_SIZE_HINT]: contents.length,
+            },
+        })
+    );
+}